@@ -0,0 +1,65 @@
+from __future__ import annotations
+
+import argparse
+import sys
+from pathlib import Path
+from typing import List, Optional
+
+from benchmarks.harness import DEFAULT_OUTPUT
+from benchmarks.harness import PERCENTILES
+from benchmarks.harness import compare
+from benchmarks.harness import read_results
+
+DEFAULT_BASELINE = Path("benchmarks") / "baseline.json"
+
+
+def main(argv: Optional[List[str]] = None) -> int:
+    """Fail when a benchmark metric regressed against the stored baseline."""
+    parser = argparse.ArgumentParser(description=main.__doc__)
+    parser.add_argument("--baseline", type=Path, default=DEFAULT_BASELINE)
+    parser.add_argument("--current", type=Path, default=DEFAULT_OUTPUT)
+    parser.add_argument(
+        "--stat",
+        default="p50",
+        choices=["mean"] + [f"p{pct}" for pct in PERCENTILES],
+    )
+    parser.add_argument(
+        "--threshold", type=float, default=0.10, help="allowed relative slowdown"
+    )
+    parser.add_argument(
+        "--min-delta-ms", type=float, default=0.5, help="ignore smaller slowdowns"
+    )
+    args = parser.parse_args(argv)
+
+    if not args.baseline.exists():
+        print(f"No baseline at {args.baseline}; record one with `make bench-baseline`.")
+        return 2
+    baseline = read_results(args.baseline)
+    current = read_results(args.current)
+    for key in ("browser", "interaction_profile", "trace_mode"):
+        if baseline["metadata"].get(key) != current["metadata"].get(key):
+            print(
+                f"warning: {key} differs "
+                f"({baseline['metadata'].get(key)} -> {current['metadata'].get(key)})"
+            )
+
+    rows = compare(baseline, current, args.stat, args.threshold, args.min_delta_ms)
+    print(f"{'metric':<40} {'baseline':>10} {'current':>10} {'change':>8}")
+    for row in rows:
+        flag = "  REGRESSED" if row.regressed else ""
+        print(
+            f"{row.metric:<40} {row.baseline_ms:>10.3f} {row.current_ms:>10.3f} "
+            f"{row.change:>+8.1%}{flag}"
+        )
+    regressed = [row.metric for row in rows if row.regressed]
+    if regressed:
+        print(
+            f"{len(regressed)} metric(s) regressed by more than {args.threshold:.0%} "
+            f"({args.stat}): {', '.join(regressed)}"
+        )
+        return 1
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
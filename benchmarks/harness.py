@@ -0,0 +1,140 @@
+from __future__ import annotations
+
+import json
+import math
+import platform
+import time
+from dataclasses import dataclass
+from pathlib import Path
+from typing import Any, Callable, Dict, List, Optional
+
+DEFAULT_OUTPUT = Path("artifacts") / "bench" / "results.json"
+PERCENTILES = (50, 90, 95, 99)
+SCHEMA_VERSION = 1
+
+
+def percentile(sorted_samples: List[float], pct: float) -> float:
+    """Return the linearly interpolated percentile of pre-sorted samples."""
+    if not sorted_samples:
+        return 0.0
+    rank = (len(sorted_samples) - 1) * pct / 100
+    low = math.floor(rank)
+    high = math.ceil(rank)
+    if low == high:
+        return sorted_samples[low]
+    weight = rank - low
+    return sorted_samples[low] * (1 - weight) + sorted_samples[high] * weight
+
+
+def summarize(samples_ms: List[float]) -> Dict[str, float]:
+    """Return count, mean, min, max and percentiles in milliseconds."""
+    ordered = sorted(samples_ms)
+    summary: Dict[str, float] = {
+        "n": len(ordered),
+        "mean": round(sum(ordered) / len(ordered), 4) if ordered else 0.0,
+        "min": round(ordered[0], 4) if ordered else 0.0,
+        "max": round(ordered[-1], 4) if ordered else 0.0,
+    }
+    for pct in PERCENTILES:
+        summary[f"p{pct}"] = round(percentile(ordered, pct), 4)
+    return summary
+
+
+class Bench:
+    """Collects timing samples per metric name."""
+
+    def __init__(self, iterations: int, warmup: int) -> None:
+        self.iterations = iterations
+        self.warmup = warmup
+        self.samples: Dict[str, List[float]] = {}
+
+    def add(self, metric: str, duration_ms: float) -> None:
+        self.samples.setdefault(metric, []).append(duration_ms)
+
+    def measure(
+        self,
+        metric: str,
+        func: Callable[[], Any],
+        iterations: Optional[int] = None,
+        batch: int = 1,
+    ) -> None:
+        """Run func warmup + iterations times, sampling only the iterations.
+
+        With batch > 1 each sample is the mean of batch back-to-back calls,
+        for operations too fast to time individually.
+        """
+        for _ in range(self.warmup):
+            func()
+        for _ in range(iterations or self.iterations):
+            start = time.perf_counter_ns()
+            for _ in range(batch):
+                func()
+            self.add(metric, (time.perf_counter_ns() - start) / 1e6 / batch)
+
+    def results(self, metadata: Dict[str, Any]) -> Dict[str, Any]:
+        return {
+            "schema": SCHEMA_VERSION,
+            "metadata": {
+                "python": platform.python_version(),
+                "platform": platform.platform(),
+                "iterations": self.iterations,
+                "warmup": self.warmup,
+                **metadata,
+            },
+            "metrics": {
+                name: summarize(samples)
+                for name, samples in sorted(self.samples.items())
+            },
+        }
+
+
+def write_results(path: Path, results: Dict[str, Any]) -> None:
+    path.parent.mkdir(parents=True, exist_ok=True)
+    path.write_text(json.dumps(results, indent=2) + "\n", encoding="utf-8")
+
+
+def read_results(path: Path) -> Dict[str, Any]:
+    data = json.loads(path.read_text(encoding="utf-8"))
+    if not isinstance(data, dict) or data.get("schema") != SCHEMA_VERSION:
+        raise ValueError(f"Unsupported benchmark results schema in {path}")
+    return data
+
+
+@dataclass(frozen=True)
+class Comparison:
+    """One metric compared between a baseline and a current run."""
+
+    metric: str
+    baseline_ms: float
+    current_ms: float
+    regressed: bool
+
+    @property
+    def change(self) -> float:
+        if self.baseline_ms == 0:
+            return 0.0
+        return self.current_ms / self.baseline_ms - 1
+
+
+def compare(
+    baseline: Dict[str, Any],
+    current: Dict[str, Any],
+    stat: str = "p50",
+    threshold: float = 0.10,
+    min_delta_ms: float = 0.5,
+) -> List[Comparison]:
+    """Compare metrics present in both runs.
+
+    A metric regresses when it is slower by more than the relative threshold
+    and by more than min_delta_ms, so sub-millisecond noise never fails a run.
+    """
+    rows = []
+    for metric, stats in sorted(current["metrics"].items()):
+        base_stats = baseline["metrics"].get(metric)
+        if base_stats is None:
+            continue
+        base_ms, cur_ms = base_stats[stat], stats[stat]
+        delta = cur_ms - base_ms
+        regressed = delta > min_delta_ms and delta > base_ms * threshold
+        rows.append(Comparison(metric, base_ms, cur_ms, regressed))
+    return rows
@@ -0,0 +1,394 @@
+from __future__ import annotations
+
+import argparse
+import asyncio
+import json
+import math
+import multiprocessing
+import time
+from collections import Counter
+from contextlib import asynccontextmanager
+from dataclasses import asdict, dataclass, field
+from pathlib import Path
+from typing import (
+    Any,
+    AsyncIterator,
+    Awaitable,
+    Callable,
+    Dict,
+    List,
+    Optional,
+    Tuple,
+)
+
+from playwright.async_api import Browser
+from playwright.async_api import Page
+from playwright.async_api import async_playwright
+
+from benchmarks.harness import percentile
+from config.settings import Settings, get_settings, override_settings
+from pages.aio.cart_page import CartPage
+from pages.aio.inventory_page import InventoryPage
+from pages.aio.login_page import LoginPage
+from utils.async_runner import launch_browser
+from utils.standin.catalog import PASSWORD
+from utils.standin.catalog import STANDARD_USER
+from utils.standin.server import StandinServer
+from utils.standin.server import faults_from_settings
+
+DEFAULT_OUTPUT = Path("artifacts") / "load" / "results.json"
+PERCENTILES = (50, 95, 99)
+ITERATION = "(iteration)"
+
+StepSample = Tuple[str, float, bool]
+
+
+class StepFailed(AssertionError):
+    """A step finished without reaching the expected page state."""
+
+
+@dataclass
+class Iteration:
+    """Step timings of one virtual-user iteration."""
+
+    steps: List[StepSample] = field(default_factory=list)
+
+    @asynccontextmanager
+    async def step(self, name: str) -> AsyncIterator[None]:
+        start = time.perf_counter()
+        ok = False
+        try:
+            yield
+            ok = True
+        finally:
+            self.steps.append((name, (time.perf_counter() - start) * 1000, ok))
+
+
+Journey = Callable[[Page, Settings, Iteration], Awaitable[None]]
+
+
+async def _log_in(page: Page, settings: Settings, it: Iteration) -> InventoryPage:
+    login_page = LoginPage(page)
+    async with it.step("LoginPage.open"):
+        await login_page.open()
+    async with it.step("LoginPage.login -> InventoryPage"):
+        inventory_page = await login_page.login(
+            settings.app_username.get_secret_value(),
+            settings.app_password.get_secret_value(),
+        )
+        if not await inventory_page.is_inventory_visible():
+            raise StepFailed("Login did not reach the inventory page.")
+    return inventory_page
+
+
+async def login_journey(page: Page, settings: Settings, it: Iteration) -> None:
+    await _log_in(page, settings, it)
+
+
+async def checkout_journey(page: Page, settings: Settings, it: Iteration) -> None:
+    """The journey of tests/test_e2e_checkout.py, one step per transition."""
+    inventory_page = await _log_in(page, settings, it)
+    async with it.step("InventoryPage.add_to_cart"):
+        await inventory_page.add_to_cart("Sauce Labs Backpack")
+    async with it.step("InventoryPage.go_to_cart -> CheckoutPage"):
+        checkout_page = await inventory_page.go_to_cart()
+        if not await CartPage(page).is_cart_visible():
+            raise StepFailed("The cart did not open.")
+    async with it.step("CheckoutPage.checkout"):
+        await checkout_page.checkout()
+    async with it.step("CheckoutPage.fill_information"):
+        await checkout_page.fill_information("John", "Doe", "12345")
+    async with it.step("CheckoutPage.finish_checkout"):
+        await checkout_page.finish_checkout()
+        if await checkout_page.get_complete_header() != "Thank you for your order!":
+            raise StepFailed("Checkout did not complete.")
+
+
+JOURNEYS: Dict[str, Journey] = {
+    "login": login_journey,
+    "checkout": checkout_journey,
+}
+
+
+@dataclass(frozen=True)
+class LoadPlan:
+    """Virtual users, arrival model and duration of one load run.
+
+    Without a rate every user loops the journey back to back (closed model),
+    starting staggered over the ramp. With a rate, iterations arrive at that
+    many per second (open model), ramping linearly from zero; users caps how
+    many run at once and arrivals beyond it are dropped.
+    """
+
+    journey: str
+    users: int
+    duration_s: float
+    ramp_s: float = 0.0
+    rate: Optional[float] = None
+    processes: int = 1
+
+    def share(self, index: int) -> LoadPlan:
+        """Return the part of the plan that process `index` runs."""
+        users = self.users // self.processes + (index < self.users % self.processes)
+        rate = self.rate / self.processes if self.rate else None
+        return LoadPlan(self.journey, users, self.duration_s, self.ramp_s, rate, 1)
+
+
+def arrival_time(index: float, rate: float, ramp_s: float) -> float:
+    """Seconds until arrival number `index` under a linear ramp to `rate`/s."""
+    ramp_arrivals = rate * ramp_s / 2
+    if index < ramp_arrivals:
+        return math.sqrt(2 * index * ramp_s / rate)
+    return ramp_s + (index - ramp_arrivals) / rate
+
+
+@dataclass
+class ProcessResult:
+    iterations: List[Dict[str, Any]] = field(default_factory=list)
+    dropped: int = 0
+
+
+async def _iterate(
+    browser: Browser,
+    journey: Journey,
+    settings: Settings,
+    started: float,
+    result: ProcessResult,
+) -> None:
+    it = Iteration()
+    start = time.perf_counter()
+    error = None
+    context = await browser.new_context(base_url=settings.base_url)
+    try:
+        await journey(await context.new_page(), settings, it)
+    except Exception as exc:
+        lines = str(exc).splitlines()
+        error = f"{type(exc).__name__}: {lines[0] if lines else ''}"
+    finally:
+        await context.close()
+    result.iterations.append(
+        {
+            "start_s": round(start - started, 3),
+            "duration_ms": (time.perf_counter() - start) * 1000,
+            "steps": it.steps,
+            "error": error,
+        }
+    )
+
+
+async def _closed_model(
+    browser: Browser,
+    journey: Journey,
+    plan: LoadPlan,
+    settings: Settings,
+    result: ProcessResult,
+) -> None:
+    started = time.perf_counter()
+    deadline = started + plan.duration_s
+
+    async def user(index: int) -> None:
+        await asyncio.sleep(plan.ramp_s * index / max(plan.users, 1))
+        while time.perf_counter() < deadline:
+            await _iterate(browser, journey, settings, started, result)
+
+    await asyncio.gather(*(user(index) for index in range(plan.users)))
+
+
+async def _open_model(
+    browser: Browser,
+    journey: Journey,
+    plan: LoadPlan,
+    settings: Settings,
+    result: ProcessResult,
+    rate: float,
+    phase: float,
+) -> None:
+    started = time.perf_counter()
+    slots = asyncio.Semaphore(plan.users)
+    running = set()
+
+    async def bounded() -> None:
+        try:
+            await _iterate(browser, journey, settings, started, result)
+        finally:
+            slots.release()
+
+    arrival = 0
+    while True:
+        at = arrival_time(arrival + phase, rate, plan.ramp_s)
+        if at >= plan.duration_s:
+            break
+        await asyncio.sleep(max(0.0, at - (time.perf_counter() - started)))
+        arrival += 1
+        if slots.locked():
+            result.dropped += 1
+            continue
+        await slots.acquire()
+        task = asyncio.ensure_future(bounded())
+        running.add(task)
+        task.add_done_callback(running.discard)
+    await asyncio.gather(*running)
+
+
+async def _run_process(plan: LoadPlan, phase: float) -> ProcessResult:
+    settings = get_settings()
+    journey = JOURNEYS[plan.journey]
+    result = ProcessResult()
+    if plan.users <= 0:
+        return result
+    async with async_playwright() as playwright:
+        browser = await launch_browser(playwright, settings)
+        try:
+            if plan.rate:
+                await _open_model(
+                    browser, journey, plan, settings, result, plan.rate, phase
+                )
+            else:
+                await _closed_model(browser, journey, plan, settings, result)
+        finally:
+            await browser.close()
+    return result
+
+
+def _process_main(args: Tuple[LoadPlan, float, Dict[str, Any]]) -> ProcessResult:
+    plan, phase, overrides = args
+    with override_settings(**overrides):
+        return asyncio.run(_run_process(plan, phase))
+
+
+def run(plan: LoadPlan, overrides: Optional[Dict[str, Any]] = None) -> ProcessResult:
+    """Run the plan across processes, each with its own browser."""
+    overrides = overrides or {}
+    jobs = [
+        (plan.share(index), index / plan.processes, overrides)
+        for index in range(plan.processes)
+    ]
+    if plan.processes == 1:
+        results = [_process_main(jobs[0])]
+    else:
+        with multiprocessing.get_context("spawn").Pool(plan.processes) as pool:
+            results = pool.map(_process_main, jobs)
+    merged = ProcessResult()
+    for result in results:
+        merged.iterations.extend(result.iterations)
+        merged.dropped += result.dropped
+    return merged
+
+
+def _latency(samples: List[float]) -> Dict[str, float]:
+    ordered = sorted(samples)
+    stats: Dict[str, float] = {"n": len(ordered)}
+    for pct in PERCENTILES:
+        stats[f"p{pct}"] = round(percentile(ordered, pct), 1)
+    return stats
+
+
+def summarize(plan: LoadPlan, result: ProcessResult) -> Dict[str, Any]:
+    """Throughput, errors and per-step latency percentiles of a load run."""
+    iterations = result.iterations
+    ok = [it for it in iterations if it["error"] is None]
+    step_samples: Dict[str, List[float]] = {}
+    step_errors: Counter[str] = Counter()
+    for iteration in iterations:
+        for name, duration_ms, passed in iteration["steps"]:
+            if passed:
+                step_samples.setdefault(name, []).append(duration_ms)
+            else:
+                step_errors[name] += 1
+    steps = {
+        name: {**_latency(samples), "errors": step_errors[name]}
+        for name, samples in step_samples.items()
+    }
+    for name in step_errors.keys() - steps.keys():
+        steps[name] = {**_latency([]), "errors": step_errors[name]}
+    steps[ITERATION] = {
+        **_latency([it["duration_ms"] for it in ok]),
+        "errors": len(iterations) - len(ok),
+    }
+    return {
+        "plan": asdict(plan),
+        "iterations": len(iterations),
+        "succeeded": len(ok),
+        "dropped": result.dropped,
+        "throughput_per_s": round(len(iterations) / plan.duration_s, 3),
+        "success_per_s": round(len(ok) / plan.duration_s, 3),
+        "steps": steps,
+        "errors": dict(Counter(it["error"] for it in iterations if it["error"])),
+    }
+
+
+def format_report(summary: Dict[str, Any]) -> List[str]:
+    plan = summary["plan"]
+    arrival = f"{plan['rate']:g}/s arrivals" if plan["rate"] else "closed loop"
+    lines = [
+        f"{plan['journey']}: {plan['users']} users in {plan['processes']} "
+        f"process(es), {arrival}, {plan['ramp_s']:g}s ramp, "
+        f"{plan['duration_s']:g}s",
+        f"{summary['iterations']} iterations ({summary['succeeded']} ok, "
+        f"{summary['dropped']} arrivals dropped): "
+        f"{summary['throughput_per_s']:.2f}/s, {summary['success_per_s']:.2f} ok/s",
+        f"{'step':<42} {'n':>6} {'err':>5} {'p50':>9} {'p95':>9} {'p99':>9}",
+    ]
+    for name, stats in summary["steps"].items():
+        lines.append(
+            f"{name:<42} {stats['n']:>6} {stats['errors']:>5} "
+            f"{stats['p50']:>9.1f} {stats['p95']:>9.1f} {stats['p99']:>9.1f}"
+        )
+    for error, count in summary["errors"].items():
+        lines.append(f"  {count} x {error}")
+    return lines
+
+
+def positive_float(value: str) -> float:
+    """Parse a command-line number that must be above zero."""
+    number = float(value)
+    if number <= 0:
+        raise ValueError(f"{value} is not above zero")
+    return number
+
+
+def main(argv: Optional[List[str]] = None) -> int:
+    """Drive the page-object journeys as concurrent virtual users."""
+    parser = argparse.ArgumentParser(description=main.__doc__)
+    parser.add_argument("--journey", choices=sorted(JOURNEYS), default="checkout")
+    parser.add_argument("--users", type=int, default=10, help="concurrent users")
+    parser.add_argument("--processes", type=int, default=1)
+    parser.add_argument("--duration", type=float, default=60.0, help="seconds")
+    parser.add_argument("--ramp", type=float, default=0.0, help="ramp-up seconds")
+    parser.add_argument(
+        "--rate", type=positive_float, default=None, help="target iterations per second"
+    )
+    parser.add_argument("--output", type=Path, default=DEFAULT_OUTPUT)
+    args = parser.parse_args(argv)
+    if args.users < 1 or args.processes < 1 or args.processes > args.users:
+        parser.error("need 1 <= --processes <= --users")
+
+    plan = LoadPlan(
+        args.journey, args.users, args.duration, args.ramp, args.rate, args.processes
+    )
+    settings = get_settings()
+    if settings.target == "local":
+        # Worker processes read settings afresh, so the server's URL and
+        # credentials travel as overrides.
+        with StandinServer(faults_from_settings(settings)) as server:
+            result = run(
+                plan,
+                {
+                    "base_url": server.base_url,
+                    "app_username": STANDARD_USER,
+                    "app_password": PASSWORD,
+                },
+            )
+    else:
+        result = run(plan)
+
+    summary = summarize(plan, result)
+    args.output.parent.mkdir(parents=True, exist_ok=True)
+    args.output.write_text(json.dumps(summary, indent=2), encoding="utf-8")
+    print("\n".join(format_report(summary)))
+    print(f"Results written to {args.output}")
+    return 1 if summary["succeeded"] < summary["iterations"] else 0
+
+
+if __name__ == "__main__":
+    raise SystemExit(main())
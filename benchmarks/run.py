@@ -0,0 +1,230 @@
+from __future__ import annotations
+
+import argparse
+import time
+from pathlib import Path
+from typing import Any, Dict, List, Optional, Tuple
+
+from playwright.sync_api import Browser
+from playwright.sync_api import Page
+from playwright.sync_api import Playwright
+from playwright.sync_api import StorageState
+from playwright.sync_api import sync_playwright
+
+from benchmarks.harness import DEFAULT_OUTPUT
+from benchmarks.harness import Bench
+from benchmarks.harness import write_results
+from config.settings import Settings, get_settings, override_settings
+from pages.base_page import DEFAULT_PROFILE
+from pages.checkout_information_page import CheckoutInformationPage
+from pages.inventory_page import InventoryPage
+from pages.login_page import LoginPage
+from utils import timing
+from utils.auth import INVENTORY_PATH
+from utils.auth import login_storage_state
+from utils.network import NetworkRouter
+from utils.standin.catalog import PASSWORD
+from utils.standin.catalog import STANDARD_USER
+from utils.standin.server import StandinServer
+from utils.tracing import TracingPolicy
+
+TRACE_PATH = DEFAULT_OUTPUT.parent / "trace.zip"
+CONSTRUCT_BATCH = 100
+CHECKOUT_PATH = "checkout-step-one.html"
+
+
+def _launch(settings: Settings) -> Tuple[Playwright, Browser]:
+    playwright = sync_playwright().start()
+    if settings.browser == "firefox":
+        return playwright, playwright.firefox.launch(headless=settings.headless)
+    return playwright, playwright.chromium.launch(headless=settings.headless)
+
+
+def bench_fixtures(
+    bench: Bench,
+    browser: Browser,
+    settings: Settings,
+    state: StorageState,
+) -> None:
+    """Time what the context/page fixtures do around every test."""
+    router = NetworkRouter(settings)
+    policy = TracingPolicy(settings.trace_mode)
+    for index in range(bench.warmup + bench.iterations):
+        start = time.perf_counter_ns()
+        context = browser.new_context(base_url=settings.base_url)
+        router.install(context, f"bench-{index}")
+        trace = policy.start(context, 1)
+        context.new_page()
+        setup_ns = time.perf_counter_ns() - start
+
+        start = time.perf_counter_ns()
+        trace.finish(False, lambda: TRACE_PATH)
+        context.close()
+        teardown_ns = time.perf_counter_ns() - start
+
+        if index >= bench.warmup:
+            bench.add("fixture.page.setup", setup_ns / 1e6)
+            bench.add("fixture.page.teardown", teardown_ns / 1e6)
+
+    for index in range(bench.warmup + bench.iterations):
+        start = time.perf_counter_ns()
+        context = browser.new_context(base_url=settings.base_url, storage_state=state)
+        router.install(context, f"bench-auth-{index}")
+        trace = policy.start(context, 1)
+        context.new_page().goto(INVENTORY_PATH, wait_until="domcontentloaded")
+        setup_ns = time.perf_counter_ns() - start
+        trace.finish(False, lambda: TRACE_PATH)
+        context.close()
+        if index >= bench.warmup:
+            bench.add("fixture.authenticated_page.setup", setup_ns / 1e6)
+
+
+def bench_interactions(bench: Bench, page: Page) -> None:
+    """Compare BasePage calls with the raw Playwright calls they wrap."""
+    page.goto(INVENTORY_PATH, wait_until="domcontentloaded")
+    inventory = InventoryPage(page)
+    list_selector = inventory.map("inventory_list")
+    title_selector = inventory.map("products_title")
+
+    bench.measure(
+        "page_object.construct", lambda: InventoryPage(page), batch=CONSTRUCT_BATCH
+    )
+    bench.measure(
+        "interaction.get_element.page_object",
+        lambda: inventory.get_element("inventory_list"),
+    )
+    bench.measure(
+        "interaction.get_element.raw",
+        lambda: page.locator(list_selector).wait_for(state="attached"),
+    )
+    bench.measure(
+        "interaction.click.page_object", lambda: inventory.click("products_title")
+    )
+    bench.measure(
+        "interaction.click.raw", lambda: page.locator(title_selector).click()
+    )
+
+    page.goto(CHECKOUT_PATH, wait_until="domcontentloaded")
+    information = CheckoutInformationPage(page)
+    name_selector = information.map("first_name_input")
+    bench.measure(
+        "interaction.fill.page_object",
+        lambda: information.fill("first_name_input", "John"),
+    )
+    bench.measure(
+        "interaction.fill.raw", lambda: page.locator(name_selector).fill("John")
+    )
+
+
+def bench_flows(
+    bench: Bench,
+    browser: Browser,
+    settings: Settings,
+    state: StorageState,
+    iterations: int,
+) -> None:
+    """Time the login and checkout flows end to end, excluding context setup."""
+    username = settings.app_username.get_secret_value()
+    password = settings.app_password.get_secret_value()
+
+    def login(page: Page) -> None:
+        login_page = LoginPage(page)
+        login_page.open()
+        if not login_page.login(username, password).is_inventory_visible():
+            raise RuntimeError("Login flow did not reach the inventory page.")
+
+    def checkout(page: Page) -> None:
+        page.goto(INVENTORY_PATH, wait_until="domcontentloaded")
+        inventory = InventoryPage(page)
+        inventory.add_to_cart("Sauce Labs Backpack")
+        checkout_page = inventory.go_to_cart()
+        checkout_page.checkout()
+        checkout_page.fill_information("John", "Doe", "12345")
+        checkout_page.finish_checkout()
+        if checkout_page.get_complete_header() != "Thank you for your order!":
+            raise RuntimeError("Checkout flow did not complete.")
+
+    for metric, flow, storage_state in (
+        ("flow.login", login, None),
+        ("flow.checkout", checkout, state),
+    ):
+        for index in range(bench.warmup + iterations):
+            context = browser.new_context(
+                base_url=settings.base_url, storage_state=storage_state
+            )
+            page = context.new_page()
+            start = time.perf_counter_ns()
+            flow(page)
+            duration_ns = time.perf_counter_ns() - start
+            context.close()
+            if index >= bench.warmup:
+                bench.add(metric, duration_ns / 1e6)
+
+
+def run(bench: Bench, flow_iterations: int) -> Dict[str, Any]:
+    """Run every benchmark against a fault-free local stand-in."""
+    with StandinServer() as server, override_settings(
+        base_url=server.base_url,
+        target="local",
+        app_username=STANDARD_USER,
+        app_password=PASSWORD,
+    ) as settings:
+        TRACE_PATH.parent.mkdir(parents=True, exist_ok=True)
+        playwright, browser = _launch(settings)
+        recorder = timing.TimingRecorder("benchmarks")
+        token = timing.activate(recorder) if settings.timing_enabled else None
+        try:
+            state = login_storage_state(browser, settings)
+            bench_fixtures(bench, browser, settings, state)
+
+            context = browser.new_context(
+                base_url=settings.base_url, storage_state=state
+            )
+            try:
+                bench_interactions(bench, context.new_page())
+            finally:
+                context.close()
+
+            bench_flows(bench, browser, settings, state, flow_iterations)
+        finally:
+            if token is not None:
+                timing.deactivate(token)
+            browser.close()
+            playwright.stop()
+
+        return bench.results(
+            {
+                "browser": settings.browser,
+                "interaction_profile": DEFAULT_PROFILE.name,
+                "trace_mode": settings.trace_mode,
+                "timing_enabled": settings.timing_enabled,
+                "flow_iterations": flow_iterations,
+            }
+        )
+
+
+def main(argv: Optional[List[str]] = None) -> None:
+    """Benchmark framework overhead against the local SauceDemo stand-in."""
+    parser = argparse.ArgumentParser(description=main.__doc__)
+    parser.add_argument("--iterations", type=int, default=50)
+    parser.add_argument("--warmup", type=int, default=5)
+    parser.add_argument("--flow-iterations", type=int, default=10)
+    parser.add_argument("--output", type=Path, default=DEFAULT_OUTPUT)
+    args = parser.parse_args(argv)
+
+    if get_settings().interaction_profile != "fast":
+        print("note: interaction profile is not 'fast'; highlight time is included")
+    results = run(Bench(args.iterations, args.warmup), args.flow_iterations)
+    write_results(args.output, results)
+
+    print(f"{'metric':<40} {'p50':>9} {'p95':>9} {'max':>9}")
+    for metric, stats in results["metrics"].items():
+        print(
+            f"{metric:<40} {stats['p50']:>9.3f} {stats['p95']:>9.3f} "
+            f"{stats['max']:>9.3f}"
+        )
+    print(f"Results written to {args.output}")
+
+
+if __name__ == "__main__":
+    main()
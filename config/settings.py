@@ -1,13 +1,18 @@
 from __future__ import annotations
 
 import os
+from contextlib import contextmanager
 from functools import lru_cache
 from pathlib import Path
-from typing import Any, Dict, Literal
+from typing import Any, Dict, Iterator, List, Literal, Tuple, Type
 
 import yaml
 from pydantic import AliasChoices, Field, SecretStr
-from pydantic_settings import BaseSettings, SettingsConfigDict
+from pydantic_settings import (
+    BaseSettings,
+    PydanticBaseSettingsSource,
+    SettingsConfigDict,
+)
 
 
 def _load_yaml_settings(env_name: str) -> Dict[str, Any]:
@@ -47,7 +52,15 @@ class Settings(BaseSettings):
 
     env_name: str = Field(default="dev", validation_alias=AliasChoices("ENV", "APP_ENV"))
     base_url: str = Field(validation_alias=AliasChoices("APP_BASE_URL", "base_url"))
+    target: Literal["remote", "local"] = Field(
+        default="remote",
+        validation_alias=AliasChoices("APP_TARGET", "target"),
+    )
     timeout: int = Field(default=10000, validation_alias=AliasChoices("APP_TIMEOUT", "timeout"))
+    test_budget_s: float = Field(
+        default=0,
+        validation_alias=AliasChoices("APP_TEST_BUDGET_S", "test_budget_s"),
+    )
     headless: bool = Field(default=True, validation_alias=AliasChoices("APP_HEADLESS", "headless"))
     browser: Literal["chromium", "firefox"] = Field(
         default="chromium",
@@ -59,24 +72,171 @@ class Settings(BaseSettings):
     app_password: SecretStr = Field(
         validation_alias=AliasChoices("APP_PASSWORD", "app_password")
     )
-    trace_mode: Literal["off", "on", "retain-on-failure"] = Field(
+    trace_mode: Literal[
+        "off", "on", "retain-on-failure", "on-first-retry", "light"
+    ] = Field(
         default="retain-on-failure",
         validation_alias=AliasChoices("APP_TRACE_MODE", "trace_mode"),
     )
-    video_mode: Literal["off", "retain-on-failure"] = Field(
+    video_mode: Literal["off", "retain-on-failure", "ring-buffer"] = Field(
         default="off",
         validation_alias=AliasChoices("APP_VIDEO_MODE", "video_mode"),
     )
+    video_buffer_seconds: int = Field(
+        default=10,
+        validation_alias=AliasChoices(
+            "APP_VIDEO_BUFFER_SECONDS", "video_buffer_seconds"
+        ),
+    )
+    video_buffer_max_mb: int = Field(
+        default=64,
+        validation_alias=AliasChoices("APP_VIDEO_BUFFER_MAX_MB", "video_buffer_max_mb"),
+    )
+    interaction_profile: Literal["fast", "demo"] = Field(
+        default="demo",
+        validation_alias=AliasChoices("APP_INTERACTION_PROFILE", "interaction_profile"),
+    )
+    timing_enabled: bool = Field(
+        default=True,
+        validation_alias=AliasChoices("APP_TIMING_ENABLED", "timing_enabled"),
+    )
+    timing_keep_runs: int = Field(
+        default=5,
+        validation_alias=AliasChoices("APP_TIMING_KEEP_RUNS", "timing_keep_runs"),
+    )
+    screenshot_format: Literal["png", "jpeg"] = Field(
+        default="jpeg",
+        validation_alias=AliasChoices("APP_SCREENSHOT_FORMAT", "screenshot_format"),
+    )
+    screenshot_quality: int = Field(
+        default=80,
+        validation_alias=AliasChoices("APP_SCREENSHOT_QUALITY", "screenshot_quality"),
+    )
+    artifact_workers: int = Field(
+        default=2,
+        validation_alias=AliasChoices("APP_ARTIFACT_WORKERS", "artifact_workers"),
+    )
+    artifact_queue_size: int = Field(
+        default=32,
+        validation_alias=AliasChoices("APP_ARTIFACT_QUEUE_SIZE", "artifact_queue_size"),
+    )
+    auth_state_ttl: int = Field(
+        default=600,
+        validation_alias=AliasChoices("APP_AUTH_STATE_TTL", "auth_state_ttl"),
+    )
+    block_resource_types: List[str] = Field(
+        default_factory=list,
+        validation_alias=AliasChoices(
+            "APP_BLOCK_RESOURCE_TYPES", "block_resource_types"
+        ),
+    )
+    block_url_patterns: List[str] = Field(
+        default_factory=list,
+        validation_alias=AliasChoices("APP_BLOCK_URL_PATTERNS", "block_url_patterns"),
+    )
+    block_action: Literal["abort", "stub"] = Field(
+        default="abort",
+        validation_alias=AliasChoices("APP_BLOCK_ACTION", "block_action"),
+    )
+    har_mode: Literal["off", "record", "replay"] = Field(
+        default="off",
+        validation_alias=AliasChoices("APP_HAR_MODE", "har_mode"),
+    )
+    har_dir: str = Field(
+        default="har",
+        validation_alias=AliasChoices("APP_HAR_DIR", "har_dir"),
+    )
+    har_not_found: Literal["abort", "fallback"] = Field(
+        default="abort",
+        validation_alias=AliasChoices("APP_HAR_NOT_FOUND", "har_not_found"),
+    )
+    standin_latency_ms: int = Field(
+        default=0,
+        validation_alias=AliasChoices("APP_STANDIN_LATENCY_MS", "standin_latency_ms"),
+    )
+    standin_jitter_ms: int = Field(
+        default=0,
+        validation_alias=AliasChoices("APP_STANDIN_JITTER_MS", "standin_jitter_ms"),
+    )
+    standin_error_rate: float = Field(
+        default=0.0,
+        validation_alias=AliasChoices("APP_STANDIN_ERROR_RATE", "standin_error_rate"),
+    )
+    standin_seed: int = Field(
+        default=0,
+        validation_alias=AliasChoices("APP_STANDIN_SEED", "standin_seed"),
+    )
+    standin_routes: Dict[str, Dict[str, float]] = Field(
+        default_factory=dict,
+        validation_alias=AliasChoices("APP_STANDIN_ROUTES", "standin_routes"),
+    )
+
+    flaky_reruns: int = Field(
+        default=2,
+        validation_alias=AliasChoices("APP_FLAKY_RERUNS", "flaky_reruns"),
+    )
+    flaky_quarantine_rate: float = Field(
+        default=0.2,
+        validation_alias=AliasChoices(
+            "APP_FLAKY_QUARANTINE_RATE", "flaky_quarantine_rate"
+        ),
+    )
+    flow_checkpoints: int = Field(
+        default=32,
+        validation_alias=AliasChoices("APP_FLOW_CHECKPOINTS", "flow_checkpoints"),
+    )
+    web_vitals_enabled: bool = Field(
+        default=True,
+        validation_alias=AliasChoices("APP_WEB_VITALS_ENABLED", "web_vitals_enabled"),
+    )
+    perf_budgets: Dict[str, Dict[str, float]] = Field(
+        default_factory=dict,
+        validation_alias=AliasChoices("APP_PERF_BUDGETS", "perf_budgets"),
+    )
+    perf_budget_mode: Literal["warn", "fail"] = Field(
+        default="warn",
+        validation_alias=AliasChoices("APP_PERF_BUDGET_MODE", "perf_budget_mode"),
+    )
+    visual_baseline_dir: str = Field(
+        default="visual_baselines",
+        validation_alias=AliasChoices("APP_VISUAL_BASELINE_DIR", "visual_baseline_dir"),
+    )
+    visual_threshold: float = Field(
+        default=0.1,
+        validation_alias=AliasChoices("APP_VISUAL_THRESHOLD", "visual_threshold"),
+    )
+    visual_max_diff_ratio: float = Field(
+        default=0.0,
+        validation_alias=AliasChoices(
+            "APP_VISUAL_MAX_DIFF_RATIO", "visual_max_diff_ratio"
+        ),
+    )
+    visual_antialiasing: bool = Field(
+        default=True,
+        validation_alias=AliasChoices("APP_VISUAL_ANTIALIASING", "visual_antialiasing"),
+    )
+    visual_update: bool = Field(
+        default=False,
+        validation_alias=AliasChoices("APP_VISUAL_UPDATE", "visual_update"),
+    )
+    history_db: str = Field(
+        default=".history/runs.sqlite",
+        validation_alias=AliasChoices("APP_HISTORY_DB", "history_db"),
+    )
+    dataset_groups: int = Field(
+        default=0,
+        validation_alias=AliasChoices("APP_DATASET_GROUPS", "dataset_groups"),
+    )
 
     @classmethod
     def settings_customise_sources(
         cls,
-        settings_cls,
-        init_settings,
-        env_settings,
-        dotenv_settings,
-        file_secret_settings,
-    ):
+        settings_cls: Type[BaseSettings],
+        init_settings: PydanticBaseSettingsSource,
+        env_settings: PydanticBaseSettingsSource,
+        dotenv_settings: PydanticBaseSettingsSource,
+        file_secret_settings: PydanticBaseSettingsSource,
+    ) -> Tuple[Any, ...]:
         env_name = _read_env_name()
         yaml_data = _load_yaml_settings(str(env_name))
 
@@ -92,7 +252,24 @@ class Settings(BaseSettings):
         )
 
 
+_OVERRIDES: Dict[str, Any] = {}
+
+
 @lru_cache
 def get_settings() -> Settings:
     """Return cached settings loaded from environment or .env."""
-    return Settings()
+    return Settings(**_OVERRIDES)
+
+
+@contextmanager
+def override_settings(**values: Any) -> Iterator[Settings]:
+    """Temporarily replace settings fields for every get_settings() caller."""
+    previous = dict(_OVERRIDES)
+    _OVERRIDES.update(values)
+    get_settings.cache_clear()
+    try:
+        yield get_settings()
+    finally:
+        _OVERRIDES.clear()
+        _OVERRIDES.update(previous)
+        get_settings.cache_clear()
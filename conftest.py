@@ -1,8 +1,27 @@
 ﻿from __future__ import annotations
 
+import json
 import re
+import sqlite3
+import uuid
+import warnings
+from contextlib import ExitStack
+from contextlib import contextmanager
 from pathlib import Path
-from typing import Generator, Optional
+from typing import (
+    TYPE_CHECKING,
+    Any,
+    Callable,
+    Dict,
+    Generator,
+    Iterator,
+    List,
+    NamedTuple,
+    Optional,
+    Set,
+    Tuple,
+    cast,
+)
 
 import allure
 import pytest
@@ -10,14 +29,115 @@ from playwright.sync_api import Browser
 from playwright.sync_api import BrowserContext
 from playwright.sync_api import Page
 from playwright.sync_api import Playwright
+from playwright.sync_api import StorageState
 from playwright.sync_api import sync_playwright
 
-from config.settings import Settings, get_settings
+from config.settings import Settings, get_settings, override_settings
+from pages.selectors import validate_registered
+from utils import budget
+from utils import datasets
+from utils import history
+from utils import impact
+from utils import timing
+from utils import visual
+from utils import web_vitals
+from utils.artifacts import ArtifactPipeline
+from utils.async_runner import AsyncBrowserHost
+from utils.async_runner import AsyncFlow
+from utils.async_runner import FlowResult
+from utils.auth import INVENTORY_PATH
+from utils.auth import AuthStateCache
+from utils.auth import credentials_key
+from utils.auth import login_storage_state
+from utils.datasets import RecordRef
+from utils.durations import DurationStore
+from utils.durations import order_longest_first
+from utils.durations import parse_shard
+from utils.durations import split_shards
+from utils.flaky import FLAKY
+from utils.flaky import FlakeStore
+from utils.flaky import quarantine_last
+from utils.flaky import reruns_for
+from utils.flaky import run_with_reruns
+from utils.flows import CheckpointTree
+from utils.flows import Flow
+from utils.flows import FlowRunner
+from utils.impact import CoverageStore
+from utils.impact import ImpactSelector
+from utils.impact import ImportGraph
+from utils.impact import changed_since
+from utils.network import NetworkRouter
+from utils.network import format_summary as format_network_summary
+from utils.screencast import FrameRingBuffer
+from utils.screencast import ScreencastRecorder
+from utils.screencast import WorkerFrameBudget
+from utils.seeding import CHECKOUT_STEP_ONE_PATH
+from utils.seeding import StateBuilder
+from utils.standin.catalog import PASSWORD as STANDIN_PASSWORD
+from utils.standin.catalog import STANDARD_USER
+from utils.standin.server import StandinServer
+from utils.standin.server import faults_from_settings
+from utils.tracing import TraceSession
+from utils.tracing import TracingPolicy
+from utils.tracing import summarize as summarize_tracing
+
+# pytest-xdist is optional; its types are only needed for annotations.
+if TYPE_CHECKING:
+    from xdist.remote import Producer
+    from xdist.workermanage import WorkerController
+
+    from utils.xdist_scheduling import LongestFirstScheduling
 
 
 ARTIFACTS_DIR = Path("artifacts")
 TRACE_DIR = ARTIFACTS_DIR / "traces"
 VIDEO_DIR = ARTIFACTS_DIR / "videos"
+TIMING_DIR = ARTIFACTS_DIR / "timings"
+AUTH_DIR = Path(".auth")
+
+_NETWORK_TOTALS: Dict[str, int] = {}
+_TRACING_TOTALS: Dict[str, Dict[str, float]] = {}
+_TEST_DURATIONS: Dict[str, float] = {}
+_SKIPPED_TESTS: Set[str] = set()
+_BUDGET_TOTALS: Dict[str, int] = {}
+_WEB_VITALS: List[Dict[str, Any]] = []
+_PERF_VIOLATIONS: List[str] = []
+_FLOW_TOTALS: Dict[str, int] = {}
+_FLAKE_OUTCOMES: Dict[str, str] = {}
+_TEST_HISTORY: Dict[str, Dict[str, Any]] = {}
+_PAGE_COVERAGE: Dict[str, Dict[str, List[str]]] = {}
+
+# Per-process state on the pytest config, set up in pytest_configure.
+_RUN_ID_KEY = pytest.StashKey[str]()
+_WORKER_ID_KEY = pytest.StashKey[str]()
+_TRACING_POLICY_KEY = pytest.StashKey[TracingPolicy]()
+_FRAME_BUDGET_KEY = pytest.StashKey[WorkerFrameBudget]()
+_DURATION_STORE_KEY = pytest.StashKey[DurationStore]()
+_FLAKE_STORE_KEY = pytest.StashKey[FlakeStore]()
+_COVERAGE_STORE_KEY = pytest.StashKey[CoverageStore]()
+_ARTIFACT_PIPELINE_KEY = pytest.StashKey[ArtifactPipeline]()
+_IMPACT_SELECTOR_KEY = pytest.StashKey[Optional[ImpactSelector]]()
+_IMPACT_CHANGES_KEY = pytest.StashKey[impact.Changes]()
+_IMPACT_SUMMARY_KEY = pytest.StashKey[Optional[Tuple[str, int, int, Optional[str]]]]()
+_QUARANTINED_KEY = pytest.StashKey[List[str]]()
+_SHARD_KEY = pytest.StashKey[Optional[Tuple[int, int]]]()
+_DATA_SHARD_KEY = pytest.StashKey[Optional[Tuple[int, int]]]()
+_SHARD_ESTIMATE_KEY = pytest.StashKey[Optional[Tuple[float, float]]]()
+# Per-test state on the item, shared between fixtures and report hooks.
+_REP_CALL_KEY = pytest.StashKey[pytest.TestReport]()
+_PAGE_KEY = pytest.StashKey[Page]()
+_SCREENSHOT_ATTACHED_KEY = pytest.StashKey[bool]()
+_WEB_VITALS_PAGE_KEY = pytest.StashKey[Page]()
+_BUDGET_KEY = pytest.StashKey[budget.TestBudget]()
+
+# Tests using these module-scoped fixtures are ordered and sharded together.
+_GROUPED_FIXTURES = ("shared_context",)
+
+
+class SharedContext(NamedTuple):
+    context: BrowserContext
+    page: Page
+    trace_level: Optional[str]
 
 
 def _safe_test_name(nodeid: str) -> str:
@@ -25,25 +145,91 @@ def _safe_test_name(nodeid: str) -> str:
     return sanitized.strip("_") or "test"
 
 
-def _attach_failure_screenshot(page: Page) -> None:
-    screenshot = page.screenshot(full_page=True)
-    allure.attach(
-        screenshot,
-        name="failure_screenshot",
-        attachment_type=allure.attachment_type.PNG,
-    )
+def _pipeline(config: pytest.Config) -> ArtifactPipeline:
+    return config.stash[_ARTIFACT_PIPELINE_KEY]
+
+
+def _attach_failure_screenshot(page: Page, pipeline: ArtifactPipeline) -> None:
+    settings = get_settings()
+    if settings.screenshot_format == "jpeg":
+        screenshot = page.screenshot(
+            full_page=True, type="jpeg", quality=settings.screenshot_quality
+        )
+        attachment_type = allure.attachment_type.JPG
+    else:
+        screenshot = page.screenshot(full_page=True)
+        attachment_type = allure.attachment_type.PNG
+    pipeline.screenshot(screenshot, "failure_screenshot", attachment_type)
 
 
-def _save_trace(context: BrowserContext, nodeid: str) -> Path:
+def _attach_visual_diff(
+    comparison: visual.Comparison, pipeline: ArtifactPipeline
+) -> None:
+    png = allure.attachment_type.PNG
+    if comparison.baseline is not None and comparison.status == visual.MISMATCH:
+        pipeline.screenshot(
+            comparison.baseline.read_bytes(), f"{comparison.name}_expected", png
+        )
+    if comparison.actual_png is not None:
+        pipeline.screenshot(comparison.actual_png, f"{comparison.name}_actual", png)
+    if comparison.diff_png is not None:
+        pipeline.screenshot(comparison.diff_png, f"{comparison.name}_diff", png)
+
+
+def _trace_path(nodeid: str, attempt: int) -> Path:
     TRACE_DIR.mkdir(parents=True, exist_ok=True)
-    trace_path = TRACE_DIR / f"trace_{_safe_test_name(nodeid)}.zip"
-    context.tracing.stop(path=str(trace_path))
-    allure.attach.file(
-        str(trace_path),
-        name="playwright_trace",
-        attachment_type=allure.attachment_type.ZIP,
-    )
-    return trace_path
+    suffix = f"_retry{attempt - 1}" if attempt > 1 else ""
+    return TRACE_DIR / f"trace_{_safe_test_name(nodeid)}{suffix}.zip"
+
+
+def _attempt(item: pytest.Item) -> int:
+    return getattr(item, "execution_count", 1)
+
+
+def _finish_trace(
+    request: pytest.FixtureRequest,
+    trace: TraceSession,
+    failed: bool,
+) -> None:
+    attempt = _attempt(request.node)
+    try:
+        path = trace.finish(failed, lambda: _trace_path(request.node.nodeid, attempt))
+    except Exception:
+        path = None
+    if path is not None:
+        _pipeline(request.config).trace(path, "playwright_trace")
+    request.node.user_properties.append(("tracing", trace.record()))
+
+
+def _uses_ring_buffer(config: Settings) -> bool:
+    return config.video_mode == "ring-buffer" and config.browser == "chromium"
+
+
+def _records_video(config: Settings, attempt: int = 1) -> bool:
+    """Record full videos; ring-buffer falls back to this outside Chromium.
+
+    Retries of flaky tests always record, whatever the video mode.
+    """
+    if attempt > 1:
+        return True
+    if config.video_mode == "ring-buffer":
+        return not _uses_ring_buffer(config)
+    return config.video_mode == "retain-on-failure"
+
+
+def _frame_budget(request: pytest.FixtureRequest) -> WorkerFrameBudget:
+    return request.config.stash[_FRAME_BUDGET_KEY]
+
+
+def _has_credentials(config: Settings) -> bool:
+    username = config.app_username.get_secret_value()
+    password = config.app_password.get_secret_value()
+    return bool(username and password and "CHANGEME" not in (username, password))
+
+
+def _require_credentials(config: Settings) -> None:
+    if not _has_credentials(config):
+        pytest.skip("Missing credentials for SauceDemo.")
 
 
 def _get_browser(playwright: Playwright, settings: Settings) -> Browser:
@@ -52,27 +238,485 @@ def _get_browser(playwright: Playwright, settings: Settings) -> Browser:
     return playwright.chromium.launch(headless=settings.headless)
 
 
+def pytest_addoption(parser: pytest.Parser) -> None:
+    group = parser.getgroup("scheduling")
+    group.addoption(
+        "--shard",
+        default=None,
+        metavar="I/N",
+        help="run only shard I of N, balanced by recorded test durations",
+    )
+    group.addoption(
+        "--no-duration-order",
+        action="store_true",
+        help="keep collection order instead of running the longest tests first",
+    )
+    group = parser.getgroup("selection")
+    group.addoption(
+        "--impacted-since",
+        default=None,
+        metavar="REF",
+        help="run only tests affected by changes since the git ref REF",
+    )
+    group.addoption(
+        "--data-shard",
+        default=None,
+        metavar="I/N",
+        help="run only records of dataset-driven tests in shard I of N",
+    )
+
+
+def pytest_configure(config: pytest.Config) -> None:
+    workerinput = getattr(config, "workerinput", None)
+    stash = config.stash
+    if workerinput is not None:
+        stash[_RUN_ID_KEY] = workerinput["testrunuid"]
+        stash[_WORKER_ID_KEY] = workerinput["workerid"]
+    else:
+        stash[_RUN_ID_KEY] = uuid.uuid4().hex
+        stash[_WORKER_ID_KEY] = "main"
+
+    settings = get_settings()
+    if workerinput is None and TIMING_DIR.is_dir():
+        # Runs before any worker writes, so this run's files are never pruned.
+        timing.prune_runs(TIMING_DIR, settings.timing_keep_runs)
+    stash[_TRACING_POLICY_KEY] = TracingPolicy(settings.trace_mode)
+    stash[_FRAME_BUDGET_KEY] = WorkerFrameBudget(
+        settings.video_buffer_max_mb * 1024 * 1024
+    )
+    stash[_DURATION_STORE_KEY] = DurationStore(getattr(config, "cache", None))
+    stash[_FLAKE_STORE_KEY] = FlakeStore(getattr(config, "cache", None))
+    stash[_COVERAGE_STORE_KEY] = CoverageStore(getattr(config, "cache", None))
+    stash[_IMPACT_SUMMARY_KEY] = None
+    stash[_IMPACT_SELECTOR_KEY] = None
+    since = config.getoption("impacted_since")
+    if since:
+        stash[_IMPACT_SELECTOR_KEY] = _impact_selector(config, since, workerinput)
+    stash[_QUARANTINED_KEY] = []
+    stash[_SHARD_KEY] = parse_shard(config.getoption("shard"))
+    stash[_DATA_SHARD_KEY] = parse_shard(
+        config.getoption("data_shard"), "--data-shard"
+    )
+    stash[_SHARD_ESTIMATE_KEY] = None
+    try:
+        web_vitals.validate_budgets(settings.perf_budgets)
+    except ValueError as exc:
+        raise pytest.UsageError(str(exc)) from None
+    results_dir = getattr(config.option, "allure_report_dir", None)
+    stash[_ARTIFACT_PIPELINE_KEY] = ArtifactPipeline(
+        Path(results_dir) if results_dir else None,
+        workers=settings.artifact_workers,
+        max_queue=settings.artifact_queue_size,
+    )
+
+
+# Runs after pytest's own session teardown, which may still close fixtures
+# kept up for a flaky retry of the last test.
+@pytest.hookimpl(trylast=True)
+def pytest_sessionfinish(session: pytest.Session) -> None:
+    _pipeline(session.config).close()
+    datasets.close_all()
+    if not hasattr(session.config, "workerinput"):
+        session.config.stash[_DURATION_STORE_KEY].save(
+            {
+                nodeid: seconds
+                for nodeid, seconds in _TEST_DURATIONS.items()
+                if nodeid not in _SKIPPED_TESTS
+            }
+        )
+        session.config.stash[_FLAKE_STORE_KEY].save(_FLAKE_OUTCOMES)
+        session.config.stash[_COVERAGE_STORE_KEY].save(_PAGE_COVERAGE)
+        _record_history()
+
+
+def _record_history() -> None:
+    settings = get_settings()
+    if not settings.history_db or not _TEST_HISTORY:
+        return
+    tests = [
+        history.TestRecord(
+            nodeid,
+            entry["outcome"],
+            entry["attempts"],
+            _TEST_DURATIONS.get(nodeid, 0.0) * 1000,
+            entry["steps"],
+        )
+        for nodeid, entry in _TEST_HISTORY.items()
+    ]
+    try:
+        history.record(
+            Path(settings.history_db),
+            settings.env_name,
+            settings.browser,
+            history.current_commit(),
+            tests,
+        )
+    except (OSError, sqlite3.Error) as exc:
+        warnings.warn(f"Run history was not recorded: {exc}", stacklevel=2)
+
+
+@pytest.hookimpl(tryfirst=True)
+def pytest_runtest_protocol(
+    item: pytest.Item,
+    nextitem: Optional[pytest.Item],
+) -> Optional[bool]:
+    reruns = reruns_for(item, get_settings().flaky_reruns)
+    if reruns <= 0:
+        return None
+    run_with_reruns(item, nextitem, reruns)
+    return True
+
+
+def pytest_report_teststatus(report: pytest.TestReport) -> Optional[Tuple[str, ...]]:
+    if report.outcome == "rerun":
+        return "rerun", "R", "RERUN"
+    return None
+
+
+def _is_quarantined(item: pytest.Item) -> bool:
+    marker = item.get_closest_marker("flaky")
+    if marker is None:
+        return False
+    if marker.kwargs.get("quarantine"):
+        return True
+    return item.config.stash[_FLAKE_STORE_KEY].quarantined(
+        item.nodeid, get_settings().flaky_quarantine_rate
+    )
+
+
+def pytest_generate_tests(metafunc: pytest.Metafunc) -> None:
+    marker = metafunc.definition.get_closest_marker("dataset")
+    if marker is None:
+        return
+    if "record" not in metafunc.fixturenames:
+        raise pytest.UsageError(
+            f"{metafunc.definition.nodeid}: @pytest.mark.dataset needs the "
+            "record fixture"
+        )
+    config = metafunc.config
+    source = marker.args[0]
+    dataset = datasets.load(config.rootpath / source, getattr(config, "cache", None))
+    groups = get_settings().dataset_groups
+    stem = Path(source).stem
+    params = []
+    rows = dataset.select(config.stash[_DATA_SHARD_KEY], marker.kwargs.get("limit"))
+    for row in rows:
+        marks: Tuple[pytest.MarkDecorator, ...] = ()
+        if groups > 0:
+            group = f"{stem}-{dataset.shard_of(row, groups)}"
+            marks = (pytest.mark.xdist_group(group),)
+        params.append(
+            pytest.param(
+                RecordRef(source, row),
+                id=f"{stem}-{dataset.key(row)}",
+                marks=marks,
+            )
+        )
+    metafunc.parametrize("record", params, indirect=True)
+
+
+def pytest_collection_modifyitems(
+    session: pytest.Session,
+    config: pytest.Config,
+    items: List[pytest.Item],
+) -> None:
+    selector = config.stash[_IMPACT_SELECTOR_KEY]
+    if selector is not None:
+        _select_impacted(config, items, selector, config.getoption("impacted_since"))
+    store = config.stash[_DURATION_STORE_KEY]
+    shard = config.stash[_SHARD_KEY]
+    if shard is not None:
+        index, count = shard
+        shards = split_shards(items, store, count, _GROUPED_FIXTURES)
+        selected = shards[index - 1]
+        keep = set(map(id, selected))
+        deselected = [item for item in items if id(item) not in keep]
+        if deselected:
+            config.hook.pytest_deselected(items=deselected)
+        items[:] = [item for item in items if id(item) in keep]
+        config.stash[_SHARD_ESTIMATE_KEY] = (
+            sum(store.estimate(item.nodeid) for item in selected),
+            sum(store.estimate(item.nodeid) for shard in shards for item in shard),
+        )
+    if not config.getoption("no_duration_order"):
+        items[:] = order_longest_first(items, store, _GROUPED_FIXTURES)
+    quarantined = [item.nodeid for item in items if _is_quarantined(item)]
+    config.stash[_QUARANTINED_KEY] = quarantined
+    if quarantined:
+        items[:] = quarantine_last(items, _is_quarantined)
+
+
+def _impact_selector(
+    config: pytest.Config, ref: str, workerinput: Optional[Dict[str, Any]]
+) -> ImpactSelector:
+    """Build the --impacted-since selector once per process.
+
+    The controller diffs against ref and saves the import graph before any
+    worker starts; workers read the saved graph and take the controller's
+    changes from their workerinput.
+    """
+    root = config.rootpath
+    graph = ImportGraph(root, getattr(config, "cache", None))
+    if workerinput is None:
+        graph.save()
+        changes = changed_since(root, ref)
+        config.stash[_IMPACT_CHANGES_KEY] = changes
+    else:
+        changes = {
+            rel: None if lines is None else set(lines)
+            for rel, lines in workerinput["impact_changes"].items()
+        }
+    return ImpactSelector(root, graph, config.stash[_COVERAGE_STORE_KEY], changes)
+
+
+@pytest.hookimpl(optionalhook=True)
+def pytest_configure_node(node: WorkerController) -> None:
+    if node.config.stash[_IMPACT_SELECTOR_KEY] is not None:
+        node.workerinput["impact_changes"] = {
+            rel: None if lines is None else sorted(lines)
+            for rel, lines in node.config.stash[_IMPACT_CHANGES_KEY].items()
+        }
+
+
+@pytest.hookimpl(optionalhook=True)
+def pytest_testnodedown(node: WorkerController, error: Optional[str]) -> None:
+    # Workers collect and select; the controller only prints their summary.
+    summary = getattr(node, "workeroutput", {}).get("impact_summary")
+    if summary is not None and node.config.stash[_IMPACT_SUMMARY_KEY] is None:
+        node.config.stash[_IMPACT_SUMMARY_KEY] = tuple(summary)
+
+
+def _select_impacted(
+    config: pytest.Config,
+    items: List[pytest.Item],
+    selector: ImpactSelector,
+    ref: str,
+) -> None:
+    selected = [
+        item
+        for item in items
+        if selector.affects(item.nodeid.split("::")[0], item.nodeid)
+    ]
+    keep = set(map(id, selected))
+    deselected = [item for item in items if id(item) not in keep]
+    if deselected:
+        config.hook.pytest_deselected(items=deselected)
+    summary = (ref, len(selected), len(items), selector.global_change)
+    config.stash[_IMPACT_SUMMARY_KEY] = summary
+    workeroutput = getattr(config, "workeroutput", None)
+    if workeroutput is not None:
+        workeroutput["impact_summary"] = summary
+    items[:] = selected
+
+
+@pytest.hookimpl(optionalhook=True)
+def pytest_xdist_make_scheduler(
+    config: pytest.Config, log: Producer
+) -> Optional[LongestFirstScheduling]:
+    if config.getoption("dist") != "load" or config.getoption("no_duration_order"):
+        return None
+    # Imported here: only called by pytest-xdist, which this module must not
+    # require at import time.
+    from utils.xdist_scheduling import LongestFirstScheduling
+
+    return LongestFirstScheduling(config, log)
+
+
+def pytest_collection_finish(session: pytest.Session) -> None:
+    problems = validate_registered()
+    if problems:
+        raise pytest.UsageError(
+            "Page object selector registry is invalid:\n  " + "\n  ".join(problems)
+        )
+
+
+def _publish_timings(recorder: timing.TimingRecorder, config: pytest.Config) -> None:
+    record = recorder.to_dict()
+    allure.attach(
+        json.dumps(record, indent=2),
+        name="timing_breakdown",
+        attachment_type=allure.attachment_type.JSON,
+    )
+    run_id, worker_id = config.stash[_RUN_ID_KEY], config.stash[_WORKER_ID_KEY]
+    timing.append_jsonl(TIMING_DIR / f"timings-{run_id}-{worker_id}.jsonl", record)
+
+
+def pytest_runtest_logreport(report: pytest.TestReport) -> None:
+    _TEST_DURATIONS[report.nodeid] = (
+        _TEST_DURATIONS.get(report.nodeid, 0.0) + report.duration
+    )
+    if report.skipped:
+        _SKIPPED_TESTS.add(report.nodeid)
+    entry = _TEST_HISTORY.setdefault(
+        report.nodeid, {"outcome": "passed", "attempts": 1, "steps": {}}
+    )
+    if report.failed:
+        entry["outcome"] = "failed"
+    elif report.skipped and entry["outcome"] == "passed":
+        entry["outcome"] = "skipped"
+    if report.when != "teardown":
+        return
+    properties = cast(List[Tuple[str, Any]], report.user_properties)
+    for key, value in properties:
+        if key == "network":
+            for stat, count in value.items():
+                _NETWORK_TOTALS[stat] = _NETWORK_TOTALS.get(stat, 0) + count
+        elif key == "tracing":
+            totals = _TRACING_TOTALS.setdefault(
+                value["level"], {"count": 0, "start_stop_ms": 0.0}
+            )
+            totals["count"] += 1
+            totals["start_stop_ms"] += value["start_stop_ms"]
+        elif key == "web_vitals":
+            _WEB_VITALS.extend(value["samples"])
+            _PERF_VIOLATIONS.extend(value["violations"])
+        elif key == "flaky":
+            _FLAKE_OUTCOMES[report.nodeid] = value["outcome"]
+            entry["attempts"] = value["attempts"]
+            if value["outcome"] == FLAKY:
+                entry["outcome"] = FLAKY
+        elif key == "steps":
+            entry["steps"] = value
+        elif key == "page_coverage":
+            _PAGE_COVERAGE[report.nodeid] = value
+        elif key == "flows":
+            for stat, count in value.items():
+                _FLOW_TOTALS[stat] = _FLOW_TOTALS.get(stat, 0) + count
+        elif key == "budget":
+            _BUDGET_TOTALS["tests"] = _BUDGET_TOTALS.get("tests", 0) + 1
+            if value["exhausted"]:
+                _BUDGET_TOTALS["exhausted"] = _BUDGET_TOTALS.get("exhausted", 0) + 1
+
+
+def pytest_terminal_summary(terminalreporter: Any) -> None:
+    pipeline = _pipeline(terminalreporter.config)
+    if pipeline.stats["jobs"]:
+        stats = pipeline.stats
+        terminalreporter.write_sep("-", "artifact pipeline")
+        terminalreporter.write_line(
+            f"{stats['jobs']:.0f} jobs, {stats['duplicates']:.0f} duplicate "
+            f"screenshots, {stats['bytes_saved'] / 1024:.1f} KiB saved, "
+            f"{stats['blocked_s']:.2f}s blocked on a full queue, "
+            f"{stats['errors']:.0f} errors"
+        )
+        for error in pipeline.errors[:5]:
+            terminalreporter.write_line(f"  {error}")
+    config = terminalreporter.config
+    shard, shard_estimate = config.stash[_SHARD_KEY], config.stash[_SHARD_ESTIMATE_KEY]
+    if shard is not None and shard_estimate is not None:
+        index, count = shard
+        estimate, total = shard_estimate
+        fallback = config.stash[_DURATION_STORE_KEY].fallback
+        terminalreporter.write_sep("-", "scheduling")
+        terminalreporter.write_line(
+            f"shard {index}/{count}: estimated {estimate:.1f}s of {total:.1f}s "
+            f"(unknown tests counted at {fallback:.1f}s)"
+        )
+    impact_summary = config.stash[_IMPACT_SUMMARY_KEY]
+    if impact_summary is not None:
+        ref, selected, total, global_change = impact_summary
+        terminalreporter.write_sep("-", "impact selection")
+        reason = (
+            f"{global_change} changed, so every test is affected"
+            if global_change
+            else f"{total - selected} unaffected test(s) deselected"
+        )
+        terminalreporter.write_line(
+            f"{selected} of {total} tests affected by changes since {ref}: {reason}"
+        )
+    if _BUDGET_TOTALS.get("exhausted"):
+        terminalreporter.write_sep("-", "test budget")
+        terminalreporter.write_line(
+            f"{_BUDGET_TOTALS['exhausted']} of {_BUDGET_TOTALS['tests']} budgeted "
+            "tests ran out of time"
+        )
+    flaky = sorted(n for n, outcome in _FLAKE_OUTCOMES.items() if outcome == "flaky")
+    quarantined = config.stash[_QUARANTINED_KEY]
+    if flaky or quarantined:
+        terminalreporter.write_sep("-", "flaky tests")
+        for nodeid in flaky:
+            terminalreporter.write_line(f"passed on retry: {nodeid}")
+        if quarantined:
+            terminalreporter.write_line(
+                f"{len(quarantined)} quarantined test(s) scheduled last"
+            )
+    if _FLOW_TOTALS.get("runs"):
+        total_steps = _FLOW_TOTALS["resumed_steps"] + _FLOW_TOTALS["steps_run"]
+        terminalreporter.write_sep("-", "flow checkpoints")
+        terminalreporter.write_line(
+            f"{_FLOW_TOTALS['runs']} flows, {_FLOW_TOTALS['resumed_steps']} of "
+            f"{total_steps} steps resumed from checkpoints"
+        )
+    if _WEB_VITALS:
+        terminalreporter.write_sep("-", "web vitals")
+        for line in web_vitals.format_summary(_WEB_VITALS):
+            terminalreporter.write_line(line)
+        if _PERF_VIOLATIONS:
+            terminalreporter.write_line(
+                f"{len(_PERF_VIOLATIONS)} performance budget violation(s):"
+            )
+            for violation in _PERF_VIOLATIONS[:10]:
+                terminalreporter.write_line(f"  {violation}")
+    if _TRACING_TOTALS:
+        terminalreporter.write_sep("-", "tracing")
+        terminalreporter.write_line(summarize_tracing(_TRACING_TOTALS))
+    if _NETWORK_TOTALS:
+        terminalreporter.write_sep("-", "network routing")
+        terminalreporter.write_line(format_network_summary(_NETWORK_TOTALS))
+
+
 @pytest.hookimpl(tryfirst=True, hookwrapper=True)
 def pytest_runtest_makereport(
     item: pytest.Item,
     call: pytest.CallInfo,
-) -> Generator[None, None, None]:
+) -> Generator[None, Any, None]:
     outcome = yield
     rep = outcome.get_result()
     if rep.when == "call":
-        item.rep_call = rep
+        item.stash[_REP_CALL_KEY] = rep
+        test_budget = item.stash.get(_BUDGET_KEY, None)
+        if test_budget is not None:
+            test_budget.stop()
+        if rep.failed and test_budget is not None:
+            # BudgetExceeded already carries the report in its message.
+            if call.excinfo is None or not call.excinfo.errisinstance(
+                budget.BudgetExceeded
+            ):
+                rep.sections.append(("test budget", test_budget.report()))
+        if (
+            rep.failed
+            and call.excinfo is not None
+            and isinstance(call.excinfo.value, visual.VisualMismatch)
+        ):
+            _attach_visual_diff(call.excinfo.value.comparison, _pipeline(item.config))
+        _check_perf_budget(item, rep)
         if rep.failed:
-            page = getattr(item, "_page", None)
+            page = item.stash.get(_PAGE_KEY, None)
             if page is not None:
                 try:
-                    _attach_failure_screenshot(page)
-                    item._screenshot_attached = True
+                    _attach_failure_screenshot(page, _pipeline(item.config))
+                    item.stash[_SCREENSHOT_ATTACHED_KEY] = True
                 except Exception:
-                    item._screenshot_attached = False
+                    item.stash[_SCREENSHOT_ATTACHED_KEY] = False
 
 
 @pytest.fixture(scope="session")
-def config() -> Settings:
+def standin_server() -> Generator[Optional[StandinServer], None, None]:
+    """Serve the local SauceDemo stand-in when APP_TARGET=local."""
+    settings = get_settings()
+    if settings.target != "local":
+        yield None
+        return
+    with StandinServer(faults_from_settings(settings)) as server:
+        overrides: Dict[str, Any] = {"base_url": server.base_url}
+        if not _has_credentials(settings):
+            overrides.update(app_username=STANDARD_USER, app_password=STANDIN_PASSWORD)
+        with override_settings(**overrides):
+            yield server
+
+
+@pytest.fixture(scope="session")
+def config(standin_server: Optional[StandinServer]) -> Settings:
     return get_settings()
 
 
@@ -81,58 +725,509 @@ def base_url(config: Settings) -> str:
     return config.base_url
 
 
+@pytest.fixture(scope="function", autouse=True)
+def page_coverage(request: pytest.FixtureRequest) -> Generator[None, None, None]:
+    """Record the page objects and selectors the test uses, for --impacted-since."""
+    coverage = impact.PageCoverage()
+    token = impact.activate(coverage)
+    yield
+    impact.deactivate(token)
+    request.node.user_properties.append(("page_coverage", coverage.to_dict()))
+
+
+@pytest.fixture(scope="function", autouse=True)
+def timing_recorder(
+    request: pytest.FixtureRequest,
+    config: Settings,
+) -> Generator[Optional[timing.TimingRecorder], None, None]:
+    """Collect BasePage timing spans for the running test."""
+    if not config.timing_enabled:
+        yield None
+        return
+    recorder = timing.TimingRecorder(request.node.nodeid)
+    token = timing.activate(recorder)
+    yield recorder
+    timing.deactivate(token)
+    request.node.user_properties.append(
+        ("steps", history.step_durations(recorder.breakdown()))
+    )
+    try:
+        _publish_timings(recorder, request.config)
+    except OSError:
+        pass
+
+
+def _budget_seconds(
+    request: pytest.FixtureRequest,
+    config: Settings,
+) -> Tuple[float, str]:
+    marker = request.node.get_closest_marker("budget")
+    if marker is None:
+        return config.test_budget_s, "settings"
+    seconds = marker.args[0] if marker.args else marker.kwargs.get("seconds", 0)
+    return float(seconds), "marker"
+
+
+@pytest.fixture(scope="function", autouse=True)
+def test_budget(
+    request: pytest.FixtureRequest,
+    config: Settings,
+) -> Generator[Optional[budget.TestBudget], None, None]:
+    """Cap every page-object wait of the test at its remaining time budget."""
+    seconds, source = _budget_seconds(request, config)
+    if seconds <= 0:
+        yield None
+        return
+    test_budget = budget.TestBudget(seconds, source)
+    request.node.stash[_BUDGET_KEY] = test_budget
+    token = budget.activate(test_budget)
+    yield test_budget
+    budget.deactivate(token)
+    request.node.user_properties.append(
+        (
+            "budget",
+            {
+                "total_s": seconds,
+                "used_s": round(test_budget.elapsed_s(), 3),
+                "exhausted": test_budget.exhausted,
+            },
+        )
+    )
+    rep = request.node.stash.get(_REP_CALL_KEY, None)
+    if rep is not None and rep.failed:
+        allure.attach(
+            test_budget.report(),
+            name="test_budget",
+            attachment_type=allure.attachment_type.TEXT,
+        )
+
+
+@pytest.fixture(scope="session")
+def playwright() -> Generator[Playwright, None, None]:
+    """Start one Playwright driver per session (one per xdist worker)."""
+    with sync_playwright() as playwright_instance:
+        yield playwright_instance
+
+
+@pytest.fixture(scope="session")
+def browser(
+    playwright: Playwright,
+    config: Settings,
+) -> Generator[Browser, None, None]:
+    """Launch one browser per session and share it across tests."""
+    browser_instance = _get_browser(playwright, config)
+    yield browser_instance
+    browser_instance.close()
+
+
+@contextmanager
+def _open_context(
+    request: pytest.FixtureRequest,
+    browser: Browser,
+    config: Settings,
+    router: NetworkRouter,
+    storage_state: Optional[StorageState] = None,
+) -> Iterator[BrowserContext]:
+    record_video_dir: Optional[Path] = None
+    records_video = _records_video(config, _attempt(request.node))
+    if records_video:
+        VIDEO_DIR.mkdir(parents=True, exist_ok=True)
+        record_video_dir = VIDEO_DIR
+
+    context_obj = browser.new_context(
+        base_url=config.base_url,
+        record_video_dir=str(record_video_dir) if record_video_dir else None,
+        storage_state=storage_state,
+    )
+
+    network_stats = router.install(context_obj, _safe_test_name(request.node.nodeid))
+    if config.web_vitals_enabled:
+        context_obj.add_init_script(web_vitals.INIT_SCRIPT)
+    policy = request.config.stash[_TRACING_POLICY_KEY]
+    trace = policy.start(context_obj, _attempt(request.node))
+
+    yield context_obj
+
+    rep = request.node.stash.get(_REP_CALL_KEY, None)
+    failed = rep is not None and rep.failed
+
+    _finish_trace(request, trace, failed)
+
+    videos = [page_obj.video for page_obj in context_obj.pages if page_obj.video]
+    context_obj.close()
+
+    if router.enabled:
+        request.node.user_properties.append(("network", network_stats.as_dict()))
+
+    if records_video and not failed:
+        for video in videos:
+            try:
+                _pipeline(request.config).delete(Path(video.path()))
+            except Exception:
+                pass
+
+
+def _publish_web_vitals(item: pytest.Item, page: Page, config: Settings) -> List[str]:
+    """Attach the test's page metrics and return its budget violations."""
+    samples = web_vitals.collect(page)
+    if not samples:
+        return []
+    violations = web_vitals.check_budgets(samples, config.perf_budgets)
+    rows = [sample.to_dict() for sample in samples]
+    allure.attach(
+        json.dumps({"samples": rows, "violations": violations}, indent=2),
+        name="web_vitals",
+        attachment_type=allure.attachment_type.JSON,
+    )
+    item.user_properties.append(
+        ("web_vitals", {"samples": rows, "violations": violations})
+    )
+    return violations
+
+
+def _check_perf_budget(item: pytest.Item, rep: pytest.TestReport) -> None:
+    """Collect web vitals at the end of the call and apply the budgets.
+
+    In fail mode a passing test's call report is turned into a failure, so
+    the violation is reported as the test's own failure, not as a teardown
+    error.
+    """
+    page = item.stash.get(_WEB_VITALS_PAGE_KEY, None)
+    if page is None:
+        return
+    config = get_settings()
+    try:
+        violations = _publish_web_vitals(item, page, config)
+    except Exception as exc:
+        # An error here would abort the whole session from inside makereport.
+        warnings.warn(f"Web vitals were not collected: {exc}", stacklevel=2)
+        return
+    if not violations:
+        return
+    message = "Performance budget exceeded:\n  " + "\n  ".join(violations)
+    if config.perf_budget_mode == "fail" and rep.passed:
+        rep.outcome = "failed"
+        rep.longrepr = message
+    else:
+        warnings.warn(web_vitals.PerfBudgetWarning(message), stacklevel=2)
+
+
+@contextmanager
+def _open_page(
+    request: pytest.FixtureRequest,
+    context: BrowserContext,
+    config: Settings,
+) -> Iterator[Page]:
+    page_obj = context.new_page()
+    request.node.stash[_PAGE_KEY] = page_obj
+    request.node.stash[_SCREENSHOT_ATTACHED_KEY] = False
+    if config.web_vitals_enabled:
+        request.node.stash[_WEB_VITALS_PAGE_KEY] = page_obj
+
+    screencast: Optional[ScreencastRecorder] = None
+    if _uses_ring_buffer(config) and _attempt(request.node) == 1:
+        buffer = FrameRingBuffer(config.video_buffer_seconds, _frame_budget(request))
+        screencast = ScreencastRecorder(page_obj, buffer)
+
+    yield page_obj
+
+    rep = request.node.stash.get(_REP_CALL_KEY, None)
+    failed = rep is not None and rep.failed
+
+    if failed and not request.node.stash[_SCREENSHOT_ATTACHED_KEY]:
+        try:
+            _attach_failure_screenshot(page_obj, _pipeline(request.config))
+        except Exception:
+            pass
+
+    if screencast is not None:
+        frames = screencast.stop()
+        if failed and frames:
+            video_path = VIDEO_DIR / f"{_safe_test_name(request.node.nodeid)}.avi"
+            _pipeline(request.config).video(frames, video_path, "failure_video")
+
+
+@pytest.fixture(scope="function")
+def context(
+    request: pytest.FixtureRequest,
+    browser: Browser,
+    config: Settings,
+    network_router: NetworkRouter,
+) -> Generator[BrowserContext, None, None]:
+    """Create an isolated browser context per test on the shared browser."""
+    with _open_context(request, browser, config, network_router) as context_obj:
+        yield context_obj
+
+
 @pytest.fixture(scope="function")
 def page(
     request: pytest.FixtureRequest,
+    context: BrowserContext,
+    config: Settings,
+) -> Generator[Page, None, None]:
+    with _open_page(request, context, config) as page_obj:
+        yield page_obj
+
+
+@pytest.fixture(scope="session")
+def network_router(config: Settings) -> NetworkRouter:
+    """Blocking, stubbing and HAR routes installed on every context."""
+    return NetworkRouter(config)
+
+
+@pytest.fixture(scope="session")
+def auth_cache(config: Settings) -> AuthStateCache:
+    """Per-worker cache of logged-in storage states."""
+    return AuthStateCache(AUTH_DIR, config.auth_state_ttl)
+
+
+@pytest.fixture(scope="function")
+def auth_storage_state(
+    auth_cache: AuthStateCache,
+    browser: Browser,
+    config: Settings,
+    network_router: NetworkRouter,
+) -> StorageState:
+    """Return a logged-in storage state for the configured credentials."""
+    _require_credentials(config)
+    return auth_cache.get(
+        credentials_key(config),
+        lambda: login_storage_state(browser, config, network_router),
+    )
+
+
+@pytest.fixture(scope="function")
+def authenticated_context(
+    request: pytest.FixtureRequest,
+    browser: Browser,
     config: Settings,
+    network_router: NetworkRouter,
+    auth_storage_state: StorageState,
+) -> Generator[BrowserContext, None, None]:
+    """Create a per-test context that is already logged in."""
+    with _open_context(
+        request, browser, config, network_router, auth_storage_state
+    ) as context_obj:
+        yield context_obj
+
+
+@pytest.fixture(scope="function")
+def authenticated_page(
+    request: pytest.FixtureRequest,
+    authenticated_context: BrowserContext,
+    auth_cache: AuthStateCache,
+    browser: Browser,
+    config: Settings,
+    network_router: NetworkRouter,
 ) -> Generator[Page, None, None]:
-    with sync_playwright() as playwright:
-        browser = _get_browser(playwright, config)
-        record_video_dir: Optional[Path] = None
-        if config.video_mode != "off":
-            VIDEO_DIR.mkdir(parents=True, exist_ok=True)
-            record_video_dir = VIDEO_DIR
+    """Return a logged-in page that already shows the inventory."""
+    with _open_page(request, authenticated_context, config) as page_obj:
+        page_obj.goto(INVENTORY_PATH, wait_until="domcontentloaded")
+        if INVENTORY_PATH not in page_obj.url:
+            key = credentials_key(config)
+            auth_cache.invalidate(key)
+            state = auth_cache.get(
+                key, lambda: login_storage_state(browser, config, network_router)
+            )
+            authenticated_context.clear_cookies()
+            # Stored cookies have every key add_cookies takes; Playwright
+            # types the two structures separately.
+            authenticated_context.add_cookies(cast(List[Any], state["cookies"]))
+            page_obj.goto(INVENTORY_PATH, wait_until="domcontentloaded")
+        yield page_obj
 
-        context = browser.new_context(
-            base_url=config.base_url,
-            record_video_dir=str(record_video_dir) if record_video_dir else None,
+
+@pytest.fixture(scope="function")
+def record(request: pytest.FixtureRequest) -> datasets.Record:
+    """The record a @pytest.mark.dataset(path) test runs with, read on demand."""
+    ref: Optional[RecordRef] = getattr(request, "param", None)
+    if ref is None:
+        raise pytest.UsageError(
+            f"{request.node.nodeid}: record needs @pytest.mark.dataset(path)"
         )
+    dataset = datasets.load(
+        request.config.rootpath / ref.path, getattr(request.config, "cache", None)
+    )
+    return dataset.record(ref.row)
+
 
-        if config.trace_mode != "off":
-            context.tracing.start(screenshots=True, snapshots=True, sources=True)
+@pytest.fixture(scope="function")
+def seeded_state(request: pytest.FixtureRequest, config: Settings) -> StorageState:
+    """Session cookie plus the cart from @pytest.mark.seed_cart(*products).
 
-        page_obj = context.new_page()
-        request.node._page = page_obj
-        request.node._screenshot_attached = False
+    seed_cart(from_record="field") takes the products from a ";"-separated
+    field of the dataset record instead.
+    """
+    _require_credentials(config)
+    marker = request.node.get_closest_marker("seed_cart")
+    products: Tuple[str, ...] = marker.args if marker is not None else ()
+    field = marker.kwargs.get("from_record") if marker is not None else None
+    if field:
+        value = request.getfixturevalue("record")[field]
+        products = tuple(name.strip() for name in value.split(";") if name.strip())
+    return (
+        StateBuilder(config.base_url)
+        .session(config.app_username.get_secret_value())
+        .cart(*products)
+        .build()
+    )
+
+
+@pytest.fixture(scope="function")
+def seeded_page(
+    request: pytest.FixtureRequest,
+    browser: Browser,
+    config: Settings,
+    network_router: NetworkRouter,
+    seeded_state: StorageState,
+) -> Generator[Page, None, None]:
+    """Return a page opened on checkout step one with a seeded cart.
 
+    Override the landing page with @pytest.mark.seed_cart(..., path="cart.html").
+    """
+    marker = request.node.get_closest_marker("seed_cart")
+    path = CHECKOUT_STEP_ONE_PATH
+    if marker is not None:
+        path = marker.kwargs.get("path", path)
+    with _open_context(
+        request, browser, config, network_router, seeded_state
+    ) as context_obj, _open_page(request, context_obj, config) as page_obj:
+        page_obj.goto(path, wait_until="domcontentloaded")
         yield page_obj
 
-        rep = getattr(request.node, "rep_call", None)
-        failed = rep is not None and rep.failed
 
-        if failed and not request.node._screenshot_attached:
-            try:
-                _attach_failure_screenshot(page_obj)
-            except Exception:
-                pass
+@pytest.fixture(scope="session")
+def checkpoint_tree(config: Settings) -> CheckpointTree:
+    """Per-worker flow checkpoints, shared by every test on the worker."""
+    return CheckpointTree(config.flow_checkpoints, config.auth_state_ttl)
 
-        if config.trace_mode != "off":
-            if failed or config.trace_mode == "on":
-                try:
-                    _save_trace(context, request.node.nodeid)
-                except Exception:
-                    context.tracing.stop()
-            else:
-                context.tracing.stop()
 
-        context.close()
+@pytest.fixture(scope="function")
+def flow_runner(
+    request: pytest.FixtureRequest,
+    browser: Browser,
+    config: Settings,
+    network_router: NetworkRouter,
+    checkpoint_tree: CheckpointTree,
+) -> Generator[Callable[[Flow], Any], None, None]:
+    """Run a Flow, resuming from the deepest checkpoint an earlier test stored.
 
-        if config.video_mode == "retain-on-failure" and not failed:
-            try:
-                if page_obj.video:
-                    video_path = page_obj.video.path()
-                    Path(video_path).unlink(missing_ok=True)
-            except Exception:
-                pass
+    The context is created on the first call, from the checkpoint's storage
+    state when one matches; call it once per test.
+    """
+    with ExitStack() as stack:
+
+        def open_page(state: Optional[StorageState]) -> Page:
+            context_obj = stack.enter_context(
+                _open_context(request, browser, config, network_router, state)
+            )
+            return stack.enter_context(_open_page(request, context_obj, config))
+
+        runner = FlowRunner(open_page, checkpoint_tree)
+        yield runner.run
+        if not runner.runs:
+            return
+        request.node.user_properties.append(
+            (
+                "flows",
+                {
+                    "runs": runner.runs,
+                    "resumed_steps": runner.resumed_steps,
+                    "steps_run": runner.steps_run,
+                },
+            )
+        )
+
+
+@pytest.fixture(scope="module")
+def shared_context(
+    request: pytest.FixtureRequest,
+    browser: Browser,
+    config: Settings,
+    network_router: NetworkRouter,
+    auth_cache: AuthStateCache,
+) -> Generator[SharedContext, None, None]:
+    """One logged-in context and page shared by every test in a module.
+
+    The context is traced once; each test records its own trace chunk.
+    """
+    _require_credentials(config)
+    state = auth_cache.get(
+        credentials_key(config),
+        lambda: login_storage_state(browser, config, network_router),
+    )
+    context_obj = browser.new_context(base_url=config.base_url, storage_state=state)
+    network_router.install(context_obj, _safe_test_name(request.node.nodeid))
+    trace_level = request.config.stash[_TRACING_POLICY_KEY].start_group(context_obj)
+    shared = SharedContext(context_obj, context_obj.new_page(), trace_level)
+
+    yield shared
+
+    if trace_level is not None:
+        try:
+            context_obj.tracing.stop()
+        except Exception:
+            pass
+    context_obj.close()
+
+
+@pytest.fixture(scope="function")
+def shared_page(
+    request: pytest.FixtureRequest,
+    shared_context: SharedContext,
+) -> Generator[Page, None, None]:
+    """The module's shared logged-in page, reset to the inventory per test."""
+    page_obj = shared_context.page
+    request.node.stash[_PAGE_KEY] = page_obj
+    request.node.stash[_SCREENSHOT_ATTACHED_KEY] = False
+    trace = request.config.stash[_TRACING_POLICY_KEY].start_chunk(
+        shared_context.context, _attempt(request.node), shared_context.trace_level
+    )
+    page_obj.goto(INVENTORY_PATH, wait_until="domcontentloaded")
+
+    yield page_obj
+
+    rep = request.node.stash.get(_REP_CALL_KEY, None)
+    failed = rep is not None and rep.failed
+
+    if failed and not request.node.stash[_SCREENSHOT_ATTACHED_KEY]:
+        try:
+            _attach_failure_screenshot(page_obj, _pipeline(request.config))
+        except Exception:
+            pass
+
+    _finish_trace(request, trace, failed)
+
+
+@pytest.fixture(scope="session")
+def async_browser_host(config: Settings) -> Generator[AsyncBrowserHost, None, None]:
+    """One event loop thread and async browser per worker for async flows."""
+    with AsyncBrowserHost(config) as host:
+        yield host
+
+
+@pytest.fixture(scope="function")
+def async_flow_runner(
+    async_browser_host: AsyncBrowserHost,
+) -> Callable[..., List[FlowResult]]:
+    """Run async page-object flows concurrently, each in a new context.
+
+    All calls share the worker's async browser, and sync Playwright fixtures
+    may be in use in the same test.
+    """
+
+    def run(
+        flow: AsyncFlow,
+        count: int,
+        *,
+        concurrency: Optional[int] = None,
+        storage_state: Optional[StorageState] = None,
+    ) -> List[FlowResult]:
+        return async_browser_host.run(
+            flow,
+            count,
+            concurrency=concurrency,
+            storage_state=storage_state,
+        )
 
-        browser.close()
+    return run
@@ -0,0 +1,268 @@
+from __future__ import annotations
+
+import time
+from types import MappingProxyType
+from typing import Any, ClassVar, ContextManager, Dict, Mapping, Optional, Sequence
+
+from playwright.async_api import Error as PlaywrightError
+from playwright.async_api import Locator, Page
+from playwright.async_api import TimeoutError as PlaywrightTimeoutError
+
+from config.settings import get_settings
+from pages.base_page import DEFAULT_PROFILE, DEFAULT_TIMEOUT_MS
+from pages.interaction import (
+    ACTIONABILITY_SCRIPT,
+    DETACHED,
+    DISABLED,
+    QUERY_SCRIPT,
+    READY,
+    BatchState,
+    is_navigation_error,
+    query_options,
+)
+from pages.selectors import cached_locator, register_page_class
+from utils import budget, impact, timing, visual
+
+
+class BasePage:
+    """Async counterpart of pages.base_page.BasePage."""
+
+    SELECTORS: ClassVar[Mapping[str, str]] = {}
+    _maps: ClassVar[Mapping[str, str]] = MappingProxyType({})
+
+    def __init_subclass__(cls, **kwargs: Any) -> None:
+        super().__init_subclass__(**kwargs)
+        cls._maps = register_page_class(cls)
+
+    def __init__(self, page: Page) -> None:
+        self.page = page
+        self.profile = DEFAULT_PROFILE
+        impact.record_page(type(self))
+
+    def map(self, name: str) -> str:
+        """Return the selector mapped to a logical name."""
+        try:
+            selector = self._maps[name]
+        except KeyError as exc:
+            raise KeyError(f"Selector map missing for '{name}'.") from exc
+        impact.record_selector(type(self), name)
+        return selector
+
+    def _span(
+        self,
+        name: Optional[str],
+        selector: Optional[str],
+        phase: str,
+    ) -> ContextManager[None]:
+        """Time one phase of an operation for the per-test latency breakdown."""
+        return timing.span(type(self).__name__, name, selector, phase)
+
+    def _budgeted(
+        self,
+        timeout_ms: Optional[int],
+        step: Optional[str] = None,
+        target: Optional[str] = None,
+    ) -> int:
+        """Resolve a step timeout, capped at the test's remaining budget.
+
+        Named steps are recorded so an exhausted budget reports where it went.
+        """
+        if timeout_ms is None:
+            timeout_ms = DEFAULT_TIMEOUT_MS
+        label = None
+        if step is not None:
+            label = f"{type(self).__name__}.{step}"
+            if target is not None:
+                label += f"({target})"
+        return budget.clamp(timeout_ms, label)
+
+    async def get_element(
+        self,
+        name_or_selector: str,
+        *,
+        use_map: bool = True,
+        timeout_ms: Optional[int] = None,
+    ) -> Locator:
+        """Return a locator, waiting for the element to be attached."""
+        name = name_or_selector if use_map else None
+        selector = self.map(name_or_selector) if use_map else name_or_selector
+        timeout_ms = self._budgeted(timeout_ms, "get_element", name or selector)
+        locator: Locator = cached_locator(self.page, selector)
+        with self._span(name, selector, "wait"):
+            try:
+                await locator.wait_for(state="attached", timeout=timeout_ms)
+            except PlaywrightTimeoutError as exc:
+                raise TimeoutError(f"Element not attached: {selector}") from exc
+        return locator
+
+    async def query(
+        self,
+        *names: str,
+        attributes: Sequence[str] = (),
+        until: Optional[Mapping[str, str]] = None,
+        timeout_ms: Optional[int] = None,
+    ) -> BatchState:
+        """Snapshot several mapped elements in one in-page evaluation.
+
+        Returns count, visibility, text and the requested attributes per name.
+        With until (name -> visible/hidden/attached/detached) the page polls
+        until every expectation holds or the timeout passes; see .satisfied.
+        """
+        timeout_ms = self._budgeted(timeout_ms, "query", ",".join(names))
+        options = query_options(self.map, names, attributes, until, timeout_ms)
+        deadline = time.monotonic() + timeout_ms / 1000
+        with self._span("+".join(options["selectors"]), None, "query"):
+            while True:
+                try:
+                    raw = await self.page.evaluate(QUERY_SCRIPT, options)
+                    break
+                except PlaywrightError as exc:
+                    if not is_navigation_error(exc):
+                        raise
+                    # A navigation destroyed the context; retry on the new page.
+                    remaining_ms = (deadline - time.monotonic()) * 1000
+                    if remaining_ms <= 0:
+                        raise RuntimeError(
+                            f"Batch query failed: {', '.join(options['selectors'])}"
+                        ) from exc
+                    if options["until"]:
+                        options["timeout"] = remaining_ms
+                    try:
+                        await self.page.wait_for_load_state(
+                            "domcontentloaded", timeout=remaining_ms
+                        )
+                    except PlaywrightError:
+                        pass
+        return BatchState.from_script(raw)
+
+    async def _check_actionable(
+        self,
+        locator: Locator,
+        selector: str,
+        timeout_ms: Optional[int],
+        highlight: bool,
+        name: Optional[str] = None,
+    ) -> None:
+        timeout_ms = self._budgeted(timeout_ms)
+        deadline = time.monotonic() + timeout_ms / 1000
+        phase = "wait+highlight" if highlight else "wait"
+        with self._span(name, selector, phase):
+            while True:
+                remaining_ms = max(int((deadline - time.monotonic()) * 1000), 1)
+                try:
+                    status = await locator.evaluate(
+                        ACTIONABILITY_SCRIPT,
+                        {
+                            "timeout": remaining_ms,
+                            "highlight": highlight,
+                            "highlightMs": self.profile.highlight_ms,
+                        },
+                        timeout=remaining_ms,
+                    )
+                except PlaywrightTimeoutError as exc:
+                    raise TimeoutError(f"Element not visible: {selector}") from exc
+                except PlaywrightError as exc:
+                    raise RuntimeError(f"Element not available: {selector}") from exc
+                # A re-render replaced the node; the locator resolves the new one.
+                if status != DETACHED or time.monotonic() >= deadline:
+                    break
+        if status == DISABLED:
+            raise TimeoutError(f"Element not enabled: {selector}")
+        if status != READY:
+            raise TimeoutError(f"Element not visible: {selector}")
+
+    async def _prepare_action(
+        self,
+        locator: Locator,
+        selector: str,
+        timeout_ms: Optional[int],
+        name: Optional[str] = None,
+    ) -> None:
+        """Wait until actionable and highlight per profile in one round-trip."""
+        await self._check_actionable(
+            locator, selector, timeout_ms, highlight=self.profile.highlight, name=name
+        )
+
+    async def click(
+        self,
+        name_or_selector: str,
+        *,
+        use_map: bool = True,
+        timeout_ms: Optional[int] = None,
+    ) -> None:
+        """Wait for and click an element, highlighting it in the demo profile."""
+        name = name_or_selector if use_map else None
+        selector = self.map(name_or_selector) if use_map else name_or_selector
+        timeout_ms = self._budgeted(timeout_ms, "click", name or selector)
+        locator = cached_locator(self.page, selector)
+        await self._prepare_action(locator, selector, timeout_ms, name=name)
+        with self._span(name, selector, "action"):
+            try:
+                await locator.click(timeout=self._budgeted(timeout_ms))
+            except PlaywrightTimeoutError as exc:
+                raise TimeoutError(f"Timed out clicking: {selector}") from exc
+            except PlaywrightError as exc:
+                raise RuntimeError(f"Failed clicking: {selector}") from exc
+
+    async def fill(
+        self,
+        name_or_selector: str,
+        value: str,
+        *,
+        use_map: bool = True,
+        timeout_ms: Optional[int] = None,
+    ) -> None:
+        """Wait for and fill an input element, highlighting it in the demo profile."""
+        name = name_or_selector if use_map else None
+        selector = self.map(name_or_selector) if use_map else name_or_selector
+        timeout_ms = self._budgeted(timeout_ms, "fill", name or selector)
+        locator = cached_locator(self.page, selector)
+        await self._prepare_action(locator, selector, timeout_ms, name=name)
+        with self._span(name, selector, "action"):
+            try:
+                await locator.fill(value, timeout=self._budgeted(timeout_ms))
+            except PlaywrightTimeoutError as exc:
+                raise TimeoutError(f"Timed out filling: {selector}") from exc
+            except PlaywrightError as exc:
+                raise RuntimeError(f"Failed filling: {selector}") from exc
+
+    async def assert_visual(
+        self,
+        snapshot: str,
+        name: Optional[str] = None,
+        *,
+        mask: Sequence[str] = (),
+        ignore: Sequence[visual.Box] = (),
+        max_diff_ratio: Optional[float] = None,
+        timeout_ms: Optional[int] = None,
+    ) -> visual.Comparison:
+        """Compare the full page, or a mapped element, with its baseline.
+
+        Elements named in mask are painted over in the screenshot; ignore
+        takes pixel regions. Raises visual.VisualMismatch on a difference.
+        """
+        timeout_ms = self._budgeted(timeout_ms, "assert_visual", snapshot)
+        options: Dict[str, Any] = {
+            "animations": "disabled",
+            "caret": "hide",
+            "mask": [cached_locator(self.page, self.map(item)) for item in mask],
+            "timeout": timeout_ms,
+        }
+        selector = self.map(name) if name is not None else None
+        with self._span(name, selector, "screenshot"):
+            try:
+                if selector is None:
+                    png = await self.page.screenshot(full_page=True, **options)
+                else:
+                    locator = cached_locator(self.page, selector)
+                    png = await locator.screenshot(**options)
+            except PlaywrightTimeoutError as exc:
+                raise TimeoutError(f"Timed out capturing: {snapshot}") from exc
+        with self._span(name, selector, "compare"):
+            return visual.check(
+                get_settings(),
+                snapshot,
+                png,
+                ignore=ignore,
+                max_diff_ratio=max_diff_ratio,
+            )
@@ -0,0 +1,23 @@
+from __future__ import annotations
+
+from pages.aio.base_page import BasePage
+from pages.aio.checkout_information_page import CheckoutInformationPage
+from pages.cart_page import CartPage as SyncCartPage
+
+
+class CartPage(BasePage):
+    """Async page object for the SauceDemo cart page."""
+
+    SELECTORS = SyncCartPage.SELECTORS
+
+    async def is_cart_visible(self, timeout_ms: int = 5000) -> bool:
+        """Return True when the cart list is visible."""
+        state = await self.query(
+            "cart_list", until={"cart_list": "visible"}, timeout_ms=timeout_ms
+        )
+        return state.satisfied
+
+    async def checkout(self, timeout_ms: int = 5000) -> CheckoutInformationPage:
+        """Proceed to checkout and return the checkout information page."""
+        await self.click("checkout_button", timeout_ms=timeout_ms)
+        return CheckoutInformationPage(self.page)
@@ -0,0 +1,21 @@
+from __future__ import annotations
+
+from pages.aio.base_page import BasePage
+from pages.checkout_complete_page import (
+    CheckoutCompletePage as SyncCheckoutCompletePage,
+)
+
+
+class CheckoutCompletePage(BasePage):
+    """Async page object for the SauceDemo checkout complete page."""
+
+    SELECTORS = SyncCheckoutCompletePage.SELECTORS
+
+    async def is_order_complete(self, timeout_ms: int = 5000) -> bool:
+        """Return True when the completion header is visible."""
+        state = await self.query(
+            "complete_header",
+            until={"complete_header": "visible"},
+            timeout_ms=timeout_ms,
+        )
+        return state.satisfied
@@ -0,0 +1,27 @@
+from __future__ import annotations
+
+from pages.aio.base_page import BasePage
+from pages.aio.checkout_overview_page import CheckoutOverviewPage
+from pages.checkout_information_page import (
+    CheckoutInformationPage as SyncCheckoutInformationPage,
+)
+
+
+class CheckoutInformationPage(BasePage):
+    """Async page object for the SauceDemo checkout information page."""
+
+    SELECTORS = SyncCheckoutInformationPage.SELECTORS
+
+    async def submit_customer_info(
+        self,
+        first_name: str,
+        last_name: str,
+        postal_code: str,
+        timeout_ms: int = 5000,
+    ) -> CheckoutOverviewPage:
+        """Fill customer info and continue to the overview page."""
+        await self.fill("first_name_input", first_name, timeout_ms=timeout_ms)
+        await self.fill("last_name_input", last_name, timeout_ms=timeout_ms)
+        await self.fill("postal_code_input", postal_code, timeout_ms=timeout_ms)
+        await self.click("continue_button", timeout_ms=timeout_ms)
+        return CheckoutOverviewPage(self.page)
@@ -0,0 +1,18 @@
+from __future__ import annotations
+
+from pages.aio.base_page import BasePage
+from pages.aio.checkout_complete_page import CheckoutCompletePage
+from pages.checkout_overview_page import (
+    CheckoutOverviewPage as SyncCheckoutOverviewPage,
+)
+
+
+class CheckoutOverviewPage(BasePage):
+    """Async page object for the SauceDemo checkout overview page."""
+
+    SELECTORS = SyncCheckoutOverviewPage.SELECTORS
+
+    async def finish_checkout(self, timeout_ms: int = 5000) -> CheckoutCompletePage:
+        """Finish checkout and return the completion page."""
+        await self.click("finish_button", timeout_ms=timeout_ms)
+        return CheckoutCompletePage(self.page)
@@ -0,0 +1,52 @@
+from __future__ import annotations
+
+from typing import Optional
+
+from config.settings import get_settings
+from pages.aio.base_page import BasePage
+from pages.checkout_page import CheckoutPage as SyncCheckoutPage
+
+
+class CheckoutPage(BasePage):
+    """Async page object for cart and checkout flow."""
+
+    SELECTORS = SyncCheckoutPage.SELECTORS
+
+    async def checkout(self, timeout_ms: Optional[int] = None) -> None:
+        """Click checkout button from the cart page."""
+        if timeout_ms is None:
+            timeout_ms = get_settings().timeout
+        await self.click("checkout_button", timeout_ms=timeout_ms)
+
+    async def fill_information(
+        self,
+        first_name: str,
+        last_name: str,
+        zip_code: str,
+        timeout_ms: Optional[int] = None,
+    ) -> None:
+        """Fill checkout information and continue."""
+        if timeout_ms is None:
+            timeout_ms = get_settings().timeout
+        await self.fill("first_name_input", first_name, timeout_ms=timeout_ms)
+        await self.fill("last_name_input", last_name, timeout_ms=timeout_ms)
+        await self.fill("postal_code_input", zip_code, timeout_ms=timeout_ms)
+        await self.click("continue_button", timeout_ms=timeout_ms)
+
+    async def finish_checkout(self, timeout_ms: Optional[int] = None) -> None:
+        """Finish checkout."""
+        if timeout_ms is None:
+            timeout_ms = get_settings().timeout
+        await self.click("finish_button", timeout_ms=timeout_ms)
+
+    async def get_complete_header(self, timeout_ms: Optional[int] = None) -> str:
+        """Return the checkout success header text."""
+        if timeout_ms is None:
+            timeout_ms = get_settings().timeout
+        state = await self.query(
+            "complete_header",
+            until={"complete_header": "visible"},
+            timeout_ms=timeout_ms,
+        )
+        text = state["complete_header"].text if state.satisfied else None
+        return text.strip() if text else ""
@@ -0,0 +1,133 @@
+from __future__ import annotations
+
+from typing import Any, Dict, List, Optional, Sequence
+
+from playwright.async_api import Locator
+from playwright.async_api import TimeoutError as PlaywrightTimeoutError
+
+from config.settings import get_settings
+from pages.aio.base_page import BasePage
+from pages.aio.checkout_page import CheckoutPage
+from pages.catalog import ADD_TO_CART_SCRIPT
+from pages.catalog import CATALOG_SCRIPT
+from pages.catalog import CatalogItem
+from pages.catalog import check_added
+from pages.catalog import parse_catalog
+from pages.inventory_page import InventoryPage as SyncInventoryPage
+
+
+class InventoryPage(BasePage):
+    """Async page object for the SauceDemo inventory page."""
+
+    SELECTORS = SyncInventoryPage.SELECTORS
+
+    async def is_inventory_visible(self, timeout_ms: Optional[int] = None) -> bool:
+        """Return True when the inventory list is visible."""
+        if timeout_ms is None:
+            timeout_ms = get_settings().timeout
+        state = await self.query(
+            "inventory_list", until={"inventory_list": "visible"}, timeout_ms=timeout_ms
+        )
+        return state.satisfied
+
+    async def is_products_title_visible(self, timeout_ms: Optional[int] = None) -> bool:
+        """Return True when the Products title is visible."""
+        if timeout_ms is None:
+            timeout_ms = get_settings().timeout
+        state = await self.query(
+            "products_title", until={"products_title": "visible"}, timeout_ms=timeout_ms
+        )
+        return state.satisfied
+
+    async def add_item_to_cart(
+        self,
+        item_name: str,
+        timeout_ms: Optional[int] = None,
+    ) -> None:
+        """Add a specific item to the cart by product name."""
+        if timeout_ms is None:
+            timeout_ms = get_settings().timeout
+        await self._visible_list(timeout_ms)
+
+        item_locator: Locator = (
+            self.page.locator(self.map("inventory_item"))
+            .filter(has_text=item_name)
+            .first
+        )
+
+        button_locator: Locator = item_locator.locator(self.map("add_to_cart_button"))
+        await self._prepare_action(
+            button_locator, "add-to-cart button", timeout_ms, name="inventory_item"
+        )
+        with self._span("inventory_item", "add-to-cart button", "action"):
+            await button_locator.click(timeout=self._budgeted(timeout_ms))
+
+    async def _visible_list(self, timeout_ms: int) -> Locator:
+        list_locator = await self.get_element("inventory_list", timeout_ms=timeout_ms)
+        try:
+            await list_locator.wait_for(
+                state="visible", timeout=self._budgeted(timeout_ms)
+            )
+        except PlaywrightTimeoutError as exc:
+            raise TimeoutError("Inventory list not visible.") from exc
+        return list_locator
+
+    def _catalog_selectors(self) -> Dict[str, Any]:
+        return {
+            "item": self.map("inventory_item"),
+            "name": self.map("item_name"),
+            "description": self.map("item_description"),
+            "price": self.map("item_price"),
+            "button": self.map("add_to_cart_button"),
+        }
+
+    async def add_items_to_cart(
+        self,
+        item_names: Sequence[str],
+        timeout_ms: Optional[int] = None,
+    ) -> List[str]:
+        """Add several products in one DOM pass; return the names newly added.
+
+        Products already in the cart are skipped; unknown or disabled products
+        raise ValueError and nothing is clicked.
+        """
+        if timeout_ms is None:
+            timeout_ms = get_settings().timeout
+        list_locator = await self._visible_list(timeout_ms)
+        selector = f"add-to-cart x{len(item_names)}"
+        with self._span("inventory_item", selector, "action"):
+            statuses = await list_locator.evaluate(
+                ADD_TO_CART_SCRIPT,
+                {**self._catalog_selectors(), "names": list(item_names)},
+            )
+        return check_added(statuses)
+
+    async def get_catalog(self, timeout_ms: Optional[int] = None) -> List[CatalogItem]:
+        """Return every product card from a single evaluate."""
+        if timeout_ms is None:
+            timeout_ms = get_settings().timeout
+        list_locator = await self._visible_list(timeout_ms)
+        with self._span("inventory_list", "catalog", "read"):
+            rows = await list_locator.evaluate(
+                CATALOG_SCRIPT, self._catalog_selectors()
+            )
+        return parse_catalog(rows)
+
+    async def add_to_cart(
+        self,
+        item_name: str,
+        timeout_ms: Optional[int] = None,
+    ) -> None:
+        """Add a specific item to the cart by product name."""
+        await self.add_item_to_cart(item_name, timeout_ms=timeout_ms)
+
+    async def go_to_cart(self, timeout_ms: Optional[int] = None) -> CheckoutPage:
+        """Open the shopping cart and return the checkout page object."""
+        if timeout_ms is None:
+            timeout_ms = get_settings().timeout
+        await self.click("cart_link", timeout_ms=timeout_ms)
+        return CheckoutPage(self.page)
+
+    async def open_cart(self, timeout_ms: Optional[int] = None) -> CheckoutPage:
+        """Open the shopping cart and return the checkout page object."""
+        return await self.go_to_cart(timeout_ms=timeout_ms)
@@ -0,0 +1,35 @@
+from __future__ import annotations
+
+from playwright.async_api import Page
+
+from config.settings import get_settings
+from pages.aio.base_page import BasePage
+from pages.aio.inventory_page import InventoryPage
+from pages.base_page import NAVIGATION_TIMEOUT_MS
+from pages.login_page import LoginPage as SyncLoginPage
+
+
+class LoginPage(BasePage):
+    """Async page object for the SauceDemo login page."""
+
+    SELECTORS = SyncLoginPage.SELECTORS
+
+    def __init__(self, page: Page) -> None:
+        super().__init__(page)
+        self._base_url = get_settings().base_url
+
+    async def open(self) -> None:
+        """Navigate to the login page."""
+        with self._span(None, self._base_url, "navigation"):
+            await self.page.goto(
+                self._base_url,
+                wait_until="domcontentloaded",
+                timeout=self._budgeted(NAVIGATION_TIMEOUT_MS, "open"),
+            )
+
+    async def login(self, username: str, password: str) -> InventoryPage:
+        """Log in and return the inventory page object."""
+        await self.fill("username_input", username)
+        await self.fill("password_input", password)
+        await self.click("login_button")
+        return InventoryPage(self.page)
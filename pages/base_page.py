@@ -1,30 +1,89 @@
 ﻿from __future__ import annotations
 
-from typing import Dict, Optional
+import time
+from types import MappingProxyType
+from typing import Any, ClassVar, ContextManager, Dict, Mapping, Optional, Sequence
 
 from playwright.sync_api import Error as PlaywrightError
-from playwright.sync_api import Locator
-from playwright.sync_api import Page
+from playwright.sync_api import Locator, Page
 from playwright.sync_api import TimeoutError as PlaywrightTimeoutError
 
 from config.settings import get_settings
+from pages.interaction import (
+    ACTIONABILITY_SCRIPT,
+    DETACHED,
+    DISABLED,
+    QUERY_SCRIPT,
+    READY,
+    BatchState,
+    get_profile,
+    is_navigation_error,
+    query_options,
+)
+from pages.selectors import cached_locator, register_page_class
+from utils import budget, impact, timing, visual
 
 DEFAULT_TIMEOUT_MS = get_settings().timeout
+DEFAULT_PROFILE = get_profile(get_settings().interaction_profile)
+# Playwright's own default for navigations, kept when no budget applies.
+NAVIGATION_TIMEOUT_MS = 30000
 
 
 class BasePage:
-    """Base page object providing robust element interactions."""
+    """Base page object providing robust element interactions.
+
+    Subclasses declare their selectors in a class-level SELECTORS mapping;
+    it is merged with the bases' selectors and validated once per class.
+    """
+
+    SELECTORS: ClassVar[Mapping[str, str]] = {}
+    _maps: ClassVar[Mapping[str, str]] = MappingProxyType({})
+
+    def __init_subclass__(cls, **kwargs: Any) -> None:
+        super().__init_subclass__(**kwargs)
+        cls._maps = register_page_class(cls)
 
     def __init__(self, page: Page) -> None:
         self.page = page
-        self._maps: Dict[str, str] = {}
+        self.profile = DEFAULT_PROFILE
+        impact.record_page(type(self))
 
     def map(self, name: str) -> str:
         """Return the selector mapped to a logical name."""
         try:
-            return self._maps[name]
+            selector = self._maps[name]
         except KeyError as exc:
             raise KeyError(f"Selector map missing for '{name}'.") from exc
+        impact.record_selector(type(self), name)
+        return selector
+
+    def _span(
+        self,
+        name: Optional[str],
+        selector: Optional[str],
+        phase: str,
+    ) -> ContextManager[None]:
+        """Time one phase of an operation for the per-test latency breakdown."""
+        return timing.span(type(self).__name__, name, selector, phase)
+
+    def _budgeted(
+        self,
+        timeout_ms: Optional[int],
+        step: Optional[str] = None,
+        target: Optional[str] = None,
+    ) -> int:
+        """Resolve a step timeout, capped at the test's remaining budget.
+
+        Named steps are recorded so an exhausted budget reports where it went.
+        """
+        if timeout_ms is None:
+            timeout_ms = DEFAULT_TIMEOUT_MS
+        label = None
+        if step is not None:
+            label = f"{type(self).__name__}.{step}"
+            if target is not None:
+                label += f"({target})"
+        return budget.clamp(timeout_ms, label)
 
     def get_element(
         self,
@@ -34,52 +93,104 @@ class BasePage:
         timeout_ms: Optional[int] = None,
     ) -> Locator:
         """Return a locator, waiting for the element to be attached."""
-        if timeout_ms is None:
-            timeout_ms = DEFAULT_TIMEOUT_MS
+        name = name_or_selector if use_map else None
         selector = self.map(name_or_selector) if use_map else name_or_selector
-        locator = self.page.locator(selector)
-        try:
-            locator.wait_for(state="attached", timeout=timeout_ms)
-        except PlaywrightTimeoutError as exc:
-            raise TimeoutError(f"Element not attached: {selector}") from exc
+        timeout_ms = self._budgeted(timeout_ms, "get_element", name or selector)
+        locator: Locator = cached_locator(self.page, selector)
+        with self._span(name, selector, "wait"):
+            try:
+                locator.wait_for(state="attached", timeout=timeout_ms)
+            except PlaywrightTimeoutError as exc:
+                raise TimeoutError(f"Element not attached: {selector}") from exc
         return locator
 
-    def _wait_for_actionable(
+    def query(
+        self,
+        *names: str,
+        attributes: Sequence[str] = (),
+        until: Optional[Mapping[str, str]] = None,
+        timeout_ms: Optional[int] = None,
+    ) -> BatchState:
+        """Snapshot several mapped elements in one in-page evaluation.
+
+        Returns count, visibility, text and the requested attributes per name.
+        With until (name -> visible/hidden/attached/detached) the page polls
+        until every expectation holds or the timeout passes; see .satisfied.
+        """
+        timeout_ms = self._budgeted(timeout_ms, "query", ",".join(names))
+        options = query_options(self.map, names, attributes, until, timeout_ms)
+        deadline = time.monotonic() + timeout_ms / 1000
+        with self._span("+".join(options["selectors"]), None, "query"):
+            while True:
+                try:
+                    raw = self.page.evaluate(QUERY_SCRIPT, options)
+                    break
+                except PlaywrightError as exc:
+                    if not is_navigation_error(exc):
+                        raise
+                    # A navigation destroyed the context; retry on the new page.
+                    remaining_ms = (deadline - time.monotonic()) * 1000
+                    if remaining_ms <= 0:
+                        raise RuntimeError(
+                            f"Batch query failed: {', '.join(options['selectors'])}"
+                        ) from exc
+                    if options["until"]:
+                        options["timeout"] = remaining_ms
+                    try:
+                        self.page.wait_for_load_state(
+                            "domcontentloaded", timeout=remaining_ms
+                        )
+                    except PlaywrightError:
+                        pass
+        return BatchState.from_script(raw)
+
+    def _check_actionable(
         self,
         locator: Locator,
         selector: str,
         timeout_ms: Optional[int],
+        highlight: bool,
+        name: Optional[str] = None,
     ) -> None:
-        if timeout_ms is None:
-            timeout_ms = DEFAULT_TIMEOUT_MS
-        try:
-            locator.wait_for(state="visible", timeout=timeout_ms)
-        except PlaywrightTimeoutError as exc:
-            raise TimeoutError(f"Element not visible: {selector}") from exc
-        try:
-            handle = locator.element_handle()
-            if handle is None:
-                raise RuntimeError(f"Element handle not available: {selector}")
-            self.page.wait_for_function(
-                "(el) => !el.hasAttribute('disabled') && el.getAttribute('aria-disabled') !== 'true'",
-                arg=handle,
-                timeout=timeout_ms,
-            )
-        except PlaywrightTimeoutError as exc:
-            raise TimeoutError(f"Element not enabled: {selector}") from exc
+        timeout_ms = self._budgeted(timeout_ms)
+        deadline = time.monotonic() + timeout_ms / 1000
+        phase = "wait+highlight" if highlight else "wait"
+        with self._span(name, selector, phase):
+            while True:
+                remaining_ms = max(int((deadline - time.monotonic()) * 1000), 1)
+                try:
+                    status = locator.evaluate(
+                        ACTIONABILITY_SCRIPT,
+                        {
+                            "timeout": remaining_ms,
+                            "highlight": highlight,
+                            "highlightMs": self.profile.highlight_ms,
+                        },
+                        timeout=remaining_ms,
+                    )
+                except PlaywrightTimeoutError as exc:
+                    raise TimeoutError(f"Element not visible: {selector}") from exc
+                except PlaywrightError as exc:
+                    raise RuntimeError(f"Element not available: {selector}") from exc
+                # A re-render replaced the node; the locator resolves the new one.
+                if status != DETACHED or time.monotonic() >= deadline:
+                    break
+        if status == DISABLED:
+            raise TimeoutError(f"Element not enabled: {selector}")
+        if status != READY:
+            raise TimeoutError(f"Element not visible: {selector}")
 
-    def _highlight(self, locator: Locator) -> None:
-        try:
-            handle = locator.element_handle()
-            if handle is None:
-                return
-            self.page.evaluate(
-                "(el) => { el.style.outline = '3px solid #ff6a00'; el.style.outlineOffset = '2px'; }",
-                handle,
-            )
-            self.page.wait_for_timeout(150)
-        except PlaywrightError:
-            return
+    def _prepare_action(
+        self,
+        locator: Locator,
+        selector: str,
+        timeout_ms: Optional[int],
+        name: Optional[str] = None,
+    ) -> None:
+        """Wait until actionable and highlight per profile in one round-trip."""
+        self._check_actionable(
+            locator, selector, timeout_ms, highlight=self.profile.highlight, name=name
+        )
 
     def click(
         self,
@@ -88,19 +199,19 @@ class BasePage:
         use_map: bool = True,
         timeout_ms: Optional[int] = None,
     ) -> None:
-        """Wait for and click an element with a visible highlight."""
-        if timeout_ms is None:
-            timeout_ms = DEFAULT_TIMEOUT_MS
+        """Wait for and click an element, highlighting it in the demo profile."""
+        name = name_or_selector if use_map else None
         selector = self.map(name_or_selector) if use_map else name_or_selector
-        locator = self.page.locator(selector)
-        self._wait_for_actionable(locator, selector, timeout_ms)
-        self._highlight(locator)
-        try:
-            locator.click(timeout=timeout_ms)
-        except PlaywrightTimeoutError as exc:
-            raise TimeoutError(f"Timed out clicking: {selector}") from exc
-        except PlaywrightError as exc:
-            raise RuntimeError(f"Failed clicking: {selector}") from exc
+        timeout_ms = self._budgeted(timeout_ms, "click", name or selector)
+        locator = cached_locator(self.page, selector)
+        self._prepare_action(locator, selector, timeout_ms, name=name)
+        with self._span(name, selector, "action"):
+            try:
+                locator.click(timeout=self._budgeted(timeout_ms))
+            except PlaywrightTimeoutError as exc:
+                raise TimeoutError(f"Timed out clicking: {selector}") from exc
+            except PlaywrightError as exc:
+                raise RuntimeError(f"Failed clicking: {selector}") from exc
 
     def fill(
         self,
@@ -110,16 +221,57 @@ class BasePage:
         use_map: bool = True,
         timeout_ms: Optional[int] = None,
     ) -> None:
-        """Wait for and fill an input element with a visible highlight."""
-        if timeout_ms is None:
-            timeout_ms = DEFAULT_TIMEOUT_MS
+        """Wait for and fill an input element, highlighting it in the demo profile."""
+        name = name_or_selector if use_map else None
         selector = self.map(name_or_selector) if use_map else name_or_selector
-        locator = self.page.locator(selector)
-        self._wait_for_actionable(locator, selector, timeout_ms)
-        self._highlight(locator)
-        try:
-            locator.fill(value, timeout=timeout_ms)
-        except PlaywrightTimeoutError as exc:
-            raise TimeoutError(f"Timed out filling: {selector}") from exc
-        except PlaywrightError as exc:
-            raise RuntimeError(f"Failed filling: {selector}") from exc
+        timeout_ms = self._budgeted(timeout_ms, "fill", name or selector)
+        locator = cached_locator(self.page, selector)
+        self._prepare_action(locator, selector, timeout_ms, name=name)
+        with self._span(name, selector, "action"):
+            try:
+                locator.fill(value, timeout=self._budgeted(timeout_ms))
+            except PlaywrightTimeoutError as exc:
+                raise TimeoutError(f"Timed out filling: {selector}") from exc
+            except PlaywrightError as exc:
+                raise RuntimeError(f"Failed filling: {selector}") from exc
+
+    def assert_visual(
+        self,
+        snapshot: str,
+        name: Optional[str] = None,
+        *,
+        mask: Sequence[str] = (),
+        ignore: Sequence[visual.Box] = (),
+        max_diff_ratio: Optional[float] = None,
+        timeout_ms: Optional[int] = None,
+    ) -> visual.Comparison:
+        """Compare the full page, or a mapped element, with its baseline.
+
+        Elements named in mask are painted over in the screenshot; ignore
+        takes pixel regions. Raises visual.VisualMismatch on a difference.
+        """
+        timeout_ms = self._budgeted(timeout_ms, "assert_visual", snapshot)
+        options: Dict[str, Any] = {
+            "animations": "disabled",
+            "caret": "hide",
+            "mask": [cached_locator(self.page, self.map(item)) for item in mask],
+            "timeout": timeout_ms,
+        }
+        selector = self.map(name) if name is not None else None
+        with self._span(name, selector, "screenshot"):
+            try:
+                if selector is None:
+                    png = self.page.screenshot(full_page=True, **options)
+                else:
+                    locator = cached_locator(self.page, selector)
+                    png = locator.screenshot(**options)
+            except PlaywrightTimeoutError as exc:
+                raise TimeoutError(f"Timed out capturing: {snapshot}") from exc
+        with self._span(name, selector, "compare"):
+            return visual.check(
+                get_settings(),
+                snapshot,
+                png,
+                ignore=ignore,
+                max_diff_ratio=max_diff_ratio,
+            )
@@ -1,31 +1,24 @@
 from __future__ import annotations
 
-from playwright.sync_api import Page
-
 from pages.base_page import BasePage
 from pages.checkout_information_page import CheckoutInformationPage
+from pages.selectors import CHECKOUT_BUTTON
 
 
 class CartPage(BasePage):
     """Page object for the SauceDemo cart page."""
 
-    def __init__(self, page: Page) -> None:
-        super().__init__(page)
-        self._maps.update(
-            {
-                "cart_list": "[data-test='cart-list']",
-                "checkout_button": "[data-test='checkout']",
-            }
-        )
+    SELECTORS = {
+        "cart_list": "[data-test='cart-list']",
+        "checkout_button": CHECKOUT_BUTTON,
+    }
 
     def is_cart_visible(self, timeout_ms: int = 5000) -> bool:
         """Return True when the cart list is visible."""
-        locator = self.get_element("cart_list", timeout_ms=timeout_ms)
-        try:
-            locator.wait_for(state="visible", timeout=timeout_ms)
-        except TimeoutError:
-            return False
-        return True
+        state = self.query(
+            "cart_list", until={"cart_list": "visible"}, timeout_ms=timeout_ms
+        )
+        return state.satisfied
 
     def checkout(self, timeout_ms: int = 5000) -> CheckoutInformationPage:
         """Proceed to checkout and return the checkout information page."""
@@ -0,0 +1,100 @@
+from __future__ import annotations
+
+from dataclasses import dataclass
+from typing import Any, Dict, List, Sequence
+
+ADDED = "added"
+IN_CART = "in-cart"
+MISSING = "missing"
+DISABLED = "disabled"
+
+# Reads every product card in one pass; selectors come from the page map.
+CATALOG_SCRIPT = """
+(list, sel) => Array.from(list.querySelectorAll(sel.item), (item) => {
+  const text = (selector) => {
+    const el = item.querySelector(selector);
+    return el ? el.textContent.trim() : '';
+  };
+  const button = item.querySelector('button');
+  return {
+    name: text(sel.name),
+    description: text(sel.description),
+    price: text(sel.price),
+    button: button ? button.getAttribute('data-test') || '' : '',
+  };
+})
+"""
+
+# Resolves every requested add-to-cart button first, then clicks them, so a
+# whole cart costs one driver round-trip instead of several per product. If
+# any product is missing or disabled nothing is clicked, leaving the cart as
+# it was.
+ADD_TO_CART_SCRIPT = """
+(list, opts) => {
+  const byName = new Map();
+  for (const item of list.querySelectorAll(opts.item)) {
+    const name = item.querySelector(opts.name);
+    if (name) byName.set(name.textContent.trim(), item);
+  }
+  const result = {};
+  const targets = [];
+  for (const name of opts.names) {
+    const item = byName.get(name);
+    if (!item) { result[name] = 'missing'; continue; }
+    const button = item.querySelector(opts.button);
+    if (!button) { result[name] = 'in-cart'; continue; }
+    if (button.disabled) { result[name] = 'disabled'; continue; }
+    targets.push([name, button]);
+  }
+  if (Object.values(result).some((s) => s === 'missing' || s === 'disabled')) {
+    return result;
+  }
+  for (const [name, button] of targets) {
+    button.click();
+    result[name] = 'added';
+  }
+  return result;
+}
+"""
+
+
+@dataclass(frozen=True)
+class CatalogItem:
+    """One product card as shown on the inventory page."""
+
+    name: str
+    description: str
+    price: float
+    button: str
+
+    @property
+    def in_cart(self) -> bool:
+        return self.button.startswith("remove")
+
+
+def parse_price(text: str) -> float:
+    return float(text.strip().lstrip("$").replace(",", ""))
+
+
+def parse_catalog(rows: Sequence[Dict[str, Any]]) -> List[CatalogItem]:
+    return [
+        CatalogItem(
+            name=row["name"],
+            description=row["description"],
+            price=parse_price(row["price"]),
+            button=row["button"],
+        )
+        for row in rows
+    ]
+
+
+def check_added(statuses: Dict[str, str]) -> List[str]:
+    """Return the names added to the cart; raise for products that could not be."""
+    problems = [
+        f"{name} ({status})"
+        for name, status in statuses.items()
+        if status in (MISSING, DISABLED)
+    ]
+    if problems:
+        raise ValueError("Could not add to cart: " + ", ".join(problems))
+    return [name for name, status in statuses.items() if status == ADDED]
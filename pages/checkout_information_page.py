@@ -1,24 +1,22 @@
 from __future__ import annotations
 
-from playwright.sync_api import Page
-
 from pages.base_page import BasePage
 from pages.checkout_overview_page import CheckoutOverviewPage
+from pages.selectors import CONTINUE_BUTTON
+from pages.selectors import FIRST_NAME_INPUT
+from pages.selectors import LAST_NAME_INPUT
+from pages.selectors import POSTAL_CODE_INPUT
 
 
 class CheckoutInformationPage(BasePage):
     """Page object for the SauceDemo checkout information page."""
 
-    def __init__(self, page: Page) -> None:
-        super().__init__(page)
-        self._maps.update(
-            {
-                "first_name_input": "[data-test='firstName']",
-                "last_name_input": "[data-test='lastName']",
-                "postal_code_input": "[data-test='postalCode']",
-                "continue_button": "[data-test='continue']",
-            }
-        )
+    SELECTORS = {
+        "first_name_input": FIRST_NAME_INPUT,
+        "last_name_input": LAST_NAME_INPUT,
+        "postal_code_input": POSTAL_CODE_INPUT,
+        "continue_button": CONTINUE_BUTTON,
+    }
 
     def submit_customer_info(
         self,
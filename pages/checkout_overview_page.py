@@ -1,21 +1,16 @@
 from __future__ import annotations
 
-from playwright.sync_api import Page
-
 from pages.base_page import BasePage
 from pages.checkout_complete_page import CheckoutCompletePage
+from pages.selectors import FINISH_BUTTON
 
 
 class CheckoutOverviewPage(BasePage):
     """Page object for the SauceDemo checkout overview page."""
 
-    def __init__(self, page: Page) -> None:
-        super().__init__(page)
-        self._maps.update(
-            {
-                "finish_button": "[data-test='finish']",
-            }
-        )
+    SELECTORS = {
+        "finish_button": FINISH_BUTTON,
+    }
 
     def finish_checkout(self, timeout_ms: int = 5000) -> CheckoutCompletePage:
         """Finish checkout and return the completion page."""
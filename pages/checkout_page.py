@@ -2,28 +2,29 @@ from __future__ import annotations
 
 from typing import Optional
 
-from playwright.sync_api import Page
-
 from config.settings import get_settings
 from pages.base_page import BasePage
+from pages.selectors import CHECKOUT_BUTTON
+from pages.selectors import COMPLETE_HEADER
+from pages.selectors import CONTINUE_BUTTON
+from pages.selectors import FINISH_BUTTON
+from pages.selectors import FIRST_NAME_INPUT
+from pages.selectors import LAST_NAME_INPUT
+from pages.selectors import POSTAL_CODE_INPUT
 
 
 class CheckoutPage(BasePage):
     """Page object for cart and checkout flow."""
 
-    def __init__(self, page: Page) -> None:
-        super().__init__(page)
-        self._maps.update(
-            {
-                "checkout_button": "[data-test='checkout']",
-                "first_name_input": "[data-test='firstName']",
-                "last_name_input": "[data-test='lastName']",
-                "postal_code_input": "[data-test='postalCode']",
-                "continue_button": "[data-test='continue']",
-                "finish_button": "[data-test='finish']",
-                "complete_header": "[data-test='complete-header']",
-            }
-        )
+    SELECTORS = {
+        "checkout_button": CHECKOUT_BUTTON,
+        "first_name_input": FIRST_NAME_INPUT,
+        "last_name_input": LAST_NAME_INPUT,
+        "postal_code_input": POSTAL_CODE_INPUT,
+        "continue_button": CONTINUE_BUTTON,
+        "finish_button": FINISH_BUTTON,
+        "complete_header": COMPLETE_HEADER,
+    }
 
     def checkout(self, timeout_ms: Optional[int] = None) -> None:
         """Click checkout button from the cart page."""
@@ -56,10 +57,10 @@ class CheckoutPage(BasePage):
         """Return the checkout success header text."""
         if timeout_ms is None:
             timeout_ms = get_settings().timeout
-        locator = self.get_element("complete_header", timeout_ms=timeout_ms)
-        try:
-            locator.wait_for(state="visible", timeout=timeout_ms)
-        except TimeoutError:
-            return ""
-        text = locator.text_content()
+        state = self.query(
+            "complete_header",
+            until={"complete_header": "visible"},
+            timeout_ms=timeout_ms,
+        )
+        text = state["complete_header"].text if state.satisfied else None
         return text.strip() if text else ""
@@ -0,0 +1,203 @@
+from __future__ import annotations
+
+from dataclasses import dataclass
+from typing import Any, Callable, Dict, Mapping, Optional, Sequence
+
+from pages.selectors import is_css_selector
+
+READY = "ready"
+HIDDEN = "hidden"
+DISABLED = "disabled"
+DETACHED = "detached"
+
+# Polls visibility and enabled state in the page, then optionally highlights,
+# so a whole pre-action check costs a single driver round-trip. Returns
+# 'detached' when a re-render replaces the node; callers re-resolve and retry.
+ACTIONABILITY_SCRIPT = """
+async (el, opts) => {
+  const deadline = Date.now() + opts.timeout;
+  const isVisible = (e) => {
+    const rect = e.getBoundingClientRect();
+    const style = window.getComputedStyle(e);
+    return rect.width > 0 && rect.height > 0 && style.visibility !== 'hidden';
+  };
+  const isEnabled = (e) =>
+    !e.hasAttribute('disabled') && e.getAttribute('aria-disabled') !== 'true';
+  for (;;) {
+    if (!el.isConnected) return 'detached';
+    const visible = isVisible(el);
+    if (visible && isEnabled(el)) break;
+    if (Date.now() >= deadline) return visible ? 'disabled' : 'hidden';
+    await new Promise((resolve) => setTimeout(resolve, 20));
+  }
+  if (opts.highlight) {
+    el.style.outline = '3px solid #ff6a00';
+    el.style.outlineOffset = '2px';
+    if (opts.highlightMs > 0) {
+      await new Promise((resolve) => setTimeout(resolve, opts.highlightMs));
+    }
+  }
+  return 'ready';
+}
+"""
+
+VISIBLE = "visible"
+# Expectations BasePage.query can poll for in the page.
+EXPECTATIONS = frozenset({VISIBLE, HIDDEN, "attached", DETACHED})
+QUERY_POLL_MS = 20
+# Evaluate errors raised when a navigation replaces the document; a batch
+# query retries these on the new page and raises any other error.
+NAVIGATION_ERRORS = (
+    "Execution context was destroyed",
+    "Cannot find context with specified id",
+    "because of a navigation",
+)
+
+# Snapshots count, visibility, text and attributes for several selectors and
+# polls until every expectation holds, so a batch of checks is one round-trip.
+QUERY_SCRIPT = """
+async (opts) => {
+  const deadline = Date.now() + opts.timeout;
+  const isVisible = (e) => {
+    const rect = e.getBoundingClientRect();
+    const style = window.getComputedStyle(e);
+    return rect.width > 0 && rect.height > 0 && style.visibility !== 'hidden';
+  };
+  const snapshot = () => {
+    const result = {};
+    for (const [name, selector] of Object.entries(opts.selectors)) {
+      let nodes;
+      try {
+        nodes = Array.from(document.querySelectorAll(selector));
+      } catch (e) {
+        result[name] = { error: String(e.message || e) };
+        continue;
+      }
+      const first = nodes[0];
+      const attributes = {};
+      for (const attr of opts.attributes) {
+        attributes[attr] = first ? first.getAttribute(attr) : null;
+      }
+      result[name] = {
+        count: nodes.length,
+        visible: nodes.some(isVisible),
+        text: first ? first.textContent : null,
+        attributes,
+      };
+    }
+    return result;
+  };
+  const holds = (state) => Object.entries(opts.until).every(([name, want]) => {
+    const s = state[name];
+    if (!s || s.error) return false;
+    if (want === 'visible') return s.visible;
+    if (want === 'hidden') return !s.visible;
+    if (want === 'attached') return s.count > 0;
+    return s.count === 0;
+  });
+  for (;;) {
+    const state = snapshot();
+    if (holds(state)) return { state, satisfied: true };
+    if (Date.now() >= deadline) return { state, satisfied: false };
+    await new Promise((resolve) => setTimeout(resolve, opts.poll));
+  }
+}
+"""
+
+
+@dataclass(frozen=True)
+class ElementState:
+    """One mapped element as seen by a batch query (first match for text)."""
+
+    count: int
+    visible: bool
+    text: Optional[str]
+    attributes: Mapping[str, Optional[str]]
+
+
+@dataclass(frozen=True)
+class BatchState:
+    """Result of BasePage.query: element states by map name."""
+
+    elements: Mapping[str, ElementState]
+    satisfied: bool
+
+    def __getitem__(self, name: str) -> ElementState:
+        return self.elements[name]
+
+    @classmethod
+    def from_script(cls, raw: Mapping[str, Any]) -> "BatchState":
+        errors = {
+            name: state["error"]
+            for name, state in raw["state"].items()
+            if "error" in state
+        }
+        if errors:
+            raise ValueError(f"Selectors not usable in a batch query: {errors}")
+        elements = {
+            name: ElementState(
+                count=state["count"],
+                visible=state["visible"],
+                text=state["text"],
+                attributes=state["attributes"],
+            )
+            for name, state in raw["state"].items()
+        }
+        return cls(elements, raw["satisfied"])
+
+
+def query_options(
+    resolve: Callable[[str], str],
+    names: Sequence[str],
+    attributes: Sequence[str],
+    until: Optional[Mapping[str, str]],
+    timeout_ms: int,
+) -> Dict[str, Any]:
+    """Build the QUERY_SCRIPT argument for mapped names and expectations."""
+    expectations = dict(until or {})
+    for name, expected in expectations.items():
+        if expected not in EXPECTATIONS:
+            raise ValueError(f"Unknown expectation for '{name}': '{expected}'.")
+    ordered = dict.fromkeys([*names, *expectations])
+    selectors = {name: resolve(name) for name in ordered}
+    not_css = [
+        name for name, selector in selectors.items() if not is_css_selector(selector)
+    ]
+    if not_css:
+        raise ValueError(f"Batch queries need CSS selectors: {', '.join(not_css)}")
+    return {
+        "selectors": selectors,
+        "attributes": list(attributes),
+        "until": expectations,
+        "timeout": timeout_ms if expectations else 0,
+        "poll": QUERY_POLL_MS,
+    }
+
+
+def is_navigation_error(error: Exception) -> bool:
+    """Whether an evaluate failed because the page navigated under it."""
+    message = str(error)
+    return any(marker in message for marker in NAVIGATION_ERRORS)
+
+
+@dataclass(frozen=True)
+class InteractionProfile:
+    """How BasePage prepares an element before clicking or filling it."""
+
+    name: str
+    highlight: bool
+    highlight_ms: int
+
+
+PROFILES: Dict[str, InteractionProfile] = {
+    "fast": InteractionProfile(name="fast", highlight=False, highlight_ms=0),
+    "demo": InteractionProfile(name="demo", highlight=True, highlight_ms=150),
+}
+
+
+def get_profile(name: str) -> InteractionProfile:
+    """Return the interaction profile registered under a name."""
+    try:
+        return PROFILES[name]
+    except KeyError as exc:
+        raise ValueError(f"Unknown interaction profile: '{name}'.") from exc
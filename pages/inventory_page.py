@@ -1,73 +1,118 @@
 ﻿from __future__ import annotations
 
-from typing import Optional
+from typing import Any, Dict, List, Optional, Sequence
 
 from playwright.sync_api import Locator
-from playwright.sync_api import Page
 
 from config.settings import get_settings
 from pages.base_page import BasePage
+from pages.catalog import ADD_TO_CART_SCRIPT
+from pages.catalog import CATALOG_SCRIPT
+from pages.catalog import CatalogItem
+from pages.catalog import check_added
+from pages.catalog import parse_catalog
 from pages.checkout_page import CheckoutPage
+from pages.selectors import CART_LINK
+from pages.selectors import cached_locator
 
 
 class InventoryPage(BasePage):
     """Page object for the SauceDemo inventory page."""
 
-    def __init__(self, page: Page) -> None:
-        super().__init__(page)
-        self._maps.update(
-            {
-                "inventory_list": "[data-test='inventory-list']",
-                "inventory_item": "[data-test='inventory-item']",
-                "cart_link": "[data-test='shopping-cart-link']",
-                "products_title": ".title",
-            }
-        )
+    SELECTORS = {
+        "inventory_list": "[data-test='inventory-list']",
+        "inventory_item": "[data-test='inventory-item']",
+        "item_name": "[data-test='inventory-item-name']",
+        "item_description": "[data-test='inventory-item-desc']",
+        "item_price": "[data-test='inventory-item-price']",
+        "add_to_cart_button": "button[data-test^='add-to-cart']",
+        "cart_link": CART_LINK,
+        "products_title": ".title",
+    }
 
     def is_inventory_visible(self, timeout_ms: Optional[int] = None) -> bool:
         """Return True when the inventory list is visible."""
         if timeout_ms is None:
             timeout_ms = get_settings().timeout
-        locator = self.get_element("inventory_list", timeout_ms=timeout_ms)
-        try:
-            locator.wait_for(state="visible", timeout=timeout_ms)
-        except TimeoutError:
-            return False
-        return True
+        state = self.query(
+            "inventory_list", until={"inventory_list": "visible"}, timeout_ms=timeout_ms
+        )
+        return state.satisfied
 
     def is_products_title_visible(self, timeout_ms: Optional[int] = None) -> bool:
         """Return True when the Products title is visible."""
         if timeout_ms is None:
             timeout_ms = get_settings().timeout
-        locator = self.get_element("products_title", timeout_ms=timeout_ms)
-        try:
-            locator.wait_for(state="visible", timeout=timeout_ms)
-        except TimeoutError:
-            return False
-        return True
+        state = self.query(
+            "products_title", until={"products_title": "visible"}, timeout_ms=timeout_ms
+        )
+        return state.satisfied
 
     def add_item_to_cart(self, item_name: str, timeout_ms: Optional[int] = None) -> None:
         """Add a specific item to the cart by product name."""
         if timeout_ms is None:
             timeout_ms = get_settings().timeout
-        list_locator = self.get_element("inventory_list", timeout_ms=timeout_ms)
-        try:
-            list_locator.wait_for(state="visible", timeout=timeout_ms)
-        except TimeoutError as exc:
-            raise TimeoutError("Inventory list not visible.") from exc
+        self._visible_list(timeout_ms)
 
         item_locator: Locator = (
-            self.page.locator(self.map("inventory_item"))
+            cached_locator(self.page, self.map("inventory_item"))
             .filter(has_text=item_name)
             .first
         )
 
-        button_locator: Locator = item_locator.locator(
-            "button[data-test^='add-to-cart']"
+        button_locator: Locator = item_locator.locator(self.map("add_to_cart_button"))
+        self._prepare_action(
+            button_locator, "add-to-cart button", timeout_ms, name="inventory_item"
         )
-        self._wait_for_actionable(button_locator, "add-to-cart button", timeout_ms)
-        self._highlight(button_locator)
-        button_locator.click(timeout=timeout_ms)
+        with self._span("inventory_item", "add-to-cart button", "action"):
+            button_locator.click(timeout=self._budgeted(timeout_ms))
+
+    def _visible_list(self, timeout_ms: int) -> Locator:
+        list_locator = self.get_element("inventory_list", timeout_ms=timeout_ms)
+        try:
+            list_locator.wait_for(state="visible", timeout=self._budgeted(timeout_ms))
+        except TimeoutError as exc:
+            raise TimeoutError("Inventory list not visible.") from exc
+        return list_locator
+
+    def _catalog_selectors(self) -> Dict[str, Any]:
+        return {
+            "item": self.map("inventory_item"),
+            "name": self.map("item_name"),
+            "description": self.map("item_description"),
+            "price": self.map("item_price"),
+            "button": self.map("add_to_cart_button"),
+        }
+
+    def add_items_to_cart(
+        self,
+        item_names: Sequence[str],
+        timeout_ms: Optional[int] = None,
+    ) -> List[str]:
+        """Add several products in one DOM pass; return the names newly added.
+
+        Products already in the cart are skipped; unknown or disabled products
+        raise ValueError and nothing is clicked.
+        """
+        if timeout_ms is None:
+            timeout_ms = get_settings().timeout
+        list_locator = self._visible_list(timeout_ms)
+        selector = f"add-to-cart x{len(item_names)}"
+        with self._span("inventory_item", selector, "action"):
+            statuses = list_locator.evaluate(
+                ADD_TO_CART_SCRIPT,
+                {**self._catalog_selectors(), "names": list(item_names)},
+            )
+        return check_added(statuses)
+
+    def get_catalog(self, timeout_ms: Optional[int] = None) -> List[CatalogItem]:
+        """Return every product card from a single evaluate."""
+        if timeout_ms is None:
+            timeout_ms = get_settings().timeout
+        list_locator = self._visible_list(timeout_ms)
+        with self._span("inventory_list", "catalog", "read"):
+            rows = list_locator.evaluate(CATALOG_SCRIPT, self._catalog_selectors())
+        return parse_catalog(rows)
 
     def add_to_cart(self, item_name: str, timeout_ms: Optional[int] = None) -> None:
         """Add a specific item to the cart by product name."""
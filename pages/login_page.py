@@ -3,6 +3,7 @@
 from playwright.sync_api import Page
 
 from config.settings import get_settings
+from pages.base_page import NAVIGATION_TIMEOUT_MS
 from pages.base_page import BasePage
 from pages.inventory_page import InventoryPage
 
@@ -10,25 +11,24 @@ from pages.inventory_page import InventoryPage
 class LoginPage(BasePage):
     """Page object for the SauceDemo login page."""
 
+    SELECTORS = {
+        "username_input": "#user-name",
+        "password_input": "#password",
+        "login_button": "#login-button",
+    }
+
     def __init__(self, page: Page) -> None:
         super().__init__(page)
         self._base_url = get_settings().base_url
-        self.Maps()
-
-    def Maps(self) -> None:
-        """Define element selectors for the login page."""
-        _ = self._base_url
-        self._maps.update(
-            {
-                "username_input": "#user-name",
-                "password_input": "#password",
-                "login_button": "#login-button",
-            }
-        )
 
     def open(self) -> None:
         """Navigate to the login page."""
-        self.page.goto(self._base_url, wait_until="domcontentloaded")
+        with self._span(None, self._base_url, "navigation"):
+            self.page.goto(
+                self._base_url,
+                wait_until="domcontentloaded",
+                timeout=self._budgeted(NAVIGATION_TIMEOUT_MS, "open"),
+            )
 
     def login(self, username: str, password: str) -> InventoryPage:
         """Log in and return the inventory page object."""
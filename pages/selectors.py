@@ -0,0 +1,208 @@
+from __future__ import annotations
+
+import ast
+import importlib
+import inspect
+import re
+import textwrap
+from pathlib import Path
+from types import MappingProxyType
+from typing import Any, Dict, List, Mapping, Optional, Tuple
+from weakref import WeakKeyDictionary
+
+# Selectors shared by more than one page object are defined once here.
+CART_LINK = "[data-test='shopping-cart-link']"
+CHECKOUT_BUTTON = "[data-test='checkout']"
+FIRST_NAME_INPUT = "[data-test='firstName']"
+LAST_NAME_INPUT = "[data-test='lastName']"
+POSTAL_CODE_INPUT = "[data-test='postalCode']"
+CONTINUE_BUTTON = "[data-test='continue']"
+FINISH_BUTTON = "[data-test='finish']"
+COMPLETE_HEADER = "[data-test='complete-header']"
+
+# BasePage methods whose first positional argument is a logical map name.
+MAP_NAME_METHODS = frozenset({"map", "get_element", "click", "fill"})
+# BasePage methods whose positional arguments and `until` keys are all map names.
+BATCH_MAP_NAME_METHODS = frozenset({"query"})
+
+_ENGINE_PREFIX = re.compile(r"^(?:[a-z][a-z0-9_-]*)=")
+_CSS_LEADING_COMBINATOR = re.compile(r"^\s*[>+~,]")
+
+_OWNERS: Dict[str, Tuple[str, str]] = {}
+_REGISTERED: Dict[str, type] = {}
+_LOCATORS: "WeakKeyDictionary[Any, Dict[str, Any]]" = WeakKeyDictionary()
+
+
+class SelectorError(ValueError):
+    """Raised when a page object's selector registry is invalid."""
+
+
+def _balanced(part: str) -> Optional[str]:
+    pairs = {"]": "[", ")": "("}
+    stack: List[str] = []
+    quote: Optional[str] = None
+    escaped = False
+    for char in part:
+        if escaped:
+            escaped = False
+        elif char == "\\":
+            escaped = True
+        elif quote:
+            if char == quote:
+                quote = None
+        elif char in "'\"":
+            quote = char
+        elif char in "[(":
+            stack.append(char)
+        elif char in pairs:
+            if not stack or stack.pop() != pairs[char]:
+                return f"unbalanced '{char}'"
+    if quote:
+        return "unterminated string"
+    if stack:
+        return f"unclosed '{stack[-1]}'"
+    return None
+
+
+def validate_selector(selector: str) -> Optional[str]:
+    """Return a syntax problem with the selector, or None when it looks valid."""
+    if not isinstance(selector, str) or not selector.strip():
+        return "empty selector"
+    for part in selector.split(">>"):
+        part = part.strip()
+        if not part:
+            return "empty part in '>>' chain"
+        if _ENGINE_PREFIX.match(part):
+            if not part.split("=", 1)[1].strip():
+                return "missing selector body after engine prefix"
+            continue
+        if _CSS_LEADING_COMBINATOR.match(part):
+            return "selector starts with a combinator"
+        problem = _balanced(part)
+        if problem:
+            return problem
+    return None
+
+
+def is_css_selector(selector: str) -> bool:
+    """Return True for plain CSS selectors usable with querySelectorAll."""
+    return ">>" not in selector and not _ENGINE_PREFIX.match(selector.strip())
+
+
+def register_page_class(cls: type) -> Mapping[str, str]:
+    """Build, validate and freeze the selector map for a page class.
+
+    The map merges SELECTORS declared on the class and its bases. It is
+    computed once per class at import (collection) time and shared by all
+    instances.
+    """
+    merged: Dict[str, str] = {}
+    for klass in reversed(cls.__mro__):
+        merged.update(klass.__dict__.get("SELECTORS", {}))
+
+    owner = f"{cls.__module__}.{cls.__qualname__}"
+    problems: List[str] = []
+    seen: Dict[str, str] = {}
+    for name, selector in merged.items():
+        problem = validate_selector(selector)
+        if problem:
+            problems.append(f"'{name}' -> {selector!r}: {problem}")
+            continue
+        if selector in seen:
+            problems.append(
+                f"'{name}' and '{seen[selector]}' both map to {selector!r}"
+            )
+        seen[selector] = name
+        previous = _OWNERS.get(selector)
+        if previous is not None and previous[0] != name:
+            problems.append(
+                f"'{name}' maps to {selector!r}, already registered as "
+                f"'{previous[0]}' by {previous[1]}"
+            )
+    if problems:
+        raise SelectorError(
+            f"Invalid selector registry for {owner}:\n  " + "\n  ".join(problems)
+        )
+    for name, selector in merged.items():
+        _OWNERS.setdefault(selector, (name, owner))
+    _REGISTERED[owner] = cls
+    return MappingProxyType(merged)
+
+
+def cached_locator(page: Any, selector: str) -> Any:
+    """Return one Locator per (page, selector), reused across page objects."""
+    per_page = _LOCATORS.get(page)
+    if per_page is None:
+        per_page = {}
+        _LOCATORS[page] = per_page
+    locator = per_page.get(selector)
+    if locator is None:
+        locator = page.locator(selector)
+        per_page[selector] = locator
+    return locator
+
+
+def _uses_map(call: ast.Call) -> bool:
+    for keyword in call.keywords:
+        if keyword.arg == "use_map" and isinstance(keyword.value, ast.Constant):
+            return bool(keyword.value.value)
+    return True
+
+
+def _literal_names(call: ast.Call, method: str) -> List[str]:
+    """Return the string literals a BasePage call passes as map names."""
+    if method in MAP_NAME_METHODS:
+        args = call.args[:1] if _uses_map(call) else []
+    else:
+        args = list(call.args)
+        for keyword in call.keywords:
+            if keyword.arg == "until" and isinstance(keyword.value, ast.Dict):
+                args.extend(key for key in keyword.value.keys if key is not None)
+    return [
+        arg.value
+        for arg in args
+        if isinstance(arg, ast.Constant) and isinstance(arg.value, str)
+    ]
+
+
+def unmapped_names(cls: type) -> List[str]:
+    """Return literal map names used in the class's methods but not mapped."""
+    try:
+        lines, first_line = inspect.getsourcelines(cls)
+    except (OSError, TypeError):
+        return []
+    source = textwrap.dedent("".join(lines))
+    maps: Mapping[str, str] = getattr(cls, "_maps", {})
+    missing: List[str] = []
+    for node in ast.walk(ast.parse(source)):
+        if not (
+            isinstance(node, ast.Call)
+            and isinstance(node.func, ast.Attribute)
+            and isinstance(node.func.value, ast.Name)
+            and node.func.value.id == "self"
+            and node.func.attr in MAP_NAME_METHODS | BATCH_MAP_NAME_METHODS
+        ):
+            continue
+        for name in _literal_names(node, node.func.attr):
+            if name not in maps:
+                lineno = first_line + node.lineno - 1
+                missing.append(f"line {lineno}: {node.func.attr}('{name}')")
+    return missing
+
+
+def import_page_modules() -> None:
+    """Import every module in the pages package so all classes register."""
+    root = Path(__file__).resolve().parent
+    for path in sorted(root.rglob("*.py")):
+        parts = path.relative_to(root).with_suffix("").parts
+        importlib.import_module(".".join((root.name,) + parts))
+
+
+def validate_registered() -> List[str]:
+    """Check every page class for map names it cannot resolve."""
+    import_page_modules()
+    problems: List[str] = []
+    for owner, cls in sorted(_REGISTERED.items()):
+        for missing in unmapped_names(cls):
+            problems.append(f"{owner} {missing} has no selector mapping")
+    return problems
@@ -0,0 +1,105 @@
+from __future__ import annotations
+
+import pytest
+
+from utils import budget
+from utils.budget import BudgetExceeded, Spent, TestBudget
+
+
+class Clock:
+    def __init__(self) -> None:
+        self.now = 100.0
+
+    def __call__(self) -> float:
+        return self.now
+
+
+@pytest.fixture
+def clock(monkeypatch: pytest.MonkeyPatch) -> Clock:
+    clock = Clock()
+    monkeypatch.setattr(budget.time, "monotonic", clock)
+    return clock
+
+
+def test_clamp_caps_timeouts_at_the_time_left(clock: Clock) -> None:
+    test_budget = TestBudget(10.0)
+
+    assert test_budget.clamp(5000) == 5000
+    clock.now += 8.0
+    assert test_budget.clamp(5000) == 2000
+    clock.now += 1.9999
+    assert test_budget.clamp(5000) == budget.MIN_WAIT_MS
+    assert not test_budget.exhausted
+
+
+def test_exhausted_budget_refuses_the_next_step(clock: Clock) -> None:
+    test_budget = TestBudget(2.0, "marker")
+    test_budget.clamp(1000, "LoginPage.login [click]")
+    clock.now += 2.5
+
+    with pytest.raises(BudgetExceeded) as excinfo:
+        test_budget.clamp(1000, "InventoryPage.title [wait]")
+
+    assert test_budget.exhausted
+    assert str(excinfo.value).splitlines()[:2] == [
+        "Test budget exhausted before InventoryPage.title [wait].",
+        "Test budget 2s (marker): 2.50s used.",
+    ]
+
+
+def test_unnamed_step_is_reported_as_the_last_named_one(clock: Clock) -> None:
+    test_budget = TestBudget(1.0)
+    test_budget.clamp(1000, "LoginPage.username [fill]")
+    clock.now += 1.0
+
+    with pytest.raises(BudgetExceeded, match=r"before LoginPage\.username \[fill\]"):
+        test_budget.clamp(1000)
+
+
+def test_time_is_attributed_to_the_step_that_was_running(clock: Clock) -> None:
+    test_budget = TestBudget(30.0)
+    clock.now += 0.5
+    test_budget.clamp(1000, "login")
+    clock.now += 3.0
+    test_budget.clamp(1000, "add_to_cart")
+    clock.now += 1.25
+    test_budget.clamp(1000, "checkout")
+    clock.now += 0.75
+    test_budget.stop()
+    clock.now += 60.0
+
+    assert test_budget.elapsed_s() == 5.5
+    assert test_budget.consumption() == [
+        Spent("login", 3.0),
+        Spent("add_to_cart", 1.25),
+        Spent("checkout", 0.75),
+        Spent("setup", 0.5),
+    ]
+
+
+def test_report_lists_the_slowest_steps(clock: Clock) -> None:
+    test_budget = TestBudget(20.0)
+    for seconds, label in ((1.0, "a"), (4.0, "b"), (2.0, "c")):
+        test_budget.clamp(1000, label)
+        clock.now += seconds
+
+    assert test_budget.report(limit=2).splitlines() == [
+        "Test budget 20s (settings): 7.00s used.",
+        "Slowest steps:",
+        "     4.000s  b",
+        "     2.000s  c",
+    ]
+
+
+def test_module_clamp_uses_the_current_budget(clock: Clock) -> None:
+    assert budget.clamp(5000, "no budget") == 5000
+    test_budget = TestBudget(1.0)
+    token = budget.activate(test_budget)
+    try:
+        assert budget.current_budget() is test_budget
+        assert budget.clamp(5000, "login") == 1000
+    finally:
+        budget.deactivate(token)
+
+    assert budget.current_budget() is None
+    assert [step.label for step in test_budget.steps] == ["setup", "login"]
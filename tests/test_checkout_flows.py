@@ -0,0 +1,63 @@
+from __future__ import annotations
+
+from typing import Any, Callable
+
+import pytest
+
+from config.settings import Settings
+from pages.checkout_page import CheckoutPage
+from pages.inventory_page import InventoryPage
+from pages.login_page import LoginPage
+from utils.flows import Flow
+
+
+@pytest.fixture
+def checkout_head(config: Settings) -> Flow:
+    """Open, log in, fill the cart and reach checkout step one."""
+    username = config.app_username.get_secret_value()
+    password = config.app_password.get_secret_value()
+    if not username or not password or "CHANGEME" in (username, password):
+        pytest.skip("Missing credentials for SauceDemo.")
+    return (
+        Flow(LoginPage)
+        .step("open", LoginPage.open)
+        .step(
+            f"login:{username}",
+            lambda page: page.login(username, password),
+            lands_on="inventory.html",
+        )
+        .step(
+            "add:Sauce Labs Backpack",
+            lambda page: page.add_to_cart("Sauce Labs Backpack"),
+        )
+        .step("cart", InventoryPage.go_to_cart, lands_on="cart.html")
+        .step("checkout", CheckoutPage.checkout, lands_on="checkout-step-one.html")
+    )
+
+
+@pytest.mark.parametrize(
+    ("first_name", "last_name", "zip_code"),
+    [
+        ("John", "Doe", "12345"),
+        ("Jane", "Roe", "54321"),
+        ("Ana", "Lima", "01000-000"),
+    ],
+)
+def test_checkout_variants_share_the_head(
+    flow_runner: Callable[[Flow], Any],
+    checkout_head: Flow,
+    first_name: str,
+    last_name: str,
+    zip_code: str,
+) -> None:
+    flow = checkout_head.step(
+        f"info:{first_name}:{last_name}:{zip_code}",
+        lambda page: page.fill_information(first_name, last_name, zip_code),
+        lands_on="checkout-step-two.html",
+    ).step("finish", CheckoutPage.finish_checkout, checkpoint=False)
+
+    checkout_page = flow_runner(flow)
+
+    assert (
+        checkout_page.get_complete_header() == "Thank you for your order!"
+    ), "Checkout should complete successfully."
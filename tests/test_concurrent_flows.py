@@ -0,0 +1,61 @@
+from __future__ import annotations
+
+from typing import Callable, List
+
+import pytest
+from playwright.async_api import Page
+from playwright.sync_api import Page as SyncPage
+
+from config.settings import get_settings
+from pages.aio.login_page import LoginPage
+from pages.login_page import LoginPage as SyncLoginPage
+from utils.async_runner import FlowResult
+
+
+async def _login_flow(page: Page) -> bool:
+    settings = get_settings()
+    login_page = LoginPage(page)
+    await login_page.open()
+    inventory_page = await login_page.login(
+        settings.app_username.get_secret_value(),
+        settings.app_password.get_secret_value(),
+    )
+    return await inventory_page.is_inventory_visible()
+
+
+def test_concurrent_users_can_log_in(
+    async_flow_runner: Callable[..., List[FlowResult]],
+) -> None:
+    settings = get_settings()
+    username = settings.app_username.get_secret_value()
+    password = settings.app_password.get_secret_value()
+    if not username or not password or username == "CHANGEME" or password == "CHANGEME":
+        pytest.skip("Missing credentials for SauceDemo.")
+
+    results = async_flow_runner(_login_flow, count=5)
+
+    failures = [result.error for result in results if not result.ok]
+    assert not failures, f"Concurrent logins failed: {failures}"
+    assert all(result.value for result in results), "Every user should see inventory."
+
+
+async def _open_login_flow(page: Page) -> bool:
+    login_page = LoginPage(page)
+    await login_page.open()
+    state = await login_page.query("login_button")
+    return state["login_button"].visible
+
+
+def test_async_flows_run_after_sync_playwright(
+    page: SyncPage,
+    async_flow_runner: Callable[..., List[FlowResult]],
+) -> None:
+    # The sync page fixture leaves an event loop running in this thread.
+    SyncLoginPage(page).open()
+
+    first = async_flow_runner(_open_login_flow, count=3)
+    second = async_flow_runner(_open_login_flow, count=2)
+
+    failures = [result.error for result in first + second if not result.ok]
+    assert not failures, f"Async flows failed next to sync Playwright: {failures}"
+    assert all(result.value for result in first + second), "Login should render."
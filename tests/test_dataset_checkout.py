@@ -0,0 +1,22 @@
+from __future__ import annotations
+
+import pytest
+from playwright.sync_api import Page
+
+from pages.checkout_information_page import CheckoutInformationPage
+from utils.datasets import Record
+
+
+@pytest.mark.dataset("tests/data/checkout_customers.csv")
+@pytest.mark.seed_cart(from_record="products")
+def test_customer_can_check_out_their_cart(seeded_page: Page, record: Record) -> None:
+    information_page = CheckoutInformationPage(seeded_page)
+
+    overview_page = information_page.submit_customer_info(
+        first_name=record["first_name"],
+        last_name=record["last_name"],
+        postal_code=record["zip_code"],
+    )
+    complete_page = overview_page.finish_checkout()
+
+    assert complete_page.is_order_complete(), "Checkout should complete successfully."
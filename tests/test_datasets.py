@@ -0,0 +1,120 @@
+from __future__ import annotations
+
+from pathlib import Path
+from typing import Dict, List
+
+import pytest
+
+from utils import datasets
+
+CUSTOMERS = [
+    "first_name,last_name,postal_code",
+    "Ada,Lovelace,10001",
+    "Alan,Turing,20002",
+    "Grace,Hopper,30003",
+    "Edsger,Dijkstra,40004",
+    "Barbara,Liskov,50005",
+    "Donald,Knuth,60006",
+]
+
+
+def _dataset(path: Path, lines: List[str]) -> datasets.Dataset:
+    path.write_text("\n".join(lines) + "\n", encoding="utf-8")
+    return datasets.Dataset(path, *datasets._scan(path))
+
+
+def test_scan_keeps_quoted_newlines_in_one_record(tmp_path: Path) -> None:
+    path = tmp_path / "notes.csv"
+    path.write_bytes(
+        b"name,note\r\n"
+        b'Ada,"first line\r\nsecond ""quoted"" line"\r\n'
+        b"\r\n"
+        b"Alan,plain\r\n"
+    )
+
+    offsets, checksums = datasets._scan(path)
+    with datasets.Dataset(path, offsets, checksums) as dataset:
+        assert len(offsets) == 3
+        assert len(dataset) == 2
+        assert dataset.record(0) == {
+            "name": "Ada",
+            "note": 'first line\r\nsecond "quoted" line',
+        }
+        assert dataset.record(1) == {"name": "Alan", "note": "plain"}
+        assert list(dataset) == [dataset.record(0), dataset.record(1)]
+
+
+def test_scan_ignores_line_endings_in_checksums(tmp_path: Path) -> None:
+    unix, windows = tmp_path / "unix.csv", tmp_path / "windows.csv"
+    unix.write_bytes(b"a,b\n1,2\n")
+    windows.write_bytes(b"a,b\r\n1,2\r\n")
+
+    assert datasets._scan(unix)[1] == datasets._scan(windows)[1]
+
+
+def test_shards_and_keys_survive_inserted_rows(tmp_path: Path) -> None:
+    before = _dataset(tmp_path / "before.csv", CUSTOMERS)
+    inserted = CUSTOMERS[:1] + ["Katherine,Johnson,70007"] + CUSTOMERS[1:4]
+    inserted += ["Linus,Torvalds,80008"] + CUSTOMERS[4:]
+    after = _dataset(tmp_path / "after.csv", inserted)
+
+    def shards(dataset: datasets.Dataset) -> Dict[str, int]:
+        return {
+            dataset.key(index): dataset.shard_of(index, 3)
+            for index in range(len(dataset))
+        }
+
+    old, new = shards(before), shards(after)
+    assert len(new) == len(old) + 2
+    assert {key: new[key] for key in old} == old
+
+
+def test_identical_records_get_distinct_keys(tmp_path: Path) -> None:
+    dataset = _dataset(
+        tmp_path / "repeats.csv", CUSTOMERS[:2] + CUSTOMERS[1:3] + CUSTOMERS[1:2]
+    )
+
+    keys = [dataset.key(index) for index in range(len(dataset))]
+
+    assert keys == [keys[0], f"{keys[0]}-2", keys[2], f"{keys[0]}-3"]
+
+
+def test_select_applies_shard_then_limit(tmp_path: Path) -> None:
+    dataset = _dataset(tmp_path / "customers.csv", CUSTOMERS)
+    in_first = [index for index in range(6) if dataset.shard_of(index, 2) == 0]
+
+    assert list(dataset.select(limit=2)) == [0, 1]
+    assert list(dataset.select(limit=0)) == []
+    assert list(dataset.select((1, 2), limit=2)) == in_first[:2]
+    assert sorted([*dataset.select((1, 2)), *dataset.select((2, 2))]) == list(
+        range(6)
+    )
+
+
+def test_field_count_mismatch_is_an_error(tmp_path: Path) -> None:
+    dataset = _dataset(tmp_path / "broken.csv", CUSTOMERS[:2] + ["Alan,Turing"])
+
+    assert dataset.record(0)["first_name"] == "Ada"
+    with pytest.raises(ValueError, match="record has 2 fields, the header has 3"):
+        dataset.record(1)
+    with pytest.raises(ValueError, match="record has 2 fields"):
+        list(dataset)
+
+
+def test_jsonl_records_must_be_objects(tmp_path: Path) -> None:
+    dataset = _dataset(tmp_path / "records.jsonl", ['{"sku": "a"}', "", "[1, 2]"])
+
+    assert len(dataset) == 2
+    assert dataset.record(0) == {"sku": "a"}
+    with pytest.raises(ValueError, match="not a JSON object"):
+        dataset.record(1)
+
+
+def test_close_releases_the_file_handle(tmp_path: Path) -> None:
+    with _dataset(tmp_path / "customers.csv", CUSTOMERS) as dataset:
+        dataset.record(0)
+        handle = dataset._handle
+        assert handle is not None
+
+    assert handle.closed
+    assert dataset._handle is None
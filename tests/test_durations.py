@@ -0,0 +1,179 @@
+from __future__ import annotations
+
+from typing import Any, Dict, List, Optional
+
+import pytest
+
+from utils.durations import (
+    CACHE_KEY,
+    DEFAULT_ESTIMATE_S,
+    DurationStore,
+    order_longest_first,
+    parse_shard,
+    split_shards,
+)
+
+pytest_plugins = ("pytester",)
+
+SHARD_CONFTEST = """
+from utils.durations import DurationStore
+from utils.durations import order_longest_first
+from utils.durations import parse_shard
+from utils.durations import split_shards
+
+
+def pytest_addoption(parser):
+    parser.addoption("--shard", default=None)
+
+
+def pytest_collection_modifyitems(config, items):
+    store = DurationStore(config.cache)
+    shard = parse_shard(config.getoption("shard"))
+    if shard is not None:
+        index, count = shard
+        items[:] = split_shards(items, store, count, ("shared",))[index - 1]
+    items[:] = order_longest_first(items, store, ("shared",))
+"""
+
+TESTS = """
+def test_slow():
+    pass
+
+
+def test_medium():
+    pass
+
+
+def test_quick():
+    pass
+
+
+def test_new():
+    pass
+"""
+
+
+class FakeCache:
+    def __init__(self, values: Optional[Dict[str, Any]] = None) -> None:
+        self.values: Dict[str, Any] = dict(values or {})
+
+    def get(self, key: str, default: Any) -> Any:
+        return self.values.get(key, default)
+
+    def set(self, key: str, value: Any) -> None:
+        self.values[key] = value
+
+
+def _store(durations: Dict[str, float]) -> DurationStore:
+    return DurationStore(FakeCache({CACHE_KEY: durations}))  # type: ignore[arg-type]
+
+
+def _names(items: List[pytest.Item]) -> List[str]:
+    return [item.name for item in items]
+
+
+@pytest.mark.parametrize(
+    ("value", "expected"), [(None, None), ("", None), ("1/1", (1, 1)), ("2/3", (2, 3))]
+)
+def test_parse_shard(value: Optional[str], expected: Optional[tuple]) -> None:
+    assert parse_shard(value) == expected
+
+
+@pytest.mark.parametrize("value", ["3", "a/b", "1/2/3", "0/2", "3/2", "1/0"])
+def test_parse_shard_rejects_invalid_input(value: str) -> None:
+    with pytest.raises(pytest.UsageError, match="--data-shard"):
+        parse_shard(value, "--data-shard")
+
+
+def test_unknown_tests_are_estimated_at_the_median() -> None:
+    store = _store({"a": 2.0, "b": 4.0, "c": 10.0})
+
+    assert store.estimate("c") == 10.0
+    assert store.estimate("unknown") == store.fallback == 4.0
+    assert _store({}).estimate("unknown") == DEFAULT_ESTIMATE_S
+
+
+def test_save_smooths_known_durations() -> None:
+    cache = FakeCache({CACHE_KEY: {"a": 2.0}})
+    store = DurationStore(cache)  # type: ignore[arg-type]
+
+    store.save({"a": 4.0, "b": 1.0})
+
+    assert cache.values[CACHE_KEY] == {"a": 3.0, "b": 1.0}
+
+
+def test_split_shards_balances_longest_first(pytester: pytest.Pytester) -> None:
+    items = pytester.getitems(
+        """
+        def test_a(): pass
+        def test_b(): pass
+        def test_c(): pass
+        def test_d(): pass
+        def test_e(): pass
+        """
+    )
+    nodeid = {item.name: item.nodeid for item in items}
+    store = _store(
+        {
+            nodeid["test_a"]: 3.0,
+            nodeid["test_b"]: 5.0,
+            nodeid["test_c"]: 3.0,
+            nodeid["test_d"]: 4.0,
+            nodeid["test_e"]: 3.0,
+        }
+    )
+
+    shards = split_shards(items, store, 2)
+
+    assert [_names(shard) for shard in shards] == [
+        ["test_b", "test_c"],
+        ["test_d", "test_a", "test_e"],
+    ]
+    assert _names(order_longest_first(items, store)) == [
+        "test_b",
+        "test_d",
+        "test_a",
+        "test_c",
+        "test_e",
+    ]
+
+
+def test_grouped_fixture_tests_stay_in_one_shard(pytester: pytest.Pytester) -> None:
+    items = pytester.getitems(
+        """
+        import pytest
+
+        @pytest.fixture(scope="module")
+        def shared(): pass
+
+        def test_a(shared): pass
+        def test_b(shared): pass
+        def test_c(): pass
+        """
+    )
+    store = _store({item.nodeid: 1.0 for item in items})
+
+    shards = split_shards(items, store, 2, ("shared",))
+
+    assert [_names(shard) for shard in shards] == [["test_a", "test_b"], ["test_c"]]
+
+
+def test_shards_split_a_run_without_xdist(pytester: pytest.Pytester) -> None:
+    pytester.makeconftest(SHARD_CONFTEST)
+    pytester.makepyfile(test_suite=TESTS)
+    seconds = {"test_slow": 12.0, "test_medium": 5.0, "test_quick": 1.0}
+    durations = {f"test_suite.py::{name}": value for name, value in seconds.items()}
+    config = pytester.parseconfigure()
+    assert config.cache is not None
+    config.cache.set(CACHE_KEY, durations)
+
+    first = pytester.runpytest("-p", "no:xdist", "-v", "--shard", "1/2")
+    second = pytester.runpytest("-p", "no:xdist", "-v", "--shard", "2/2")
+
+    first.assert_outcomes(passed=1)
+    first.stdout.fnmatch_lines(["*::test_slow PASSED*"])
+    # test_new has no history and is estimated at the median, 5s.
+    second.assert_outcomes(passed=3)
+    second.stdout.fnmatch_lines(
+        ["*::test_medium PASSED*", "*::test_new PASSED*", "*::test_quick PASSED*"]
+    )
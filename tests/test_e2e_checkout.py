@@ -1,22 +1,12 @@
 from __future__ import annotations
 
-import pytest
 from playwright.sync_api import Page
 
-from config.settings import get_settings
-from pages.login_page import LoginPage
+from pages.inventory_page import InventoryPage
 
 
-def test_standard_user_can_complete_checkout(page: Page) -> None:
-    settings = get_settings()
-    login_page = LoginPage(page)
-    login_page.open()
-
-    username = settings.app_username.get_secret_value()
-    password = settings.app_password.get_secret_value()
-    if not username or not password or username == "CHANGEME" or password == "CHANGEME":
-        pytest.skip("Missing credentials for SauceDemo.")
-    inventory_page = login_page.login(username, password)
+def test_standard_user_can_complete_checkout(authenticated_page: Page) -> None:
+    inventory_page = InventoryPage(authenticated_page)
 
     inventory_page.add_to_cart("Sauce Labs Backpack")
     checkout_page = inventory_page.go_to_cart()
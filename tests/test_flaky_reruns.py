@@ -0,0 +1,87 @@
+from __future__ import annotations
+
+import pytest
+
+pytest_plugins = ("pytester",)
+
+RERUN_CONFTEST = """
+import pytest
+
+from utils.flaky import reruns_for
+from utils.flaky import run_with_reruns
+
+
+@pytest.hookimpl(tryfirst=True)
+def pytest_runtest_protocol(item, nextitem):
+    reruns = reruns_for(item, 0)
+    if not reruns:
+        return None
+    run_with_reruns(item, nextitem, reruns)
+    return True
+"""
+
+
+RERUN_INI = """
+[pytest]
+markers =
+    flaky(reruns=N): retry in-worker on failure
+"""
+
+
+def test_flaky_test_passes_on_retry_with_module_fixtures_kept(
+    pytester: pytest.Pytester,
+) -> None:
+    pytester.makeconftest(RERUN_CONFTEST)
+    pytester.makeini(RERUN_INI)
+    pytester.makepyfile(
+        test_a="""
+        import pytest
+
+        SETUPS = []
+        ATTEMPTS = []
+
+
+        @pytest.fixture(scope="module")
+        def shared():
+            SETUPS.append(1)
+            yield len(SETUPS)
+
+
+        @pytest.mark.flaky(reruns=2)
+        def test_fails_once(shared):
+            ATTEMPTS.append(shared)
+            assert len(ATTEMPTS) > 1
+        """,
+        test_b="""
+        import sys
+
+
+        def test_retry_reused_the_module_fixture():
+            test_a = sys.modules["test_a"]
+            assert test_a.ATTEMPTS == [1, 1]
+            assert test_a.SETUPS == [1]
+        """,
+    )
+
+    result = pytester.runpytest("-p", "no:cacheprovider")
+
+    assert result.parseoutcomes() == {"passed": 2, "rerun": 1}
+
+
+def test_flaky_test_fails_after_its_last_retry(pytester: pytest.Pytester) -> None:
+    pytester.makeconftest(RERUN_CONFTEST)
+    pytester.makeini(RERUN_INI)
+    pytester.makepyfile(
+        """
+        import pytest
+
+
+        @pytest.mark.flaky(reruns=1)
+        def test_always_fails():
+            assert False
+        """
+    )
+
+    result = pytester.runpytest("-p", "no:cacheprovider")
+
+    assert result.parseoutcomes() == {"failed": 1, "rerun": 1}
@@ -0,0 +1,79 @@
+from __future__ import annotations
+
+from contextlib import closing
+from pathlib import Path
+from typing import List
+
+import pytest
+
+from utils import history
+
+STEP = "LoginPage.login_button [click]"
+
+
+def _run(
+    db: Path, duration_ms: float, outcome: str = "passed", browser: str = "chromium"
+) -> int:
+    test = history.TestRecord(
+        "tests/test_login.py::test_login",
+        outcome,
+        2 if outcome == "flaky" else 1,
+        duration_ms * 3,
+        {STEP: duration_ms},
+    )
+    return history.record(db, "dev", browser, "abc123", [test])
+
+
+def _findings(db: Path, browser: str = "chromium") -> List[history.Finding]:
+    with closing(history.connect(db)) as conn:
+        history._select_window(conn, "dev", browser, recent=5, baseline=10)
+        return history.regressions(conn)
+
+
+def test_record_appends_one_run_per_session(tmp_path: Path) -> None:
+    db = tmp_path / "history.sqlite"
+
+    first, second = _run(db, 100.0), _run(db, 101.0)
+
+    assert second == first + 1
+    with closing(history.connect(db)) as conn:
+        assert conn.execute("SELECT COUNT(*) FROM results").fetchone() == (2,)
+        assert conn.execute("SELECT COUNT(*) FROM names").fetchone() == (2,)
+
+
+def test_steady_history_reports_nothing(tmp_path: Path) -> None:
+    db = tmp_path / "history.sqlite"
+    for index in range(15):
+        _run(db, 100.0 + index % 3)
+
+    assert _findings(db) == []
+
+
+def test_slowdown_in_recent_runs_is_flagged(tmp_path: Path) -> None:
+    db = tmp_path / "history.sqlite"
+    for index in range(10):
+        _run(db, 100.0 + index % 3)
+    for index in range(5):
+        _run(db, 150.0 + index % 3)
+    _run(db, 500.0, browser="firefox")
+
+    findings = {(finding.kind, finding.name): finding for finding in _findings(db)}
+
+    assert set(findings) == {
+        ("step", STEP),
+        ("test", "tests/test_login.py::test_login"),
+    }
+    assert findings["step", STEP].recent == pytest.approx(150.8)
+    assert findings["step", STEP].change > 0.4
+
+
+def test_flake_rate_increase_is_flagged(tmp_path: Path) -> None:
+    db = tmp_path / "history.sqlite"
+    for index in range(10):
+        _run(db, 100.0 + index % 3, "flaky" if index == 4 else "passed")
+    for index in range(5):
+        _run(db, 100.0 + index % 3, "flaky")
+
+    (finding,) = _findings(db)
+
+    assert (finding.kind, finding.baseline, finding.recent) == ("flake", 0.1, 1.0)
@@ -0,0 +1,181 @@
+from __future__ import annotations
+
+from pathlib import Path
+from typing import List, Optional, Set
+
+import pytest
+
+from utils.impact import (
+    Changes,
+    CoverageStore,
+    ImpactSelector,
+    ImportGraph,
+    changed_selectors,
+    parse_diff,
+)
+
+LOGIN_PAGE = """\
+class LoginPage:
+    SELECTORS = {
+        "username": "#user-name",
+        "login_button": (
+            "#login-button"
+        ),
+    }
+
+    def login(self):
+        pass
+"""
+
+PROJECT = {
+    "conftest.py": "from utils import helpers\n",
+    "utils/helpers.py": "TIMEOUT = 1\n",
+    "pages/login_page.py": LOGIN_PAGE,
+    "pages/cart_page.py": "class CartPage:\n    SELECTORS = {'items': '.item'}\n",
+    "tests/test_login.py": "from pages.login_page import LoginPage\n",
+    "tests/test_cart.py": "from pages.cart_page import CartPage\n",
+}
+
+LOGIN = "tests/test_login.py::test_login"
+CART = "tests/test_cart.py::test_cart"
+
+
+def _project(root: Path) -> None:
+    for rel, source in PROJECT.items():
+        path = root / rel
+        path.parent.mkdir(parents=True, exist_ok=True)
+        path.write_text(source)
+
+
+def _selected(root: Path, changes: Changes) -> List[str]:
+    coverage = CoverageStore(None)
+    coverage.tests = {
+        LOGIN: {
+            "modules": ["pages.login_page"],
+            "selectors": ["pages.login_page:LoginPage.username"],
+        },
+        CART: {"modules": ["pages.cart_page"], "selectors": []},
+    }
+    selector = ImpactSelector(root, ImportGraph(root, None), coverage, changes)
+    return [
+        nodeid
+        for nodeid in (LOGIN, CART)
+        if selector.affects(nodeid.split("::")[0], nodeid)
+    ]
+
+
+def test_parse_diff_collects_added_and_removed_lines() -> None:
+    diff = """\
+diff --git a/pages/login_page.py b/pages/login_page.py
+index 1111111..2222222 100644
+--- a/pages/login_page.py
++++ b/pages/login_page.py
+@@ -3 +3 @@ class LoginPage:
+-        "username": "#user",
++        "username": "#user-name",
+@@ -9,2 +8,0 @@ class LoginPage:
+-    def logout(self):
+-        pass
+"""
+    assert parse_diff(diff) == {"pages/login_page.py": {3, 8, 9}}
+
+
+def test_parse_diff_rename_is_a_delete_and_an_add() -> None:
+    # changed_since diffs with --no-renames, so a rename arrives as two files.
+    diff = """\
+diff --git a/pages/checkout_page.py b/pages/checkout_page.py
+deleted file mode 100644
+index 1111111..0000000
+--- a/pages/checkout_page.py
++++ /dev/null
+@@ -1,2 +0,0 @@
+-class CheckoutPage:
+-    pass
+diff --git a/pages/checkout_step_page.py b/pages/checkout_step_page.py
+new file mode 100644
+index 0000000..1111111
+--- /dev/null
++++ b/pages/checkout_step_page.py
+@@ -0,0 +1,2 @@
++class CheckoutPage:
++    pass
+diff --git a/docs/logo.png b/docs/logo.png
+index 1111111..2222222 100644
+Binary files a/docs/logo.png and b/docs/logo.png differ
+"""
+    assert parse_diff(diff) == {
+        "pages/checkout_page.py": None,
+        "pages/checkout_step_page.py": {1, 2},
+        "docs/logo.png": None,
+    }
+
+
+@pytest.mark.parametrize(
+    ("lines", "expected"),
+    [
+        ({3}, {"pages.login_page:LoginPage.username"}),
+        (
+            {3, 5},
+            {
+                "pages.login_page:LoginPage.username",
+                "pages.login_page:LoginPage.login_button",
+            },
+        ),
+        ({2}, None),
+        ({10}, None),
+    ],
+)
+def test_changed_selectors_only_covers_selectors_entries(
+    tmp_path: Path, lines: Set[int], expected: Optional[Set[str]]
+) -> None:
+    _project(tmp_path)
+
+    assert changed_selectors(tmp_path, "pages/login_page.py", lines) == expected
+
+
+def test_selectors_entry_edit_selects_tests_that_used_it(tmp_path: Path) -> None:
+    _project(tmp_path)
+
+    assert _selected(tmp_path, {"pages/login_page.py": {3}}) == [LOGIN]
+    assert _selected(tmp_path, {"pages/login_page.py": {5}}) == []
+
+
+def test_page_code_change_selects_importing_tests(tmp_path: Path) -> None:
+    _project(tmp_path)
+
+    assert _selected(tmp_path, {"pages/login_page.py": {10}}) == [LOGIN]
+    assert _selected(tmp_path, {"pages/cart_page.py": None}) == [CART]
+
+
+@pytest.mark.parametrize(
+    "changes",
+    [
+        {"conftest.py": {1}},
+        {"utils/helpers.py": {1}},
+        {"requirements.txt": None},
+    ],
+)
+def test_infrastructure_change_selects_everything(
+    tmp_path: Path, changes: Changes
+) -> None:
+    _project(tmp_path)
+
+    assert _selected(tmp_path, changes) == [LOGIN, CART]
+
+
+def test_ignored_files_select_nothing(tmp_path: Path) -> None:
+    _project(tmp_path)
+
+    assert _selected(tmp_path, {"README.md": None, ".github/ci.yml": None}) == []
+
+
+def test_tests_without_coverage_always_run(tmp_path: Path) -> None:
+    _project(tmp_path)
+    selector = ImpactSelector(
+        tmp_path,
+        ImportGraph(tmp_path, None),
+        CoverageStore(None),
+        {"pages/cart_page.py": None},
+    )
+
+    assert selector.affects("tests/test_login.py", LOGIN)
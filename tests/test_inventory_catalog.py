@@ -0,0 +1,20 @@
+from __future__ import annotations
+
+from playwright.sync_api import Page
+
+from pages.inventory_page import InventoryPage
+
+
+def test_bulk_add_updates_catalog_button_state(authenticated_page: Page) -> None:
+    inventory_page = InventoryPage(authenticated_page)
+
+    catalog = inventory_page.get_catalog()
+    assert catalog, "Inventory should list products."
+    assert all(item.price > 0 for item in catalog), "Every product should have a price."
+
+    names = [item.name for item in catalog[:3]]
+    added = inventory_page.add_items_to_cart(names)
+
+    assert added == names, "All requested products should be added."
+    in_cart = {item.name for item in inventory_page.get_catalog() if item.in_cart}
+    assert in_cart == set(names), "Only the added products should show Remove."
@@ -0,0 +1,210 @@
+from __future__ import annotations
+
+import json
+from contextlib import ExitStack
+from pathlib import Path
+from typing import Any, Callable, Dict, Iterator, List, Tuple
+
+import pytest
+
+from config.settings import Settings, override_settings
+from utils.network import RESOURCE_TYPE_GLOBS, NetworkRouter, format_summary
+
+LOGO = "https://example.test/static/logo.png"
+FONT = "https://example.test/static/font.woff2"
+BUNDLE = "https://example.test/static/main.js"
+
+
+class FakeRequest:
+    def __init__(self, url: str, resource_type: str) -> None:
+        self.url = url
+        self.resource_type = resource_type
+
+
+class FakeRoute:
+    def __init__(self, url: str, resource_type: str = "other") -> None:
+        self.request = FakeRequest(url, resource_type)
+        self.outcome: Tuple[str, Any] = ("pending", None)
+
+    def abort(self, error_code: str) -> None:
+        self.outcome = ("abort", error_code)
+
+    def fulfill(self, **response: Any) -> None:
+        self.outcome = ("fulfill", response)
+
+
+class FakeContext:
+    def __init__(self) -> None:
+        self.routes: Dict[str, Callable[[FakeRoute], None]] = {}
+        self.har: List[Tuple[str, Dict[str, Any]]] = []
+        self.listeners: Dict[str, Callable[[FakeRequest], None]] = {}
+
+    def route(self, pattern: str, handler: Callable[[FakeRoute], None]) -> None:
+        self.routes[pattern] = handler
+
+    def route_from_har(self, path: str, **options: Any) -> None:
+        self.har.append((path, options))
+
+    def on(self, event: str, handler: Callable[[FakeRequest], None]) -> None:
+        self.listeners[event] = handler
+
+
+@pytest.fixture
+def settings(tmp_path: Path) -> Iterator[Callable[..., Settings]]:
+    """Build Settings with HARs under tmp_path; overrides end with the test."""
+    with ExitStack() as stack:
+
+        def make(**values: Any) -> Settings:
+            return stack.enter_context(
+                override_settings(har_dir=str(tmp_path), **values)
+            )
+
+        yield make
+
+
+def _write_har(router: NetworkRouter, name: str, sizes: Dict[str, int]) -> None:
+    path = router.har_path(name)
+    path.parent.mkdir(parents=True, exist_ok=True)
+    entries = [
+        {"request": {"url": url}, "response": {"content": {"size": size}}}
+        for url, size in sizes.items()
+    ]
+    path.write_text(json.dumps({"log": {"entries": entries}}), encoding="utf-8")
+
+
+def _block(context: FakeContext, pattern: str, route: FakeRoute) -> FakeRoute:
+    context.routes[pattern](route)
+    return route
+
+
+def test_unknown_resource_type_is_rejected(settings: Callable[..., Settings]) -> None:
+    with pytest.raises(ValueError, match=r"Unsupported resource types.*'xhr'"):
+        NetworkRouter(settings(block_resource_types=["image", "xhr"]))
+
+
+def test_router_without_routes_installs_nothing(
+    settings: Callable[..., Settings],
+) -> None:
+    router = NetworkRouter(settings(block_resource_types=[], har_mode="off"))
+    context = FakeContext()
+
+    stats = router.install(context, "test_login")  # type: ignore[arg-type]
+
+    assert not router.enabled
+    assert context.routes == {} and context.har == []
+    assert stats.as_dict() == dict.fromkeys(stats.as_dict(), 0)
+
+
+def test_blocked_requests_without_a_har_have_unknown_size(
+    settings: Callable[..., Settings],
+) -> None:
+    router = NetworkRouter(settings(block_resource_types=["image", "font"]))
+    context = FakeContext()
+
+    stats = router.install(context, "test_login")  # type: ignore[arg-type]
+    logo = _block(context, RESOURCE_TYPE_GLOBS["image"], FakeRoute(LOGO))
+    _block(context, RESOURCE_TYPE_GLOBS["font"], FakeRoute(FONT))
+
+    assert logo.outcome == ("abort", "blockedbyclient")
+    assert stats.blocked_requests == 2
+    assert stats.blocked_unknown_size == 2
+    assert stats.blocked_bytes == 0
+
+
+def test_blocked_bytes_come_from_an_earlier_har(
+    settings: Callable[..., Settings],
+) -> None:
+    router = NetworkRouter(
+        settings(block_resource_types=["image", "font"], har_mode="off")
+    )
+    _write_har(router, "test_cart", {LOGO: 2048, FONT: -1})
+    context = FakeContext()
+
+    stats = router.install(context, "test_cart")  # type: ignore[arg-type]
+    _block(context, RESOURCE_TYPE_GLOBS["image"], FakeRoute(LOGO))
+    _block(context, RESOURCE_TYPE_GLOBS["font"], FakeRoute(FONT))
+    _block(
+        context,
+        RESOURCE_TYPE_GLOBS["image"],
+        FakeRoute("https://example.test/static/new.png"),
+    )
+
+    assert context.har == []
+    assert stats.as_dict() == {
+        "blocked_requests": 3,
+        "blocked_bytes": 2048,
+        "blocked_unknown_size": 1,
+        "replayed_requests": 0,
+        "replayed_bytes": 0,
+    }
+
+
+def test_stub_answers_with_the_resource_content_type(
+    settings: Callable[..., Settings],
+) -> None:
+    router = NetworkRouter(
+        settings(
+            block_resource_types=["script"],
+            block_url_patterns=["**/analytics/**"],
+            block_action="stub",
+        )
+    )
+    context = FakeContext()
+
+    router.install(context, "test_inventory")  # type: ignore[arg-type]
+    bundle = _block(context, RESOURCE_TYPE_GLOBS["script"], FakeRoute(BUNDLE))
+    beacon = _block(
+        context,
+        "**/analytics/**",
+        FakeRoute("https://example.test/analytics/collect", "fetch"),
+    )
+
+    assert bundle.outcome == (
+        "fulfill",
+        {"status": 200, "body": b"", "content_type": "application/javascript"},
+    )
+    assert beacon.outcome[1]["content_type"] == "text/plain"
+
+
+def test_replay_needs_a_recorded_har(settings: Callable[..., Settings]) -> None:
+    router = NetworkRouter(settings(har_mode="replay"))
+
+    with pytest.raises(FileNotFoundError, match="APP_HAR_MODE=record"):
+        router.install(FakeContext(), "test_missing")  # type: ignore[arg-type]
+
+
+def test_replay_counts_requests_served_from_the_har(
+    settings: Callable[..., Settings],
+) -> None:
+    router = NetworkRouter(settings(har_mode="replay", har_not_found="fallback"))
+    _write_har(router, "test_checkout", {LOGO: 1000, BUNDLE: 3000})
+    context = FakeContext()
+
+    stats = router.install(context, "test_checkout")  # type: ignore[arg-type]
+    finished = context.listeners["requestfinished"]
+    finished(FakeRequest(LOGO, "image"))
+    finished(FakeRequest(BUNDLE, "script"))
+    finished(FakeRequest("https://example.test/api/live", "fetch"))
+
+    ((path, options),) = context.har
+    assert path == str(router.har_path("test_checkout"))
+    assert options["update"] is False and options["not_found"] == "fallback"
+    assert (stats.replayed_requests, stats.replayed_bytes) == (2, 4000)
+
+
+def test_format_summary_sizes_only_har_known_blocks() -> None:
+    assert format_summary(
+        {
+            "blocked_requests": 3,
+            "blocked_bytes": 2048,
+            "blocked_unknown_size": 1,
+            "replayed_requests": 2,
+            "replayed_bytes": 4096,
+        }
+    ) == (
+        "blocked 3 requests (2.0 KiB avoided for 2 sized by HAR); "
+        "replayed 2 requests from HAR (4.0 KiB)"
+    )
+    assert format_summary({"blocked_requests": 1, "blocked_unknown_size": 1}) == (
+        "blocked 1 requests; replayed 0 requests from HAR (0.0 KiB)"
+    )
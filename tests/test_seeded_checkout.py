@@ -0,0 +1,20 @@
+from __future__ import annotations
+
+import pytest
+from playwright.sync_api import Page
+
+from pages.checkout_information_page import CheckoutInformationPage
+
+
+@pytest.mark.seed_cart("Sauce Labs Backpack", "Sauce Labs Bike Light")
+def test_seeded_cart_can_complete_checkout(seeded_page: Page) -> None:
+    information_page = CheckoutInformationPage(seeded_page)
+
+    overview_page = information_page.submit_customer_info(
+        first_name="John",
+        last_name="Doe",
+        postal_code="12345",
+    )
+    complete_page = overview_page.finish_checkout()
+
+    assert complete_page.is_order_complete(), "Checkout should complete successfully."
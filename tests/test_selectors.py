@@ -0,0 +1,154 @@
+from __future__ import annotations
+
+from typing import Optional
+
+import pytest
+
+from pages import selectors
+from pages.selectors import (
+    SelectorError,
+    register_page_class,
+    unmapped_names,
+    validate_selector,
+)
+
+pytest_plugins = ("pytester",)
+
+REGISTRY_CONFTEST = """
+import pytest
+
+from pages.selectors import validate_registered
+
+
+def pytest_collection_finish(session):
+    problems = validate_registered()
+    if problems:
+        raise pytest.UsageError(
+            "Page object selector registry is invalid:\\n  " + "\\n  ".join(problems)
+        )
+"""
+
+
+@pytest.fixture(autouse=True)
+def registry(monkeypatch: pytest.MonkeyPatch) -> None:
+    """Register test classes in copies of the global registry."""
+    monkeypatch.setattr(selectors, "_OWNERS", dict(selectors._OWNERS))
+    monkeypatch.setattr(selectors, "_REGISTERED", dict(selectors._REGISTERED))
+
+
+@pytest.mark.parametrize(
+    ("selector", "problem"),
+    [
+        ("#login-button", None),
+        ("[data-test='login-button']", None),
+        ("button:has-text('Log [in]')", None),
+        ("text=Log in >> nth=0", None),
+        ("[data-test=\"a\\\"b\"]", None),
+        ("", "empty selector"),
+        ("#a >> ", "empty part in '>>' chain"),
+        ("text=", "missing selector body after engine prefix"),
+        ("> .item", "selector starts with a combinator"),
+        ("[data-test='x'", "unclosed '['"),
+        ("div:not(.a))", "unbalanced ')'"),
+        ("[data-test='x]", "unterminated string"),
+        ("div(]", "unbalanced ']'"),
+    ],
+)
+def test_validate_selector(selector: str, problem: Optional[str]) -> None:
+    assert validate_selector(selector) == problem
+
+
+def test_invalid_selector_fails_registration() -> None:
+    class BrokenPage:
+        SELECTORS = {"ok": "#ok-broken", "bad": "[data-test='bad'"}
+
+    with pytest.raises(SelectorError, match=r"'bad' -> .*: unclosed '\['"):
+        register_page_class(BrokenPage)
+    assert "#ok-broken" not in selectors._OWNERS
+
+
+def test_selector_mapped_twice_in_one_class_is_rejected() -> None:
+    class TwicePage:
+        SELECTORS = {"submit": "#twice", "login": "#twice"}
+
+    with pytest.raises(SelectorError, match="'login' and 'submit' both map"):
+        register_page_class(TwicePage)
+
+
+def test_selector_mapped_under_another_name_elsewhere_is_rejected() -> None:
+    class FirstPage:
+        SELECTORS = {"login": "#shared-button"}
+
+    class SecondPage:
+        SELECTORS = {"submit": "#shared-button"}
+
+    register_page_class(FirstPage)
+    with pytest.raises(SelectorError, match="already registered as 'login' by"):
+        register_page_class(SecondPage)
+
+
+def test_inherited_maps_are_merged_and_overridable() -> None:
+    class ParentPage:
+        SELECTORS = {"header": "#inherited-header", "title": "#inherited-title"}
+
+    class ChildPage(ParentPage):
+        SELECTORS = {"title": "#child-title", "body": "#child-body"}
+
+    register_page_class(ParentPage)
+    maps = register_page_class(ChildPage)
+
+    assert dict(maps) == {
+        "header": "#inherited-header",
+        "title": "#child-title",
+        "body": "#child-body",
+    }
+    with pytest.raises(TypeError):
+        maps["body"] = "#other"  # type: ignore[index]
+
+
+def test_unmapped_names_reports_literal_map_names() -> None:
+    class FormPage:
+        SELECTORS = {"name": "#form-name", "save": "#form-save"}
+
+        def submit(self) -> None:
+            self.fill("name", "Ada")  # type: ignore[attr-defined]
+            self.click("save")  # type: ignore[attr-defined]
+            self.click("cancel")  # type: ignore[attr-defined]
+            self.click("#raw", use_map=False)  # type: ignore[attr-defined]
+            self.query("name", until={"toast": "visible"})  # type: ignore[attr-defined]
+
+    FormPage._maps = register_page_class(FormPage)  # type: ignore[attr-defined]
+
+    missing = unmapped_names(FormPage)
+
+    assert [entry.split(": ", 1)[1] for entry in missing] == [
+        "click('cancel')",
+        "query('toast')",
+    ]
+
+
+def test_unmapped_name_fails_collection(pytester: pytest.Pytester) -> None:
+    pytester.makeconftest(REGISTRY_CONFTEST)
+    pytester.makepyfile(
+        test_pages="""
+        from pages.base_page import BasePage
+
+
+        class ProfilePage(BasePage):
+            SELECTORS = {"avatar": "#collection-avatar"}
+
+            def open_settings(self):
+                self.click("settings")
+
+
+        def test_profile():
+            pass
+        """
+    )
+
+    result = pytester.runpytest()
+
+    assert result.ret == pytest.ExitCode.USAGE_ERROR
+    result.stderr.fnmatch_lines(
+        ["*test_pages.ProfilePage line 8: click('settings') has no selector mapping"]
+    )
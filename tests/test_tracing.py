@@ -0,0 +1,65 @@
+from __future__ import annotations
+
+from pathlib import Path
+from typing import Any, Dict, List, Tuple
+
+from utils.tracing import FULL, TracingPolicy
+
+
+class FakeTracing:
+    def __init__(self) -> None:
+        self.calls: List[Tuple[str, Dict[str, Any]]] = []
+
+    def start(self, **options: Any) -> None:
+        self.calls.append(("start", options))
+
+    def stop(self, **options: Any) -> None:
+        self.calls.append(("stop", options))
+
+    def start_chunk(self, **options: Any) -> None:
+        self.calls.append(("start_chunk", options))
+
+    def stop_chunk(self, **options: Any) -> None:
+        self.calls.append(("stop_chunk", options))
+
+
+class FakeContext:
+    def __init__(self) -> None:
+        self.tracing = FakeTracing()
+
+
+def _names(context: FakeContext) -> List[str]:
+    return [name for name, _ in context.tracing.calls]
+
+
+def test_shared_context_is_chunked_per_test(tmp_path: Path) -> None:
+    policy = TracingPolicy("on")
+    context = FakeContext()
+
+    level = policy.start_group(context)  # type: ignore[arg-type]
+    trace = policy.start_chunk(context, 1, level)  # type: ignore[arg-type]
+    path = trace.finish(False, lambda: tmp_path / "trace.zip")
+
+    assert path == tmp_path / "trace.zip"
+    assert _names(context) == ["start", "start_chunk", "stop_chunk"]
+    assert trace.record()["level"] == f"{FULL}-chunk"
+
+
+def test_on_first_retry_traces_a_shared_context_retry(tmp_path: Path) -> None:
+    policy = TracingPolicy("on-first-retry")
+    context = FakeContext()
+
+    level = policy.start_group(context)  # type: ignore[arg-type]
+    first = policy.start_chunk(context, 1, level)  # type: ignore[arg-type]
+    assert first.finish(True, lambda: tmp_path / "first.zip") is None
+    assert _names(context) == []
+
+    retry = policy.start_chunk(context, 2, level)  # type: ignore[arg-type]
+    path = retry.finish(True, lambda: tmp_path / "retry.zip")
+
+    assert path == tmp_path / "retry.zip"
+    assert context.tracing.calls == [
+        ("start", {"screenshots": True, "snapshots": True, "sources": True}),
+        ("stop", {"path": str(path)}),
+    ]
+    assert retry.record()["level"] == FULL
@@ -0,0 +1,168 @@
+from __future__ import annotations
+
+import hashlib
+from pathlib import Path
+from typing import Any, Tuple
+
+import numpy as np
+import pytest
+from playwright.sync_api import Page
+
+from pages.base_page import BasePage
+from utils import visual
+
+# Rendered by the browser in test_swatch_matches_committed_baseline; the
+# committed baselines are these pixels, so every engine draws them exactly.
+SWATCH_HTML = """
+<body style="margin: 0">
+  <div id="swatch" style="display: flex; width: 64px; height: 32px">
+    <div style="width: 40px; background: rgb(226, 35, 26)"></div>
+    <div style="width: 24px; background: rgb(19, 34, 56)"></div>
+  </div>
+</body>
+"""
+
+
+class SwatchPage(BasePage):
+    SELECTORS = {"swatch": "#swatch"}
+
+
+WHITE = (255, 255, 255, 255)
+
+
+def _solid(height: int, width: int, rgba: Tuple[int, ...] = WHITE) -> np.ndarray:
+    return np.full((height, width, 4), rgba, dtype=np.uint8)
+
+
+def _count(actual: np.ndarray, expected: np.ndarray, **options: Any) -> int:
+    ys, _ = visual.diff_pixels(actual, expected, **options)
+    return len(ys)
+
+
+def test_identical_pixels_do_not_differ() -> None:
+    image = _solid(8, 8)
+    assert _count(image, image.copy()) == 0
+
+
+def test_changes_within_threshold_do_not_count() -> None:
+    expected = _solid(8, 8)
+    actual = expected.copy()
+    actual[2, 3, :3] = 240
+    actual[5, 5, :3] = 0
+
+    assert _count(actual, expected, threshold=0.1, antialiasing=False) == 1
+    assert _count(actual, expected, threshold=0.0, antialiasing=False) == 2
+
+
+def test_ignore_boxes_drop_pixels_inside_them() -> None:
+    expected = _solid(10, 10)
+    actual = expected.copy()
+    actual[1, 1, :3] = 0
+    actual[8, 8, :3] = 0
+
+    ys, xs = visual.diff_pixels(
+        actual, expected, antialiasing=False, ignore=[visual.Box(0, 0, 4, 4)]
+    )
+    assert list(zip(ys.tolist(), xs.tolist(), strict=True)) == [(8, 8)]
+
+
+def test_antialiasing_tolerates_a_one_pixel_shift() -> None:
+    expected = _solid(10, 10)
+    expected[3:7, 4, :3] = 0
+    actual = np.roll(expected, 1, axis=1)
+
+    assert _count(actual, expected, antialiasing=False) == 8
+    assert _count(actual, expected, antialiasing=True) == 0
+
+
+def test_antialiasing_still_reports_new_content() -> None:
+    expected = _solid(10, 10)
+    actual = expected.copy()
+    actual[4:6, 4:6, :3] = (255, 0, 0)
+
+    assert _count(actual, expected, antialiasing=True) == 4
+
+
+@pytest.fixture
+def store(tmp_path: Path) -> visual.BaselineStore:
+    return visual.BaselineStore(tmp_path)
+
+
+def test_missing_baseline_is_written_and_reported(store: visual.BaselineStore) -> None:
+    png = visual.encode(_solid(4, 4))
+
+    comparison = visual.compare(store, "card", png)
+
+    assert comparison.status == visual.MISSING
+    assert store.path("card").read_bytes() == png
+
+
+def test_identical_bytes_match_without_decoding(store: visual.BaselineStore) -> None:
+    png = visual.encode(_solid(4, 4))
+    store.save("card", png)
+
+    comparison = visual.compare(store, "card", png)
+
+    assert comparison.status == visual.MATCH
+    assert comparison.identical
+
+
+def test_update_rewrites_the_baseline(store: visual.BaselineStore) -> None:
+    store.save("card", visual.encode(_solid(4, 4)))
+    png = visual.encode(_solid(4, 4, (0, 0, 0, 255)))
+
+    comparison = visual.compare(store, "card", png, update=True)
+
+    assert comparison.status == visual.UPDATED
+    assert store.path("card").read_bytes() == png
+    assert store.digest("card") == hashlib.sha256(png).hexdigest()
+
+
+def test_mismatch_reports_pixels_and_renders_a_diff(
+    store: visual.BaselineStore,
+) -> None:
+    expected = _solid(4, 5)
+    actual = expected.copy()
+    actual[1:3, 1:3, :3] = 0
+    store.save("card", visual.encode(expected))
+
+    comparison = visual.compare(store, "card", visual.encode(actual))
+
+    assert comparison.status == visual.MISMATCH
+    assert (comparison.diff_pixels, comparison.total_pixels) == (4, 20)
+    assert comparison.diff_png is not None
+    diff = visual.decode(comparison.diff_png)
+    assert diff[1, 1].tolist() == [255, 0, 0, 255]
+    assert diff[0, 0].tolist() != [255, 0, 0, 255]
+
+
+def test_differences_within_max_diff_ratio_match(store: visual.BaselineStore) -> None:
+    expected = _solid(4, 5)
+    actual = expected.copy()
+    actual[0, 0, :3] = 0
+    store.save("card", visual.encode(expected))
+
+    comparison = visual.compare(
+        store, "card", visual.encode(actual), max_diff_ratio=0.05
+    )
+
+    assert comparison.status == visual.MATCH
+    assert comparison.diff_pixels == 1
+
+
+def test_size_change_is_a_mismatch(store: visual.BaselineStore) -> None:
+    store.save("card", visual.encode(_solid(4, 4)))
+
+    comparison = visual.compare(store, "card", visual.encode(_solid(4, 5)))
+
+    assert comparison.status == visual.MISMATCH
+    assert comparison.total_pixels == 0
+    assert "differs in size" in comparison.describe()
+
+
+def test_swatch_matches_committed_baseline(page: Page) -> None:
+    page.set_content(SWATCH_HTML)
+
+    comparison = SwatchPage(page).assert_visual("swatch", "swatch")
+
+    assert comparison.status == visual.MATCH
@@ -0,0 +1,221 @@
+from __future__ import annotations
+
+import hashlib
+import os
+import queue
+import shutil
+import threading
+import time
+import zipfile
+from pathlib import Path
+from typing import Any, Callable, Dict, List, Optional, Tuple
+from uuid import uuid4
+
+import allure
+import allure_commons
+
+from utils.screencast import Frame
+from utils.screencast import write_mjpeg_avi
+
+Job = Tuple[Callable[..., None], Tuple[Any, ...]]
+
+_STOP: Job = (lambda: None, ())
+
+
+def _allure_reporter() -> Any:
+    for plugin in allure_commons.plugin_manager.get_plugins():
+        reporter = getattr(plugin, "allure_logger", None)
+        if reporter is not None:
+            return reporter
+    return None
+
+
+def reserve_attachment(
+    name: str,
+    attachment_type: Any,
+    extension: Optional[str] = None,
+) -> Optional[str]:
+    """Register an Allure attachment now and return the file name to write later.
+
+    The entry is added to the running test on the caller's thread, so the
+    result JSON references it; the body can then be written off-thread.
+    Returns None when Allure reporting is not active.
+    """
+    reporter = _allure_reporter()
+    if reporter is None:
+        return None
+    try:
+        file_name = reporter._attach(
+            uuid4(), name=name, attachment_type=attachment_type, extension=extension
+        )
+    except (AttributeError, KeyError):
+        return None
+    # _attach is private to allure-pytest; anything but a file name is unusable.
+    return file_name if isinstance(file_name, str) else None
+
+
+def _link_or_copy(source: Path, target: Path) -> None:
+    try:
+        os.link(source, target)
+    except OSError:
+        shutil.copyfile(source, target)
+
+
+def recompress_zip(path: Path, level: int = 9) -> Tuple[int, int]:
+    """Rewrite a zip with maximum deflate compression; return sizes before/after."""
+    before = path.stat().st_size
+    tmp_path = path.with_suffix(".tmp.zip")
+    with zipfile.ZipFile(path) as source, zipfile.ZipFile(
+        tmp_path, "w", compression=zipfile.ZIP_DEFLATED, compresslevel=level
+    ) as target:
+        for info in source.infolist():
+            target.writestr(info.filename, source.read(info))
+    after = tmp_path.stat().st_size
+    if after < before:
+        os.replace(tmp_path, path)
+        return before, after
+    tmp_path.unlink(missing_ok=True)
+    return before, before
+
+
+class ArtifactPipeline:
+    """Background workers that compress, deduplicate and write test artifacts.
+
+    Capture stays on the test thread; everything after it is queued. The
+    queue is bounded, so a burst of failures blocks submitters (backpressure)
+    instead of growing memory without limit. Call close() at session end to
+    drain the queue.
+    """
+
+    def __init__(
+        self,
+        results_dir: Optional[Path],
+        workers: int = 2,
+        max_queue: int = 32,
+        recompress_traces: bool = True,
+    ) -> None:
+        self._results_dir = results_dir
+        self._recompress_traces = recompress_traces
+        self._queue: "queue.Queue[Job]" = queue.Queue(maxsize=max_queue)
+        self._lock = threading.Lock()
+        self._written: Dict[str, Tuple[Path, threading.Event]] = {}
+        self.stats: Dict[str, float] = {
+            "jobs": 0,
+            "errors": 0,
+            "duplicates": 0,
+            "bytes_saved": 0,
+            "blocked_s": 0.0,
+        }
+        self.errors: List[str] = []
+        self._threads = [
+            threading.Thread(target=self._run, name=f"artifacts-{index}", daemon=True)
+            for index in range(max(workers, 1))
+        ]
+        for thread in self._threads:
+            thread.start()
+
+    def _run(self) -> None:
+        while True:
+            job = self._queue.get()
+            try:
+                if job is _STOP:
+                    return
+                func, args = job
+                func(*args)
+            except Exception as exc:
+                with self._lock:
+                    self.stats["errors"] += 1
+                    self.errors.append(f"{type(exc).__name__}: {exc}")
+            finally:
+                self._queue.task_done()
+
+    def _submit(self, func: Callable[..., None], *args: Any) -> None:
+        start = time.perf_counter()
+        self._queue.put((func, args))
+        with self._lock:
+            self.stats["jobs"] += 1
+            self.stats["blocked_s"] += time.perf_counter() - start
+
+    def _target(self, file_name: Optional[str]) -> Optional[Path]:
+        if file_name is None or self._results_dir is None:
+            return None
+        return self._results_dir / file_name
+
+    def screenshot(self, data: bytes, name: str, attachment_type: Any) -> None:
+        """Queue a screenshot; identical images are stored once and linked."""
+        file_name = reserve_attachment(name, attachment_type)
+        target = self._target(file_name)
+        if target is None:
+            return
+        digest = hashlib.sha256(data).hexdigest()
+        self._submit(self._write_screenshot, data, digest, target)
+
+    def _write_screenshot(self, data: bytes, digest: str, target: Path) -> None:
+        with self._lock:
+            existing = self._written.get(digest)
+            if existing is None:
+                written = threading.Event()
+                self._written[digest] = (target, written)
+            else:
+                self.stats["duplicates"] += 1
+                self.stats["bytes_saved"] += len(data)
+        target.parent.mkdir(parents=True, exist_ok=True)
+        if existing is not None:
+            existing_path, existing_written = existing
+            existing_written.wait()
+            _link_or_copy(existing_path, target)
+            return
+        try:
+            target.write_bytes(data)
+        finally:
+            written.set()
+
+    def trace(self, path: Path, name: str) -> None:
+        """Queue recompression of a saved trace zip and its Allure attachment."""
+        file_name = reserve_attachment(name, allure.attachment_type.ZIP)
+        self._submit(self._write_trace, path, self._target(file_name))
+
+    def _write_trace(self, path: Path, target: Optional[Path]) -> None:
+        if self._recompress_traces:
+            before, after = recompress_zip(path)
+            with self._lock:
+                self.stats["bytes_saved"] += before - after
+        if target is not None:
+            target.parent.mkdir(parents=True, exist_ok=True)
+            shutil.copyfile(path, target)
+
+    def video(self, frames: List[Frame], path: Path, name: str) -> None:
+        """Queue encoding of ring-buffer frames to an AVI and its attachment."""
+        file_name = reserve_attachment(name, "video/x-msvideo", extension="avi")
+        self._submit(self._write_video, frames, path, self._target(file_name))
+
+    def _write_video(
+        self,
+        frames: List[Frame],
+        path: Path,
+        target: Optional[Path],
+    ) -> None:
+        write_mjpeg_avi(frames, path)
+        if target is not None:
+            target.parent.mkdir(parents=True, exist_ok=True)
+            _link_or_copy(path, target)
+
+    def delete(self, path: Path) -> None:
+        """Queue removal of an artifact that is not worth keeping."""
+        self._submit(self._delete, path)
+
+    @staticmethod
+    def _delete(path: Path) -> None:
+        path.unlink(missing_ok=True)
+
+    def flush(self) -> None:
+        """Block until every queued job has finished."""
+        self._queue.join()
+
+    def close(self) -> None:
+        """Drain the queue and stop the workers."""
+        self.flush()
+        for _ in self._threads:
+            self._queue.put(_STOP)
+        for thread in self._threads:
+            thread.join()
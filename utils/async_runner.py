@@ -0,0 +1,215 @@
+from __future__ import annotations
+
+import asyncio
+import concurrent.futures
+import contextvars
+import threading
+import time
+from dataclasses import dataclass, field
+from typing import Any, Awaitable, Callable, Coroutine, Dict, List, Optional, TypeVar
+
+from playwright.async_api import Browser
+from playwright.async_api import BrowserContext
+from playwright.async_api import Page
+from playwright.async_api import Playwright
+from playwright.async_api import StorageState
+from playwright.async_api import async_playwright
+
+from config.settings import Settings, get_settings
+from utils import timing
+
+AsyncFlow = Callable[[Page], Awaitable[Any]]
+T = TypeVar("T")
+
+
+@dataclass
+class FlowResult:
+    """Outcome of one flow run in its own browser context."""
+
+    index: int
+    ok: bool
+    duration_ms: float
+    value: Any = None
+    error: Optional[str] = None
+    breakdown: List[Dict[str, Any]] = field(default_factory=list)
+
+
+async def launch_browser(playwright: Playwright, settings: Settings) -> Browser:
+    """Launch the configured browser through the async API."""
+    if settings.browser == "firefox":
+        return await playwright.firefox.launch(headless=settings.headless)
+    return await playwright.chromium.launch(headless=settings.headless)
+
+
+async def _run_one(
+    browser: Browser,
+    flow: AsyncFlow,
+    index: int,
+    settings: Settings,
+    storage_state: Optional[StorageState],
+) -> FlowResult:
+    recorder = timing.TimingRecorder(f"flow-{index}")
+    token = timing.activate(recorder)
+    start = time.perf_counter()
+    context: Optional[BrowserContext] = None
+    try:
+        context = await browser.new_context(
+            base_url=settings.base_url,
+            storage_state=storage_state,
+        )
+        page = await context.new_page()
+        value = await flow(page)
+        ok, error = True, None
+    except Exception as exc:
+        value, ok, error = None, False, f"{type(exc).__name__}: {exc}"
+    finally:
+        if context is not None:
+            await context.close()
+        timing.deactivate(token)
+    return FlowResult(
+        index=index,
+        ok=ok,
+        duration_ms=(time.perf_counter() - start) * 1000,
+        value=value,
+        error=error,
+        breakdown=recorder.breakdown(),
+    )
+
+
+async def run_flows(
+    browser: Browser,
+    flow: AsyncFlow,
+    count: int,
+    *,
+    concurrency: Optional[int] = None,
+    settings: Optional[Settings] = None,
+    storage_state: Optional[StorageState] = None,
+) -> List[FlowResult]:
+    """Run a flow `count` times on one browser, each in a fresh context.
+
+    At most `concurrency` contexts are open at once (all of them by default).
+    Every run gets its own timing recorder, so breakdowns do not mix.
+    """
+    settings = settings or get_settings()
+    semaphore = asyncio.Semaphore(concurrency or count)
+
+    async def bounded(index: int) -> FlowResult:
+        async with semaphore:
+            return await _run_one(browser, flow, index, settings, storage_state)
+
+    return list(await asyncio.gather(*(bounded(index) for index in range(count))))
+
+
+class AsyncBrowserHost:
+    """An event loop thread owning an async Playwright driver and one browser.
+
+    Once sync Playwright has run in a thread, that thread has a running event
+    loop and asyncio.run() refuses to start there. Flows are therefore
+    submitted to this host's own thread, where the driver and browser start on
+    first use and stay up until close(); every flow gets a fresh context.
+    """
+
+    def __init__(self, settings: Optional[Settings] = None) -> None:
+        self.settings = settings or get_settings()
+        self._loop = asyncio.new_event_loop()
+        self._thread = threading.Thread(
+            target=self._loop.run_forever, name="async-flows", daemon=True
+        )
+        self._thread.start()
+        self._playwright: Optional[Playwright] = None
+        self._browser: Optional[Browser] = None
+        self._lock = threading.Lock()
+
+    def __enter__(self) -> "AsyncBrowserHost":
+        return self
+
+    def __exit__(self, *exc_info: Any) -> None:
+        self.close()
+
+    def call(self, coroutine: Coroutine[Any, Any, T]) -> T:
+        """Run a coroutine on the host's loop and wait for its result.
+
+        The task starts in a copy of the caller's context, so the running
+        test's time budget still caps page-object waits inside the flows.
+        """
+        result: concurrent.futures.Future[T] = concurrent.futures.Future()
+
+        def start() -> None:
+            task = self._loop.create_task(coroutine)
+            task.add_done_callback(lambda done: _copy_outcome(done, result))
+
+        self._loop.call_soon_threadsafe(start, context=contextvars.copy_context())
+        return result.result()
+
+    def browser(self) -> Browser:
+        """Return the shared browser, launching the driver on first use."""
+        with self._lock:
+            if self._browser is None:
+                self._playwright = self.call(async_playwright().start())
+                self._browser = self.call(
+                    launch_browser(self._playwright, self.settings)
+                )
+            return self._browser
+
+    def run(
+        self,
+        flow: AsyncFlow,
+        count: int,
+        *,
+        concurrency: Optional[int] = None,
+        storage_state: Optional[StorageState] = None,
+    ) -> List[FlowResult]:
+        """Run a flow `count` times on the shared browser; see run_flows."""
+        return self.call(
+            run_flows(
+                self.browser(),
+                flow,
+                count,
+                concurrency=concurrency,
+                settings=self.settings,
+                storage_state=storage_state,
+            )
+        )
+
+    def close(self) -> None:
+        if not self._thread.is_alive():
+            return
+        with self._lock:
+            try:
+                if self._browser is not None:
+                    self.call(self._browser.close())
+                if self._playwright is not None:
+                    self.call(self._playwright.stop())
+            finally:
+                self._browser = self._playwright = None
+                self._loop.call_soon_threadsafe(self._loop.stop)
+                self._thread.join()
+                self._loop.close()
+
+
+def _copy_outcome(task: asyncio.Task[T], result: concurrent.futures.Future[T]) -> None:
+    if task.cancelled():
+        result.cancel()
+    elif task.exception() is not None:
+        result.set_exception(task.exception())  # type: ignore[arg-type]
+    else:
+        result.set_result(task.result())
+
+
+def run_concurrent_flows(
+    flow: AsyncFlow,
+    count: int,
+    *,
+    concurrency: Optional[int] = None,
+    settings: Optional[Settings] = None,
+    storage_state: Optional[StorageState] = None,
+) -> List[FlowResult]:
+    """Synchronous entry point: start a host, run the flows, shut it down.
+
+    Safe to call from a test that already uses sync Playwright. Use the
+    async_flow_runner fixture to keep one browser for the whole session.
+    """
+    with AsyncBrowserHost(settings) as host:
+        return host.run(
+            flow, count, concurrency=concurrency, storage_state=storage_state
+        )
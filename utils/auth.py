@@ -0,0 +1,121 @@
+from __future__ import annotations
+
+import hashlib
+import json
+import os
+import time
+from pathlib import Path
+from typing import Callable, Dict, Optional
+
+from playwright.sync_api import Browser
+from playwright.sync_api import StorageState
+
+from config.settings import Settings
+from pages.login_page import LoginPage
+from utils.network import NetworkRouter
+
+INVENTORY_PATH = "inventory.html"
+COOKIE_EXPIRY_SKEW_S = 30
+LOGIN_HAR_NAME = "_login"
+
+def credentials_key(settings: Settings) -> str:
+    """Return a stable cache key for the configured target and credentials."""
+    raw = "\n".join(
+        (
+            settings.base_url,
+            settings.app_username.get_secret_value(),
+            settings.app_password.get_secret_value(),
+        )
+    )
+    return hashlib.sha256(raw.encode("utf-8")).hexdigest()[:16]
+
+
+def login_storage_state(
+    browser: Browser,
+    settings: Settings,
+    router: Optional[NetworkRouter] = None,
+) -> StorageState:
+    """Log in through the UI once and return the resulting storage state."""
+    context = browser.new_context(base_url=settings.base_url)
+    try:
+        if router is not None:
+            router.install(context, LOGIN_HAR_NAME)
+        page = context.new_page()
+        login_page = LoginPage(page)
+        login_page.open()
+        inventory_page = login_page.login(
+            settings.app_username.get_secret_value(),
+            settings.app_password.get_secret_value(),
+        )
+        if not inventory_page.is_inventory_visible():
+            raise RuntimeError("Login did not reach the inventory page.")
+        return context.storage_state()
+    finally:
+        context.close()
+
+
+def _cookies_expired(state: StorageState, now: float) -> bool:
+    for cookie in state.get("cookies", []):
+        expires = cookie.get("expires", -1)
+        if expires > 0 and expires <= now + COOKIE_EXPIRY_SKEW_S:
+            return True
+    return False
+
+
+class AuthStateCache:
+    """Per-worker cache of logged-in storage states keyed by credential set."""
+
+    def __init__(self, state_dir: Path, ttl_seconds: int) -> None:
+        self._state_dir = state_dir
+        self._ttl_seconds = ttl_seconds
+        self._states: Dict[str, StorageState] = {}
+        self._created: Dict[str, float] = {}
+
+    def _path(self, key: str) -> Path:
+        return self._state_dir / f"state_{key}.json"
+
+    def _is_fresh(self, key: str, now: float) -> bool:
+        created = self._created.get(key)
+        if created is None or now - created >= self._ttl_seconds:
+            return False
+        return not _cookies_expired(self._states[key], now)
+
+    def _load(self, key: str) -> None:
+        path = self._path(key)
+        try:
+            state = json.loads(path.read_text(encoding="utf-8"))
+            created = path.stat().st_mtime
+        except (OSError, ValueError):
+            return
+        self._states[key] = state
+        self._created[key] = created
+
+    def _store(self, key: str, state: StorageState, now: float) -> None:
+        self._states[key] = state
+        self._created[key] = now
+        self._state_dir.mkdir(parents=True, exist_ok=True)
+        tmp_path = self._path(key).with_suffix(f".{os.getpid()}.tmp")
+        tmp_path.write_text(json.dumps(state), encoding="utf-8")
+        os.replace(tmp_path, self._path(key))
+
+    def get(
+        self,
+        key: str,
+        login: Callable[[], StorageState],
+    ) -> StorageState:
+        """Return a fresh storage state for the key, logging in when needed."""
+        now = time.time()
+        if key not in self._states:
+            self._load(key)
+        if key in self._states and self._is_fresh(key, now):
+            return self._states[key]
+        state = login()
+        self._store(key, state, now)
+        return state
+
+    def invalidate(self, key: str) -> None:
+        """Drop the cached state for a key, e.g. after the session expired."""
+        self._states.pop(key, None)
+        self._created.pop(key, None)
+        self._path(key).unlink(missing_ok=True)
+
@@ -0,0 +1,124 @@
+from __future__ import annotations
+
+import time
+from contextvars import ContextVar
+from contextvars import Token
+from typing import List, NamedTuple, Optional
+
+# Shortest wait handed to Playwright; a zero timeout would mean "no timeout".
+MIN_WAIT_MS = 1
+
+
+class BudgetExceeded(TimeoutError):
+    """Raised when a test starts a step after its time budget ran out."""
+
+
+class Step(NamedTuple):
+    """One budgeted page-object step and when it started."""
+
+    label: str
+    started_s: float
+
+
+class Spent(NamedTuple):
+    """Seconds one step took out of the budget."""
+
+    label: str
+    seconds: float
+
+
+class TestBudget:
+    """Wall-time budget shared by every page-object wait of one test.
+
+    Each wait is capped at the time left, so a broken environment fails a
+    test once instead of once per remaining step.
+    """
+
+    __test__ = False  # not a pytest test class
+
+    def __init__(self, total_s: float, source: str = "settings") -> None:
+        self.total_s = total_s
+        self.source = source
+        # Time before the first page-object step (fixtures, raw Playwright).
+        self.steps: List[Step] = [Step("setup", 0.0)]
+        self._started = time.monotonic()
+        self._stopped: Optional[float] = None
+
+    def stop(self) -> None:
+        """Freeze the clock once the test body is done; teardown is not budgeted."""
+        if self._stopped is None:
+            self._stopped = time.monotonic()
+
+    def elapsed_s(self) -> float:
+        now = time.monotonic() if self._stopped is None else self._stopped
+        return now - self._started
+
+    def remaining_ms(self) -> float:
+        return (self.total_s - self.elapsed_s()) * 1000
+
+    @property
+    def exhausted(self) -> bool:
+        return self.remaining_ms() <= 0
+
+    def clamp(self, timeout_ms: int, step: Optional[str] = None) -> int:
+        """Return min(timeout_ms, time left); raise when nothing is left."""
+        if step is not None:
+            self.steps.append(Step(step, self.elapsed_s()))
+        remaining_ms = self.remaining_ms()
+        if remaining_ms <= 0:
+            raise BudgetExceeded(self.report(step or self.steps[-1].label))
+        return max(MIN_WAIT_MS, min(timeout_ms, int(remaining_ms)))
+
+    def consumption(self) -> List[Spent]:
+        """Return each step with the seconds it took, slowest first.
+
+        A step runs until the next one starts; the last runs until now.
+        """
+        ends = [step.started_s for step in self.steps[1:]] + [self.elapsed_s()]
+        spent = [
+            Spent(step.label, round(end - step.started_s, 3))
+            for step, end in zip(self.steps, ends, strict=True)
+        ]
+        return sorted(spent, key=lambda row: row.seconds, reverse=True)
+
+    def report(self, blocked: Optional[str] = None, limit: int = 5) -> str:
+        """Describe where the budget went, naming the step that was refused."""
+        lines = [
+            f"Test budget {self.total_s:g}s ({self.source}): "
+            f"{self.elapsed_s():.2f}s used."
+        ]
+        if blocked is not None:
+            lines.insert(0, f"Test budget exhausted before {blocked}.")
+        consumed = self.consumption()
+        if consumed:
+            lines.append("Slowest steps:")
+            lines.extend(
+                f"  {row.seconds:8.3f}s  {row.label}" for row in consumed[:limit]
+            )
+        return "\n".join(lines)
+
+
+_current: ContextVar[Optional[TestBudget]] = ContextVar("test_budget", default=None)
+
+
+def activate(budget: TestBudget) -> Token[Optional[TestBudget]]:
+    """Make a budget current for the running test."""
+    return _current.set(budget)
+
+
+def deactivate(token: Token[Optional[TestBudget]]) -> None:
+    """Restore the budget that was current before activate()."""
+    _current.reset(token)
+
+
+def current_budget() -> Optional[TestBudget]:
+    """Return the budget of the running test, if one is set."""
+    return _current.get()
+
+
+def clamp(timeout_ms: int, step: Optional[str] = None) -> int:
+    """Cap a step timeout at the current test's remaining budget, if any."""
+    budget = _current.get()
+    if budget is None:
+        return timeout_ms
+    return budget.clamp(timeout_ms, step)
@@ -0,0 +1,252 @@
+from __future__ import annotations
+
+import csv
+import hashlib
+import io
+import json
+import os
+import zlib
+from array import array
+from pathlib import Path
+from typing import Any, Dict, Iterator, List, NamedTuple, Optional, Tuple
+
+import pytest
+
+CACHE_KEY = "datasets/v1"
+FORMATS = (".csv", ".jsonl")
+_INDEX_VERSION = 1
+_HASH_CHUNK = 1 << 20
+
+Record = Dict[str, Any]
+
+
+class RecordRef(NamedTuple):
+    """What a dataset-driven test is parametrized with: a file and a record row.
+
+    The record itself is read when the test runs, so collection never holds
+    more than offsets in memory.
+    """
+
+    path: str
+    row: int
+
+
+def file_digest(path: Path) -> str:
+    digest = hashlib.sha256()
+    with path.open("rb") as handle:
+        for chunk in iter(lambda: handle.read(_HASH_CHUNK), b""):
+            digest.update(chunk)
+    return digest.hexdigest()
+
+
+def _scan(path: Path) -> Tuple[array, array]:
+    """Return the byte offset and a content checksum of every record.
+
+    Records are lines; a CSV record continues while a quoted field is open.
+    Blank lines are skipped. The checksum ignores line endings.
+    """
+    offsets, checksums = array("Q"), array("I")
+    quoted = path.suffix == ".csv"
+    position = start = 0
+    checksum = 0
+    open_quote = False
+    with path.open("rb") as handle:
+        for line in handle:
+            if not open_quote and not line.strip():
+                position += len(line)
+                start = position
+                continue
+            checksum = zlib.crc32(line.rstrip(b"\r\n"), checksum)
+            if quoted and line.count(b'"') % 2:
+                open_quote = not open_quote
+            position += len(line)
+            if not open_quote:
+                offsets.append(start)
+                checksums.append(checksum)
+                start, checksum = position, 0
+    return offsets, checksums
+
+
+def _read_index(path: Path) -> Optional[Tuple[array, array]]:
+    try:
+        with path.open("rb") as handle:
+            header = array("Q")
+            header.fromfile(handle, 2)
+            if header[0] != _INDEX_VERSION:
+                return None
+            offsets, checksums = array("Q"), array("I")
+            offsets.fromfile(handle, header[1])
+            checksums.fromfile(handle, header[1])
+    except (OSError, EOFError):
+        return None
+    return offsets, checksums
+
+
+def _write_index(path: Path, offsets: array, checksums: array) -> None:
+    path.parent.mkdir(parents=True, exist_ok=True)
+    partial = path.with_name(f"{path.name}.{os.getpid()}.tmp")
+    with partial.open("wb") as handle:
+        array("Q", [_INDEX_VERSION, len(offsets)]).tofile(handle)
+        offsets.tofile(handle)
+        checksums.tofile(handle)
+    os.replace(partial, path)
+
+
+class Dataset:
+    """Random and streaming access to the records of one CSV or JSONL file.
+
+    Only record offsets and checksums are held in memory; records are parsed
+    on demand. CSV records are dicts keyed by the header row.
+    """
+
+    def __init__(self, path: Path, offsets: array, checksums: array) -> None:
+        self.path = path
+        stat = path.stat()
+        self.stamp = [stat.st_mtime_ns, stat.st_size]
+        self._size = stat.st_size
+        self._handle: Optional[io.BufferedReader] = None
+        self.header: Optional[List[str]] = None
+        if path.suffix == ".csv" and offsets:
+            self.header = next(csv.reader([self._read(offsets, 0).decode("utf-8-sig")]))
+            offsets, checksums = offsets[1:], checksums[1:]
+        self._offsets: array[int] = offsets
+        self._checksums: array[int] = checksums
+        self._repeats: Optional[Dict[int, int]] = None
+
+    def __len__(self) -> int:
+        return len(self._offsets)
+
+    def _read(self, offsets: array, index: int) -> bytes:
+        if self._handle is None:
+            self._handle = self.path.open("rb")
+        start = offsets[index]
+        end = offsets[index + 1] if index + 1 < len(offsets) else self._size
+        self._handle.seek(start)
+        return self._handle.read(end - start)
+
+    def _parse(self, raw: bytes) -> Record:
+        text = raw.decode("utf-8-sig")
+        if self.header is None:
+            record = json.loads(text)
+            if not isinstance(record, dict):
+                raise ValueError(f"{self.path}: record is not a JSON object")
+            return record
+        values = next(csv.reader(io.StringIO(text, newline="")))
+        if len(values) != len(self.header):
+            raise ValueError(
+                f"{self.path}: record has {len(values)} fields, "
+                f"the header has {len(self.header)}"
+            )
+        return dict(zip(self.header, values, strict=True))
+
+    def record(self, index: int) -> Record:
+        return self._parse(self._read(self._offsets, index))
+
+    def __iter__(self) -> Iterator[Record]:
+        """Stream every record in file order, checked like record()."""
+        for index in range(len(self)):
+            yield self.record(index)
+
+    def shard_of(self, index: int, count: int) -> int:
+        """Return the 0-based shard of a record, fixed by its content.
+
+        Inserting or reordering rows does not move other records between
+        shards or xdist groups.
+        """
+        return self._checksums[index] % count
+
+    def key(self, index: int) -> str:
+        """Return a content-derived id for a record, stable across edits.
+
+        The n-th copy of an identical record gets a "-n" suffix, so every
+        record keeps a distinct id.
+        """
+        if self._repeats is None:
+            seen: Dict[int, int] = {}
+            self._repeats = {}
+            for row, checksum in enumerate(self._checksums):
+                seen[checksum] = seen.get(checksum, 0) + 1
+                if seen[checksum] > 1:
+                    self._repeats[row] = seen[checksum]
+        checksum = self._checksums[index]
+        repeat = self._repeats.get(index)
+        return f"{checksum:08x}" if repeat is None else f"{checksum:08x}-{repeat}"
+
+    def select(
+        self,
+        shard: Optional[Tuple[int, int]] = None,
+        limit: Optional[int] = None,
+    ) -> Iterator[int]:
+        """Yield record indexes, keeping only shard (i, n) when given."""
+        taken = 0
+        for index in range(len(self)):
+            if limit is not None and taken >= limit:
+                return
+            if shard is not None and self.shard_of(index, shard[1]) != shard[0] - 1:
+                continue
+            taken += 1
+            yield index
+
+    def close(self) -> None:
+        if self._handle is not None:
+            self._handle.close()
+            self._handle = None
+
+    def __enter__(self) -> Dataset:
+        return self
+
+    def __exit__(self, *exc_info: object) -> None:
+        self.close()
+
+
+_loaded: Dict[str, Dataset] = {}
+
+
+def close_all() -> None:
+    """Close the file handles of every dataset loaded in this process."""
+    for dataset in _loaded.values():
+        dataset.close()
+
+
+def load(path: Path, cache: Optional[pytest.Cache]) -> Dataset:
+    """Return the per-process Dataset for a file, indexing it at most once.
+
+    Indexes live in pytest's cache keyed by the file's SHA-256, which is
+    itself remembered per path by mtime and size, so a warm load of an
+    unchanged file only stats it and reads its offsets.
+    """
+    if path.suffix not in FORMATS:
+        raise pytest.UsageError(
+            f"dataset {path} must be one of {', '.join(FORMATS)} files"
+        )
+    if not path.is_file():
+        raise pytest.UsageError(f"dataset {path} does not exist")
+    key = str(path.resolve())
+    stat = path.stat()
+    stamp = [stat.st_mtime_ns, stat.st_size]
+    dataset = _loaded.get(key)
+    if dataset is not None and dataset.stamp == stamp:
+        return dataset
+
+    digests: Dict[str, Dict[str, Any]] = (
+        cache.get(CACHE_KEY, {}) if cache is not None else {}
+    )
+    entry = digests.get(key)
+    if entry is None or entry["stamp"] != stamp:
+        entry = {"stamp": stamp, "sha256": file_digest(path)}
+        if cache is not None:
+            cache.set(CACHE_KEY, {**digests, key: entry})
+    index_path = (
+        cache.mkdir("datasets") / f"{entry['sha256']}.idx"
+        if cache is not None
+        else None
+    )
+    index = _read_index(index_path) if index_path is not None else None
+    if index is None:
+        index = _scan(path)
+        if index_path is not None:
+            _write_index(index_path, *index)
+    if dataset is not None:
+        dataset.close()
+    dataset = _loaded[key] = Dataset(path, *index)
+    return dataset
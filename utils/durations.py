@@ -0,0 +1,124 @@
+from __future__ import annotations
+
+import heapq
+import statistics
+from typing import Dict, Iterable, List, Optional, Sequence, Tuple
+
+import pytest
+
+CACHE_KEY = "durations/v1"
+DEFAULT_ESTIMATE_S = 1.0
+# Weight of the newest observation; older runs decay geometrically.
+SMOOTHING = 0.5
+
+
+class DurationStore:
+    """Historical per-test wall time (setup + call + teardown) in pytest's cache.
+
+    Durations are smoothed across runs so one slow outlier does not reorder
+    the whole suite. Tests without history are estimated at the median of the
+    known tests.
+    """
+
+    def __init__(self, cache: Optional[pytest.Cache]) -> None:
+        self._cache = cache
+        stored = cache.get(CACHE_KEY, {}) if cache is not None else {}
+        self.durations: Dict[str, float] = {
+            nodeid: float(seconds) for nodeid, seconds in stored.items()
+        }
+        known = sorted(self.durations.values())
+        self.fallback = statistics.median(known) if known else DEFAULT_ESTIMATE_S
+
+    def estimate(self, nodeid: str) -> float:
+        return self.durations.get(nodeid, self.fallback)
+
+    def save(self, observed: Dict[str, float]) -> None:
+        """Fold this session's per-test durations into the stored history."""
+        if self._cache is None or not observed:
+            return
+        merged = dict(self.durations)
+        for nodeid, seconds in observed.items():
+            previous = merged.get(nodeid)
+            if previous is None:
+                merged[nodeid] = round(seconds, 4)
+            else:
+                merged[nodeid] = round(
+                    SMOOTHING * seconds + (1 - SMOOTHING) * previous, 4
+                )
+        self._cache.set(CACHE_KEY, merged)
+
+
+def parse_shard(
+    value: Optional[str], option: str = "--shard"
+) -> Optional[Tuple[int, int]]:
+    """Parse "i/n" (1-based) into (index, count)."""
+    if not value:
+        return None
+    try:
+        index_text, count_text = value.split("/", 1)
+        index, count = int(index_text), int(count_text)
+    except ValueError:
+        raise pytest.UsageError(f"{option} expects i/n, got {value!r}") from None
+    if count < 1 or not 1 <= index <= count:
+        raise pytest.UsageError(f"{option} {value!r} is out of range")
+    return index, count
+
+
+def _unit_key(item: pytest.Item, grouped_fixtures: Iterable[str]) -> str:
+    """Tests sharing a module-scoped fixture move together as one unit."""
+    if isinstance(item, pytest.Function) and set(item.fixturenames) & set(
+        grouped_fixtures
+    ):
+        return item.nodeid.split("::", 1)[0]
+    return item.nodeid
+
+
+def schedule_units(
+    items: Sequence[pytest.Item],
+    store: DurationStore,
+    grouped_fixtures: Iterable[str] = (),
+) -> List[Tuple[float, List[pytest.Item]]]:
+    """Group items into scheduling units, longest estimated duration first."""
+    grouped = tuple(grouped_fixtures)
+    units: Dict[str, List[pytest.Item]] = {}
+    for item in items:
+        units.setdefault(_unit_key(item, grouped), []).append(item)
+    estimated = [
+        (sum(store.estimate(item.nodeid) for item in members), members)
+        for members in units.values()
+    ]
+    # sorted() is stable, so equal estimates keep collection order.
+    return sorted(estimated, key=lambda unit: unit[0], reverse=True)
+
+
+def order_longest_first(
+    items: Sequence[pytest.Item],
+    store: DurationStore,
+    grouped_fixtures: Iterable[str] = (),
+) -> List[pytest.Item]:
+    return [
+        item
+        for _, members in schedule_units(items, store, grouped_fixtures)
+        for item in members
+    ]
+
+
+def split_shards(
+    items: Sequence[pytest.Item],
+    store: DurationStore,
+    count: int,
+    grouped_fixtures: Iterable[str] = (),
+) -> List[List[pytest.Item]]:
+    """Split items into count shards with longest-processing-time-first.
+
+    Every shard computes the same split, so all shards must see the same
+    duration history.
+    """
+    shards: List[List[pytest.Item]] = [[] for _ in range(count)]
+    loads: List[Tuple[float, int]] = [(0.0, index) for index in range(count)]
+    for estimate, members in schedule_units(items, store, grouped_fixtures):
+        load, index = heapq.heappop(loads)
+        shards[index].extend(members)
+        heapq.heappush(loads, (load + estimate, index))
+    return shards
+
@@ -0,0 +1,141 @@
+from __future__ import annotations
+
+from typing import Callable, Dict, List, Optional, Sequence, Tuple
+
+import pytest
+from _pytest.runner import call_and_report
+
+CACHE_KEY = "flaky/v1"
+PASSED = "passed"
+FLAKY = "flaky"
+FAILED = "failed"
+RERUN = "rerun"
+# Runs needed before a flake rate is trusted for quarantine.
+MIN_RUNS = 3
+
+
+class FlakeStore:
+    """Per-test outcomes of flaky-marked tests in pytest's cache.
+
+    A run is one test execution including its retries; it counts as flaky
+    when it passed only after a retry.
+    """
+
+    def __init__(self, cache: Optional[pytest.Cache]) -> None:
+        self._cache = cache
+        stored = cache.get(CACHE_KEY, {}) if cache is not None else {}
+        self.history: Dict[str, Dict[str, int]] = {
+            nodeid: {key: int(count) for key, count in counts.items()}
+            for nodeid, counts in stored.items()
+        }
+
+    def rate(self, nodeid: str) -> float:
+        counts = self.history.get(nodeid)
+        if not counts or not counts.get("runs"):
+            return 0.0
+        return counts.get(FLAKY, 0) / counts["runs"]
+
+    def quarantined(self, nodeid: str, threshold: float) -> bool:
+        counts = self.history.get(nodeid, {})
+        return counts.get("runs", 0) >= MIN_RUNS and self.rate(nodeid) >= threshold
+
+    def save(self, outcomes: Dict[str, str]) -> None:
+        """Add this session's outcome per test to the stored history."""
+        if self._cache is None or not outcomes:
+            return
+        merged = {nodeid: dict(counts) for nodeid, counts in self.history.items()}
+        for nodeid, outcome in outcomes.items():
+            counts = merged.setdefault(nodeid, {"runs": 0, FLAKY: 0, FAILED: 0})
+            counts["runs"] += 1
+            if outcome in (FLAKY, FAILED):
+                counts[outcome] = counts.get(outcome, 0) + 1
+        self._cache.set(CACHE_KEY, merged)
+
+
+def reruns_for(item: pytest.Item, default: int) -> int:
+    """Return how often a flaky-marked test may be retried (0 if unmarked)."""
+    marker = item.get_closest_marker("flaky")
+    if marker is None:
+        return 0
+    return int(marker.kwargs.get("reruns", default))
+
+
+def quarantine_last(
+    items: Sequence[pytest.Item],
+    is_quarantined: Callable[[pytest.Item], bool],
+) -> List[pytest.Item]:
+    """Move quarantined tests to the end, keeping the order within each group."""
+    regular = [item for item in items if not is_quarantined(item)]
+    quarantined = [item for item in items if is_quarantined(item)]
+    return regular + quarantined
+
+
+def _run_attempt(
+    item: pytest.Item,
+    nextitem: Optional[pytest.Item],
+    is_final: Callable[[List[pytest.TestReport]], bool],
+) -> Tuple[List[pytest.TestReport], bool]:
+    """Run setup and call, then tear down according to is_final.
+
+    Like runtestprotocol, except the teardown target is picked after the
+    call: a retried attempt tears down only its function-scoped fixtures,
+    while the final one tears down towards nextitem as usual.
+    """
+    if hasattr(item, "_request") and not item._request:  # type: ignore[attr-defined]
+        item._initrequest()  # type: ignore[attr-defined]
+    try:
+        reports = [call_and_report(item, "setup", log=False)]
+        if reports[0].passed and not item.config.getoption("setuponly", False):
+            reports.append(call_and_report(item, "call", log=False))
+        final = is_final(reports)
+        teardown_next = nextitem if final else item.parent
+        if item.session.shouldfail or item.session.shouldstop:
+            teardown_next = None
+        reports.append(
+            call_and_report(item, "teardown", log=False, nextitem=teardown_next)
+        )
+    finally:
+        if hasattr(item, "_request"):
+            item._request = False  # type: ignore[attr-defined]
+            item.funcargs = None  # type: ignore[attr-defined]
+    return reports, final
+
+
+def run_with_reruns(
+    item: pytest.Item,
+    nextitem: Optional[pytest.Item],
+    reruns: int,
+) -> None:
+    """Run a test, retrying failed attempts in the same worker.
+
+    Each attempt gets fresh function-scoped fixtures (a new context), while
+    session and module fixtures such as the browser or shared_context stay
+    up until the final attempt. item.execution_count is the attempt number,
+    so tracing and video capture can upgrade on retries. Failed attempts
+    before the last are reported with the "rerun" outcome.
+    """
+    ihook = item.ihook
+    ihook.pytest_runtest_logstart(nodeid=item.nodeid, location=item.location)
+    for attempt in range(1, reruns + 2):
+        item.execution_count = attempt  # type: ignore[attr-defined]
+        item.user_properties.clear()
+
+        def is_final(reports: List[pytest.TestReport], attempt: int = attempt) -> bool:
+            stopping = item.session.shouldfail or item.session.shouldstop
+            failed = any(report.failed for report in reports)
+            return not failed or attempt > reruns or bool(stopping)
+
+        reports, final = _run_attempt(item, nextitem, is_final)
+        failed = any(report.failed for report in reports)
+        if final:
+            outcome = FAILED if failed else FLAKY if attempt > 1 else PASSED
+            reports[-1].user_properties.append(
+                ("flaky", {"attempts": attempt, "outcome": outcome})
+            )
+        for report in reports:
+            if not final and report.failed:
+                report.outcome = RERUN  # type: ignore[assignment]
+            ihook.pytest_runtest_logreport(report=report)
+        if final:
+            break
+    ihook.pytest_runtest_logfinish(nodeid=item.nodeid, location=item.location)
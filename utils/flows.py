@@ -0,0 +1,241 @@
+from __future__ import annotations
+
+import time
+from collections import OrderedDict
+from dataclasses import dataclass, field, replace
+from typing import Any, Callable, Dict, Optional, Tuple
+
+from playwright.sync_api import Error as PlaywrightError
+from playwright.sync_api import Page
+from playwright.sync_api import StorageState
+
+from pages.base_page import NAVIGATION_TIMEOUT_MS
+from utils import budget
+
+Path = Tuple[str, ...]
+PageObject = Any
+StepAction = Callable[[PageObject], Optional[PageObject]]
+
+# How long a step may take to land on its lands_on URL before the checkpoint
+# is skipped; the flow itself carries on either way.
+LANDING_TIMEOUT_MS = 10000
+
+
+@dataclass(frozen=True)
+class Step:
+    """One named page-object transition.
+
+    The action gets the current page object and returns the next one (or
+    None to stay). The name must identify the step's effect, arguments
+    included: flows that share a name prefix share its checkpoints.
+    """
+
+    name: str
+    action: StepAction
+    lands_on: Optional[str] = None
+    checkpoint: bool = True
+
+
+@dataclass(frozen=True)
+class Flow:
+    """An immutable chain of steps starting from a page-object class.
+
+    >>> head = Flow(LoginPage).step("open", LoginPage.open)
+    >>> shopping = head.step("login", login, lands_on="inventory.html")
+    """
+
+    start: Callable[[Page], PageObject]
+    steps: Tuple[Step, ...] = ()
+
+    def step(
+        self,
+        name: str,
+        action: StepAction,
+        *,
+        lands_on: Optional[str] = None,
+        checkpoint: bool = True,
+    ) -> Flow:
+        """Return a new flow with one more step.
+
+        Steps that navigate should name the URL they land on so the snapshot
+        waits for it; steps whose state lives outside cookies and
+        localStorage (typed form input) should pass checkpoint=False.
+        """
+        return replace(
+            self, steps=self.steps + (Step(name, action, lands_on, checkpoint),)
+        )
+
+    @property
+    def path(self) -> Path:
+        return (getattr(self.start, "__name__", repr(self.start)),) + tuple(
+            step.name for step in self.steps
+        )
+
+
+@dataclass(frozen=True)
+class Checkpoint:
+    """Context state after a step: storage state, URL and page-object type."""
+
+    state: StorageState
+    url: str
+    page_type: Callable[[Page], PageObject]
+    created: float
+
+
+@dataclass
+class _Node:
+    children: Dict[str, _Node] = field(default_factory=dict)
+    checkpoint: Optional[Checkpoint] = None
+
+
+class CheckpointTree:
+    """Per-worker prefix tree of checkpoints with LRU eviction.
+
+    A path is the flow's start class followed by its step names, so flows
+    sharing a head share the checkpoints along it.
+    """
+
+    def __init__(self, max_entries: int, ttl_seconds: float) -> None:
+        self.max_entries = max_entries
+        self.ttl_seconds = ttl_seconds
+        self.stats = {"stored": 0, "evicted": 0, "expired": 0}
+        self._root = _Node()
+        self._lru: OrderedDict[Path, None] = OrderedDict()
+
+    def __len__(self) -> int:
+        return len(self._lru)
+
+    def __contains__(self, path: Path) -> bool:
+        return path in self._lru
+
+    def deepest(self, path: Path) -> Tuple[int, Optional[Checkpoint]]:
+        """Return (steps covered, checkpoint) for the longest stored prefix."""
+        now = time.time()
+        node = self._root
+        found: Tuple[int, Optional[Checkpoint]] = (0, None)
+        for depth, name in enumerate(path):
+            child = node.children.get(name)
+            if child is None:
+                break
+            node = child
+            checkpoint = node.checkpoint
+            if checkpoint is None:
+                continue
+            if now - checkpoint.created >= self.ttl_seconds:
+                self.stats["expired"] += 1
+                self.discard(path[: depth + 1])
+                break
+            found = (depth, checkpoint)
+        steps, checkpoint = found
+        if checkpoint is not None:
+            self._lru.move_to_end(path[: steps + 1])
+        return found
+
+    def put(self, path: Path, checkpoint: Checkpoint) -> None:
+        if self.max_entries <= 0:
+            return
+        node = self._root
+        for name in path:
+            node = node.children.setdefault(name, _Node())
+        node.checkpoint = checkpoint
+        self._lru[path] = None
+        self._lru.move_to_end(path)
+        self.stats["stored"] += 1
+        while len(self._lru) > self.max_entries:
+            oldest = next(iter(self._lru))
+            self.discard(oldest)
+            self.stats["evicted"] += 1
+
+    def discard(self, path: Path) -> None:
+        """Drop the checkpoint at path and prune nodes left empty."""
+        self._lru.pop(path, None)
+        trail = [self._root]
+        for name in path:
+            child = trail[-1].children.get(name)
+            if child is None:
+                return
+            trail.append(child)
+        trail[-1].checkpoint = None
+        for name, parent, node in zip(
+            reversed(path), reversed(trail[:-1]), reversed(trail[1:]), strict=True
+        ):
+            if node.children or node.checkpoint is not None:
+                break
+            del parent.children[name]
+
+
+class FlowRunner:
+    """Runs flows, resuming from the deepest checkpoint a previous test left.
+
+    open_page returns a page in a context created with the given storage
+    state (None for a clean context).
+    """
+
+    def __init__(
+        self,
+        open_page: Callable[[Optional[StorageState]], Page],
+        tree: Optional[CheckpointTree],
+    ) -> None:
+        self._open_page = open_page
+        self._tree = tree
+        self.runs = 0
+        self.resumed_steps = 0
+        self.steps_run = 0
+
+    def _resume(self, flow: Flow) -> Tuple[int, Page, Optional[Checkpoint]]:
+        if self._tree is None:
+            return 0, self._open_page(None), None
+        path = flow.path
+        steps, checkpoint = self._tree.deepest(path)
+        if checkpoint is None:
+            return 0, self._open_page(None), None
+        page = self._open_page(checkpoint.state)
+        page.goto(
+            checkpoint.url,
+            wait_until="domcontentloaded",
+            timeout=budget.clamp(NAVIGATION_TIMEOUT_MS, "resume checkpoint"),
+        )
+        if page.url == checkpoint.url:
+            return steps, page, checkpoint
+        # Redirected (e.g. the session ended server-side): start over.
+        self._tree.discard(path[: steps + 1])
+        page.context.clear_cookies()
+        page.evaluate("() => localStorage.clear()")
+        return 0, page, None
+
+    def run(self, flow: Flow) -> PageObject:
+        """Run the flow and return the last page object."""
+        self.runs += 1
+        steps, page, checkpoint = self._resume(flow)
+        current = checkpoint.page_type(page) if checkpoint else flow.start(page)
+        self.resumed_steps += steps
+        path = flow.path
+        for index in range(steps, len(flow.steps)):
+            step = flow.steps[index]
+            previous = current
+            result = step.action(current)
+            if result is not None:
+                current = result
+            self.steps_run += 1
+            prefix = path[: index + 2]
+            if self._tree is None or not step.checkpoint or prefix in self._tree:
+                continue
+            if step.lands_on is None:
+                # A transition without a landing URL may still be navigating.
+                if type(current) is not type(previous):
+                    continue
+            else:
+                try:
+                    page.wait_for_url(
+                        f"**/{step.lands_on}",
+                        timeout=budget.clamp(LANDING_TIMEOUT_MS),
+                    )
+                except PlaywrightError:
+                    continue
+            self._tree.put(
+                prefix,
+                Checkpoint(
+                    page.context.storage_state(), page.url, type(current), time.time()
+                ),
+            )
+        return current
@@ -0,0 +1,426 @@
+from __future__ import annotations
+
+import argparse
+import math
+import os
+import sqlite3
+import subprocess
+import time
+from contextlib import closing
+from pathlib import Path
+from typing import Any, Dict, Iterable, List, NamedTuple, Optional, Sequence, Tuple
+
+from config.settings import get_settings
+
+OUTCOMES = ("passed", "failed", "skipped", "flaky")
+_FLAKY = OUTCOMES.index("flaky")
+_SKIPPED = OUTCOMES.index("skipped")
+_FAILED = OUTCOMES.index("failed")
+# Recent flaky runs needed before a flake-rate increase is reported; with few
+# runs a single flake already looks significant.
+MIN_FLAKES = 2
+# Parameters per statement stay below SQLite's default limit.
+_CHUNK = 500
+
+# Rows are clustered by run, so a window of runs is a handful of range scans
+# however long the history grows. Test and step names are stored once.
+SCHEMA = """
+CREATE TABLE IF NOT EXISTS runs (
+    id INTEGER PRIMARY KEY,
+    started REAL NOT NULL,
+    env TEXT NOT NULL,
+    browser TEXT NOT NULL,
+    commit_sha TEXT
+);
+CREATE INDEX IF NOT EXISTS runs_by_target ON runs (env, browser, id);
+CREATE TABLE IF NOT EXISTS names (
+    id INTEGER PRIMARY KEY,
+    name TEXT NOT NULL UNIQUE
+);
+CREATE TABLE IF NOT EXISTS results (
+    run_id INTEGER NOT NULL,
+    test_id INTEGER NOT NULL,
+    outcome INTEGER NOT NULL,
+    attempts INTEGER NOT NULL,
+    duration_ms REAL NOT NULL,
+    PRIMARY KEY (run_id, test_id)
+) WITHOUT ROWID;
+CREATE TABLE IF NOT EXISTS steps (
+    run_id INTEGER NOT NULL,
+    test_id INTEGER NOT NULL,
+    step_id INTEGER NOT NULL,
+    duration_ms REAL NOT NULL,
+    PRIMARY KEY (run_id, test_id, step_id)
+) WITHOUT ROWID;
+"""
+
+
+class TestRecord(NamedTuple):
+    """One test of a session: outcome, attempts, wall time and step times."""
+
+    nodeid: str
+    outcome: str
+    attempts: int
+    duration_ms: float
+    steps: Dict[str, float]
+
+
+class Sample(NamedTuple):
+    n: int
+    mean: float
+    variance: float
+
+
+class Finding(NamedTuple):
+    """A step, test or flake rate that got significantly worse."""
+
+    kind: str
+    name: str
+    baseline: float
+    recent: float
+    p_value: float
+
+    @property
+    def change(self) -> float:
+        if self.kind == "flake":
+            return self.recent - self.baseline
+        return self.recent / self.baseline - 1 if self.baseline else math.inf
+
+
+def step_durations(breakdown: Iterable[Dict[str, Any]]) -> Dict[str, float]:
+    """Key a timing breakdown by "Page.name [phase]" with total milliseconds."""
+    steps: Dict[str, float] = {}
+    for row in breakdown:
+        label = f"{row['page']}.{row['name'] or row['selector']} [{row['phase']}]"
+        steps[label] = round(steps.get(label, 0.0) + row["total_ms"], 3)
+    return steps
+
+
+def current_commit() -> Optional[str]:
+    """Return the commit under test from CI or the local checkout."""
+    sha = os.getenv("GITHUB_SHA")
+    if sha:
+        return sha
+    try:
+        result = subprocess.run(
+            ["git", "rev-parse", "HEAD"],
+            capture_output=True,
+            text=True,
+            timeout=5,
+            check=True,
+        )
+    except (OSError, subprocess.SubprocessError):
+        return None
+    return result.stdout.strip() or None
+
+
+def connect(path: Path) -> sqlite3.Connection:
+    path.parent.mkdir(parents=True, exist_ok=True)
+    conn = sqlite3.connect(path, timeout=30)
+    conn.execute("PRAGMA journal_mode=WAL")
+    conn.execute("PRAGMA synchronous=NORMAL")
+    conn.executescript(SCHEMA)
+    return conn
+
+
+def _intern(conn: sqlite3.Connection, names: Sequence[str]) -> Dict[str, int]:
+    conn.executemany(
+        "INSERT OR IGNORE INTO names (name) VALUES (?)", ((name,) for name in names)
+    )
+    ids: Dict[str, int] = {}
+    for start in range(0, len(names), _CHUNK):
+        chunk = names[start : start + _CHUNK]
+        placeholders = ",".join("?" * len(chunk))
+        ids.update(
+            conn.execute(
+                f"SELECT name, id FROM names WHERE name IN ({placeholders})", chunk
+            ).fetchall()
+        )
+    return ids
+
+
+def record(
+    path: Path,
+    env_name: str,
+    browser: str,
+    commit: Optional[str],
+    tests: Sequence[TestRecord],
+) -> int:
+    """Append one session to the history in a single transaction."""
+    with closing(connect(path)) as conn, conn:
+        run_id = conn.execute(
+            "INSERT INTO runs (started, env, browser, commit_sha) VALUES (?, ?, ?, ?)",
+            (time.time(), env_name, browser, commit),
+        ).lastrowid
+        assert run_id is not None
+        names = sorted(
+            {test.nodeid for test in tests}
+            | {step for test in tests for step in test.steps}
+        )
+        ids = _intern(conn, names)
+        conn.executemany(
+            "INSERT INTO results VALUES (?, ?, ?, ?, ?)",
+            (
+                (
+                    run_id,
+                    ids[test.nodeid],
+                    OUTCOMES.index(test.outcome),
+                    test.attempts,
+                    round(test.duration_ms, 3),
+                )
+                for test in tests
+            ),
+        )
+        conn.executemany(
+            "INSERT INTO steps VALUES (?, ?, ?, ?)",
+            (
+                (run_id, ids[test.nodeid], ids[step], duration_ms)
+                for test in tests
+                for step, duration_ms in test.steps.items()
+            ),
+        )
+    return int(run_id)
+
+
+def _betacf(a: float, b: float, x: float) -> float:
+    """Continued fraction of the incomplete beta function (modified Lentz)."""
+    tiny = 1e-300
+    c, d = 1.0, 1.0 - (a + b) * x / (a + 1)
+    d = 1 / (d if abs(d) > tiny else tiny)
+    h = d
+    for m in range(1, 300):
+        for numerator in (
+            m * (b - m) * x / ((a + 2 * m - 1) * (a + 2 * m)),
+            -(a + m) * (a + b + m) * x / ((a + 2 * m) * (a + 2 * m + 1)),
+        ):
+            d = 1 + numerator * d
+            d = 1 / (d if abs(d) > tiny else tiny)
+            c = 1 + numerator / c
+            c = c if abs(c) > tiny else tiny
+            h *= d * c
+        if abs(d * c - 1) < 1e-12:
+            break
+    return h
+
+
+def _betainc(a: float, b: float, x: float) -> float:
+    """Regularized incomplete beta function I_x(a, b)."""
+    if x <= 0:
+        return 0.0
+    if x >= 1:
+        return 1.0
+    front = math.exp(
+        math.lgamma(a + b)
+        - math.lgamma(a)
+        - math.lgamma(b)
+        + a * math.log(x)
+        + b * math.log1p(-x)
+    )
+    if x < (a + 1) / (a + b + 2):
+        return front * _betacf(a, b, x) / a
+    return 1 - front * _betacf(b, a, 1 - x) / b
+
+
+def t_sf(t: float, df: float) -> float:
+    """P(T > t) for Student's t distribution with df degrees of freedom."""
+    tail = 0.5 * _betainc(df / 2, 0.5, df / (df + t * t))
+    return tail if t >= 0 else 1 - tail
+
+
+def welch_p(baseline: Sample, recent: Sample) -> float:
+    """One-sided Welch t-test p-value that the recent mean is higher."""
+    a, b = baseline.variance / baseline.n, recent.variance / recent.n
+    if a + b <= 0:
+        return 0.0 if recent.mean > baseline.mean else 1.0
+    t = (recent.mean - baseline.mean) / math.sqrt(a + b)
+    df = (a + b) ** 2 / (a * a / (baseline.n - 1) + b * b / (recent.n - 1))
+    return t_sf(t, df)
+
+
+def proportion_p(baseline: Tuple[int, int], recent: Tuple[int, int]) -> float:
+    """One-sided two-proportion z-test p-value that the recent rate is higher."""
+    (hits_a, n_a), (hits_b, n_b) = baseline, recent
+    pooled = (hits_a + hits_b) / (n_a + n_b)
+    if pooled in (0.0, 1.0):
+        return 1.0
+    z = (hits_b / n_b - hits_a / n_a) / math.sqrt(
+        pooled * (1 - pooled) * (1 / n_a + 1 / n_b)
+    )
+    return 0.5 * math.erfc(z / math.sqrt(2))
+
+
+def _select_window(
+    conn: sqlite3.Connection,
+    env_name: str,
+    browser: str,
+    recent: int,
+    baseline: int,
+) -> Tuple[int, int]:
+    """Fill the temp table run_window with the latest runs; return the counts."""
+    run_ids = [
+        row[0]
+        for row in conn.execute(
+            "SELECT id FROM runs WHERE env = ? AND browser = ? "
+            "ORDER BY id DESC LIMIT ?",
+            (env_name, browser, recent + baseline),
+        )
+    ]
+    conn.execute(
+        "CREATE TEMP TABLE IF NOT EXISTS run_window "
+        "(run_id INTEGER PRIMARY KEY, recent INTEGER NOT NULL)"
+    )
+    conn.execute("DELETE FROM run_window")
+    conn.executemany(
+        "INSERT INTO run_window VALUES (?, ?)",
+        ((run_id, index < recent) for index, run_id in enumerate(run_ids)),
+    )
+    recent_runs = min(len(run_ids), recent)
+    return recent_runs, len(run_ids) - recent_runs
+
+
+def _moments(
+    rows: Iterable[Tuple[str, int, int, float, float]]
+) -> Dict[str, Dict[int, Sample]]:
+    samples: Dict[str, Dict[int, Sample]] = {}
+    for name, recent, n, mean, mean_square in rows:
+        variance = max(mean_square - mean * mean, 0.0) * n / (n - 1) if n > 1 else 0.0
+        samples.setdefault(name, {})[recent] = Sample(n, mean, variance)
+    return samples
+
+
+def regressions(
+    conn: sqlite3.Connection,
+    *,
+    alpha: float = 0.01,
+    min_slowdown: float = 0.1,
+    min_samples: int = 5,
+) -> List[Finding]:
+    """Compare the recent and baseline runs in the run_window table."""
+    findings = []
+    step_rows = conn.execute(
+        "SELECT n.name, w.recent, COUNT(*), AVG(s.duration_ms), "
+        "AVG(s.duration_ms * s.duration_ms) "
+        "FROM run_window AS w JOIN steps AS s ON s.run_id = w.run_id "
+        "JOIN results AS r ON r.run_id = s.run_id AND r.test_id = s.test_id "
+        "JOIN names AS n ON n.id = s.step_id "
+        f"WHERE r.outcome NOT IN ({_SKIPPED}, {_FAILED}) "
+        "GROUP BY s.step_id, w.recent"
+    )
+    test_rows = conn.execute(
+        "SELECT n.name, w.recent, COUNT(*), AVG(r.duration_ms), "
+        "AVG(r.duration_ms * r.duration_ms) "
+        "FROM run_window AS w JOIN results AS r ON r.run_id = w.run_id "
+        "JOIN names AS n ON n.id = r.test_id "
+        f"WHERE r.outcome NOT IN ({_SKIPPED}, {_FAILED}) "
+        "GROUP BY r.test_id, w.recent"
+    )
+    for kind, rows in (("step", step_rows), ("test", test_rows)):
+        for name, samples in _moments(rows).items():
+            baseline, recent = samples.get(0), samples.get(1)
+            if baseline is None or recent is None:
+                continue
+            if min(baseline.n, recent.n) < max(min_samples, 2):
+                continue
+            if recent.mean < baseline.mean * (1 + min_slowdown):
+                continue
+            p_value = welch_p(baseline, recent)
+            if p_value < alpha:
+                findings.append(
+                    Finding(kind, name, baseline.mean, recent.mean, p_value)
+                )
+
+    flakes: Dict[str, Dict[int, Tuple[int, int]]] = {}
+    for name, recent, n, flaky in conn.execute(
+        "SELECT n.name, w.recent, COUNT(*), SUM(r.outcome = ?) "
+        "FROM run_window AS w JOIN results AS r ON r.run_id = w.run_id "
+        "JOIN names AS n ON n.id = r.test_id "
+        "WHERE r.outcome != ? GROUP BY r.test_id, w.recent",
+        (_FLAKY, _SKIPPED),
+    ):
+        flakes.setdefault(name, {})[recent] = (flaky, n)
+    for name, counts in flakes.items():
+        baseline_counts, recent_counts = counts.get(0), counts.get(1)
+        if baseline_counts is None or recent_counts is None:
+            continue
+        if min(baseline_counts[1], recent_counts[1]) < min_samples:
+            continue
+        if recent_counts[0] < MIN_FLAKES:
+            continue
+        p_value = proportion_p(baseline_counts, recent_counts)
+        if p_value < alpha:
+            findings.append(
+                Finding(
+                    "flake",
+                    name,
+                    baseline_counts[0] / baseline_counts[1],
+                    recent_counts[0] / recent_counts[1],
+                    p_value,
+                )
+            )
+    return sorted(findings, key=lambda finding: finding.p_value)
+
+
+def format_findings(findings: Sequence[Finding]) -> List[str]:
+    lines = [
+        f"{'kind':<6} {'baseline':>10} {'recent':>10} {'change':>8} {'p':>8}  name"
+    ]
+    for finding in findings:
+        if finding.kind == "flake":
+            values = f"{finding.baseline:>10.1%} {finding.recent:>10.1%}"
+            change = f"{finding.change * 100:>+7.1f}pp"
+        else:
+            values = f"{finding.baseline:>8.1f}ms {finding.recent:>8.1f}ms"
+            change = f"{finding.change:>+8.0%}"
+        lines.append(
+            f"{finding.kind:<6} {values} {change} {finding.p_value:>8.1e}  "
+            f"{finding.name}"
+        )
+    return lines
+
+
+def main(argv: Optional[List[str]] = None) -> int:
+    """Flag steps, tests and flake rates that regressed in the latest runs."""
+    settings = get_settings()
+    parser = argparse.ArgumentParser(description=main.__doc__)
+    parser.add_argument("--db", type=Path, default=Path(settings.history_db))
+    parser.add_argument("--env", default=settings.env_name)
+    parser.add_argument("--browser", default=settings.browser)
+    parser.add_argument("--recent", type=int, default=5, help="runs under test")
+    parser.add_argument(
+        "--baseline", type=int, default=30, help="runs before them to compare with"
+    )
+    parser.add_argument("--alpha", type=float, default=0.01)
+    parser.add_argument(
+        "--min-slowdown",
+        type=float,
+        default=0.1,
+        help="ignore slowdowns below this fraction of the baseline mean",
+    )
+    parser.add_argument("--min-samples", type=int, default=5)
+    args = parser.parse_args(argv)
+    if not args.db.exists():
+        parser.error(f"no run history at {args.db}")
+
+    with closing(connect(args.db)) as conn:
+        recent_runs, baseline_runs = _select_window(
+            conn, args.env, args.browser, args.recent, args.baseline
+        )
+        findings = regressions(
+            conn,
+            alpha=args.alpha,
+            min_slowdown=args.min_slowdown,
+            min_samples=args.min_samples,
+        )
+    print(
+        f"{args.env}/{args.browser}: {recent_runs} recent run(s) against "
+        f"{baseline_runs} baseline run(s)"
+    )
+    if not findings:
+        print("No significant regressions.")
+        return 0
+    print("\n".join(format_findings(findings)))
+    return 1
+
+
+if __name__ == "__main__":
+    raise SystemExit(main())
@@ -0,0 +1,373 @@
+from __future__ import annotations
+
+import ast
+import os
+import re
+import subprocess
+from contextvars import ContextVar
+from contextvars import Token
+from pathlib import Path
+from typing import Dict, Iterable, List, Optional, Set, Tuple
+
+import pytest
+
+GRAPH_KEY = "impact/graph/v1"
+COVERAGE_KEY = "impact/coverage/v1"
+# Changes under these never affect a test run.
+IGNORED_SUFFIXES = (".md",)
+IGNORED_DIRS = (".github/",)
+# Page objects are selected by import and runtime coverage even when conftest
+# imports them, so a page change does not run the whole suite.
+PAGE_DIRS = ("pages/",)
+_SKIPPED_DIRS = {"__pycache__", "artifacts", "allure-results", "allure-report"}
+_HUNK = re.compile(r"^@@ -\d+(?:,\d+)? \+(\d+)(?:,(\d+))? @@")
+
+# Changed line numbers per file; None when the whole file counts as changed.
+Changes = Dict[str, Optional[Set[int]]]
+
+
+class PageCoverage:
+    """Page-object modules and mapped selectors one test used at runtime."""
+
+    def __init__(self) -> None:
+        self.modules: Set[str] = set()
+        self.selectors: Set[str] = set()
+
+    def to_dict(self) -> Dict[str, List[str]]:
+        return {"modules": sorted(self.modules), "selectors": sorted(self.selectors)}
+
+
+_current: ContextVar[Optional[PageCoverage]] = ContextVar(
+    "page_coverage", default=None
+)
+
+
+def activate(coverage: PageCoverage) -> Token[Optional[PageCoverage]]:
+    """Make a coverage recorder current for the running test."""
+    return _current.set(coverage)
+
+
+def deactivate(token: Token[Optional[PageCoverage]]) -> None:
+    """Restore the recorder that was current before activate()."""
+    _current.reset(token)
+
+
+def record_page(page_class: type) -> None:
+    """Record the modules defining a page class and its bases."""
+    coverage = _current.get()
+    if coverage is None:
+        return
+    for klass in page_class.__mro__[:-1]:
+        coverage.modules.add(klass.__module__)
+
+
+def record_selector(page_class: type, name: str) -> None:
+    """Record a mapped selector as "module:Class.name" of the declaring class."""
+    coverage = _current.get()
+    if coverage is None:
+        return
+    for klass in page_class.__mro__:
+        if name in klass.__dict__.get("SELECTORS", {}):
+            coverage.selectors.add(f"{klass.__module__}:{klass.__name__}.{name}")
+            return
+
+
+class CoverageStore:
+    """Per-test runtime page coverage from earlier runs, in pytest's cache."""
+
+    def __init__(self, cache: Optional[pytest.Cache]) -> None:
+        self._cache = cache
+        stored = cache.get(COVERAGE_KEY, {}) if cache is not None else {}
+        self.tests: Dict[str, Dict[str, List[str]]] = dict(stored)
+
+    def save(self, observed: Dict[str, Dict[str, List[str]]]) -> None:
+        if self._cache is None or not observed:
+            return
+        self._cache.set(COVERAGE_KEY, {**self.tests, **observed})
+
+
+def module_path(module: str) -> str:
+    return module.replace(".", "/") + ".py"
+
+
+def _imported_modules(source: str, rel: str) -> List[str]:
+    """Dotted names a file imports, including "package.name" candidates."""
+    package = rel[: -len(".py")].replace("/", ".").rsplit(".", 1)[0]
+    names: Set[str] = set()
+    for node in ast.walk(ast.parse(source)):
+        if isinstance(node, ast.Import):
+            names.update(alias.name for alias in node.names)
+        elif isinstance(node, ast.ImportFrom):
+            base = node.module or ""
+            if node.level:
+                parts = package.split(".")
+                parts = parts[: len(parts) - node.level + 1]
+                base = ".".join(part for part in parts + [base] if part)
+            names.add(base)
+            names.update(f"{base}.{alias.name}" for alias in node.names)
+    return sorted(name for name in names if name)
+
+
+def _python_files(root: Path) -> Iterable[Path]:
+    for directory, subdirs, files in os.walk(root):
+        subdirs[:] = [
+            name
+            for name in subdirs
+            if not name.startswith(".")
+            and name not in _SKIPPED_DIRS
+            and not name.endswith("venv")
+        ]
+        for name in files:
+            if name.endswith(".py"):
+                yield Path(directory) / name
+
+
+class ImportGraph:
+    """Import graph of the project's Python files.
+
+    Parsed imports are cached per file by mtime and size, so a warm build
+    only stats the tree.
+    """
+
+    def __init__(self, root: Path, cache: Optional[pytest.Cache]) -> None:
+        self._cache = cache
+        stored = cache.get(GRAPH_KEY, {}) if cache is not None else {}
+        self._entries: Dict[str, Dict[str, list]] = {}
+        self.parsed = 0
+        for path in _python_files(root):
+            rel = path.relative_to(root).as_posix()
+            stat = path.stat()
+            stamp = [stat.st_mtime_ns, stat.st_size]
+            entry = stored.get(rel)
+            if entry is None or entry["stamp"] != stamp:
+                try:
+                    source = path.read_text(encoding="utf-8-sig")
+                    imports = _imported_modules(source, rel)
+                except (SyntaxError, UnicodeDecodeError):
+                    imports = []
+                entry = {"stamp": stamp, "imports": imports}
+                self.parsed += 1
+            self._entries[rel] = entry
+        self._dirty = self.parsed > 0 or len(self._entries) != len(stored)
+        self.edges: Dict[str, Set[str]] = {
+            rel: {
+                target
+                for module in entry["imports"]
+                for target in (
+                    module_path(module),
+                    module.replace(".", "/") + "/__init__.py",
+                )
+                if target in self._entries and target != rel
+            }
+            for rel, entry in self._entries.items()
+        }
+        self._closures: Dict[str, Set[str]] = {}
+
+    def __contains__(self, rel: str) -> bool:
+        return rel in self.edges
+
+    def save(self) -> None:
+        if self._cache is not None and self._dirty:
+            self._cache.set(GRAPH_KEY, self._entries)
+            self._dirty = False
+
+    def closure(self, rel: str) -> Set[str]:
+        """Return the file and every project file it imports, transitively."""
+        cached = self._closures.get(rel)
+        if cached is not None:
+            return cached
+        seen = {rel}
+        stack = [rel]
+        while stack:
+            for target in self.edges.get(stack.pop(), ()):
+                if target not in seen:
+                    seen.add(target)
+                    stack.append(target)
+        self._closures[rel] = seen
+        return seen
+
+
+def _git(root: Path, *args: str) -> str:
+    try:
+        result = subprocess.run(
+            ["git", *args],
+            cwd=root,
+            capture_output=True,
+            text=True,
+            check=True,
+        )
+    except (OSError, subprocess.CalledProcessError) as exc:
+        detail = (getattr(exc, "stderr", None) or "").strip()
+        raise pytest.UsageError(
+            f"git {' '.join(args)} failed" + (f": {detail}" if detail else "")
+        ) from None
+    return result.stdout
+
+
+def parse_diff(diff: str) -> Changes:
+    """Collect changed line numbers per file from a -U0 unified diff."""
+    changes: Changes = {}
+    old: Optional[str] = None
+    current: Optional[str] = None
+    in_header = False
+    for line in diff.splitlines():
+        if line.startswith("diff --git "):
+            in_header, old, current = True, None, None
+        elif in_header and line.startswith("--- "):
+            old = line[6:] if line.startswith("--- a/") else None
+        elif in_header and line.startswith("+++ "):
+            if line.startswith("+++ b/"):
+                current = line[6:]
+                changes.setdefault(current, set())
+            elif old is not None:
+                changes[old] = None  # deleted
+        elif in_header and line.startswith("Binary files"):
+            match = re.search(r" b/(.+) differ$", line)
+            if match:
+                changes[match.group(1)] = None
+        elif current is not None:
+            match = _HUNK.match(line)
+            if match is None:
+                continue
+            in_header = False
+            lines = changes[current]
+            if lines is None:
+                continue
+            start = int(match.group(1))
+            count = 1 if match.group(2) is None else int(match.group(2))
+            # A pure deletion reports the line before it.
+            lines.update(range(start, start + count) if count else (start, start + 1))
+    return changes
+
+
+def changed_since(root: Path, ref: str) -> Changes:
+    """Files changed between ref and the working tree, new modules included."""
+    try:
+        _git(root, "rev-parse", "--verify", "--quiet", f"{ref}^{{commit}}")
+    except pytest.UsageError:
+        raise pytest.UsageError(f"--impacted-since: unknown git ref {ref}") from None
+    changes = parse_diff(_git(root, "diff", "-U0", "--no-color", "--no-renames", ref))
+    # New modules and tests count; other untracked files are usually outputs.
+    for rel in _git(root, "ls-files", "--others", "--exclude-standard").splitlines():
+        if rel.endswith(".py"):
+            changes[rel] = None
+    return {
+        rel: lines
+        for rel, lines in changes.items()
+        if rel.split("/", 1)[0] not in _SKIPPED_DIRS
+    }
+
+
+def selector_entries(source: str) -> Dict[str, Tuple[int, int]]:
+    """Map "Class.name" to the lines of its entry in the class SELECTORS dict."""
+    entries: Dict[str, Tuple[int, int]] = {}
+    for node in ast.walk(ast.parse(source)):
+        if not isinstance(node, ast.ClassDef):
+            continue
+        for statement in node.body:
+            if isinstance(statement, ast.Assign):
+                targets = statement.targets
+            elif isinstance(statement, ast.AnnAssign):
+                targets = [statement.target]
+            else:
+                continue
+            if not any(
+                isinstance(target, ast.Name) and target.id == "SELECTORS"
+                for target in targets
+            ) or not isinstance(statement.value, ast.Dict):
+                continue
+            for key, value in zip(
+                statement.value.keys, statement.value.values, strict=True
+            ):
+                if isinstance(key, ast.Constant) and isinstance(key.value, str):
+                    end = value.end_lineno or value.lineno
+                    entries[f"{node.name}.{key.value}"] = (key.lineno, end)
+    return entries
+
+
+def changed_selectors(root: Path, rel: str, lines: Set[int]) -> Optional[Set[str]]:
+    """Selectors a change is confined to, or None if it touches other code."""
+    path = root / rel
+    try:
+        entries = selector_entries(path.read_text(encoding="utf-8-sig"))
+    except (OSError, SyntaxError, UnicodeDecodeError):
+        return None
+    module = rel[: -len(".py")].replace("/", ".")
+    touched = set()
+    for line in lines:
+        owner = next(
+            (name for name, (start, end) in entries.items() if start <= line <= end),
+            None,
+        )
+        if owner is None:
+            return None
+        touched.add(f"{module}:{owner}")
+    return touched
+
+
+def _infrastructure(graph: ImportGraph) -> Set[str]:
+    """Conftest files and what they import, not following into page objects."""
+    seen = {
+        rel
+        for rel in graph.edges
+        if rel == "conftest.py" or rel.endswith("/conftest.py")
+    }
+    stack = list(seen)
+    while stack:
+        for target in graph.edges[stack.pop()]:
+            if target not in seen and not target.startswith(PAGE_DIRS):
+                seen.add(target)
+                stack.append(target)
+    return seen
+
+
+class ImpactSelector:
+    """Decide which tests a set of changed files can affect.
+
+    Changes to non-Python files, conftest.py or anything it imports outside
+    the page objects run the whole suite. Any other Python change selects
+    tests that import the file (transitively) or used one of its page classes
+    at runtime. A change made only inside SELECTORS entries selects just the
+    tests that used those selectors. Tests with no recorded coverage always
+    run.
+    """
+
+    def __init__(
+        self,
+        root: Path,
+        graph: ImportGraph,
+        coverage: CoverageStore,
+        changes: Changes,
+    ) -> None:
+        self.graph = graph
+        self.coverage = coverage
+        self.global_change: Optional[str] = None
+        self.modules: Set[str] = set()
+        self.selectors: Set[str] = set()
+        infrastructure = _infrastructure(graph)
+        for rel, lines in sorted(changes.items()):
+            if rel.endswith(IGNORED_SUFFIXES) or rel.startswith(IGNORED_DIRS):
+                continue
+            if not rel.endswith(".py") or rel in infrastructure:
+                self.global_change = rel
+                break
+            selectors = (
+                changed_selectors(root, rel, lines)
+                if lines and rel in graph
+                else None
+            )
+            if selectors is None:
+                self.modules.add(rel)
+            else:
+                self.selectors |= selectors
+
+    def affects(self, test_file: str, nodeid: str) -> bool:
+        if self.global_change is not None:
+            return True
+        used = self.coverage.tests.get(nodeid)
+        if used is None:
+            return True
+        runtime_modules = {module_path(module) for module in used["modules"]}
+        if self.modules & (self.graph.closure(test_file) | runtime_modules):
+            return True
+        return bool(self.selectors.intersection(used["selectors"]))
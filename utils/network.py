@@ -0,0 +1,190 @@
+from __future__ import annotations
+
+import json
+from pathlib import Path
+from typing import Any, Dict, List, Optional, Tuple
+
+from playwright.sync_api import BrowserContext
+from playwright.sync_api import Request
+from playwright.sync_api import Route
+
+from config.settings import Settings
+
+# Globs are matched by the driver, so only requests that look like a blocked
+# resource type are routed through Python; everything else is never paused.
+RESOURCE_TYPE_GLOBS: Dict[str, str] = {
+    "image": "**/*.{png,jpg,jpeg,gif,svg,webp,avif,ico,bmp}",
+    "font": "**/*.{woff,woff2,ttf,otf,eot}",
+    "media": "**/*.{mp4,webm,ogg,mp3,wav,m4a}",
+    "stylesheet": "**/*.css",
+    "script": "**/*.{js,mjs}",
+}
+
+STUB_CONTENT_TYPES: Dict[str, str] = {
+    "image": "image/gif",
+    "font": "font/woff2",
+    "media": "video/mp4",
+    "stylesheet": "text/css",
+    "script": "application/javascript",
+}
+
+_HAR_INDEX_CACHE: Dict[Tuple[str, int], Dict[str, int]] = {}
+
+
+def _har_index(path: Path) -> Dict[str, int]:
+    """Return url -> body size for a HAR file, parsed once per file version."""
+    try:
+        mtime_ns = path.stat().st_mtime_ns
+    except OSError:
+        return {}
+    key = (str(path), mtime_ns)
+    index = _HAR_INDEX_CACHE.get(key)
+    if index is None:
+        data = json.loads(path.read_text(encoding="utf-8"))
+        index = {}
+        for entry in data.get("log", {}).get("entries", []):
+            content = entry.get("response", {}).get("content", {})
+            index[entry["request"]["url"]] = max(int(content.get("size", 0)), 0)
+        _HAR_INDEX_CACHE[key] = index
+    return index
+
+
+class RoutingStats:
+    """Requests and bytes kept off the network for one context."""
+
+    def __init__(self) -> None:
+        self.blocked_requests = 0
+        self.blocked_bytes = 0
+        self.blocked_unknown_size = 0
+        self.replayed_requests = 0
+        self.replayed_bytes = 0
+
+    def as_dict(self) -> Dict[str, int]:
+        return {
+            "blocked_requests": self.blocked_requests,
+            "blocked_bytes": self.blocked_bytes,
+            "blocked_unknown_size": self.blocked_unknown_size,
+            "replayed_requests": self.replayed_requests,
+            "replayed_bytes": self.replayed_bytes,
+        }
+
+
+class NetworkRouter:
+    """Installs blocking, stubbing and HAR record/replay routes on contexts."""
+
+    def __init__(self, settings: Settings) -> None:
+        unsupported = set(settings.block_resource_types) - set(RESOURCE_TYPE_GLOBS)
+        if unsupported:
+            raise ValueError(
+                f"Unsupported resource types to block: {sorted(unsupported)}. "
+                f"Supported: {sorted(RESOURCE_TYPE_GLOBS)}."
+            )
+        self._block_types = list(settings.block_resource_types)
+        self._block_action = settings.block_action
+        self._har_mode = settings.har_mode
+        self._har_dir = Path(settings.har_dir) / settings.env_name
+        self._har_not_found = settings.har_not_found
+        self._patterns: List[Tuple[str, Optional[str]]] = [
+            (RESOURCE_TYPE_GLOBS[resource_type], resource_type)
+            for resource_type in self._block_types
+        ]
+        self._patterns.extend(
+            (pattern, None) for pattern in settings.block_url_patterns
+        )
+
+    @property
+    def enabled(self) -> bool:
+        return bool(self._patterns) or self._har_mode != "off"
+
+    def har_path(self, har_name: str) -> Path:
+        return self._har_dir / f"{har_name}.har"
+
+    def install(self, context: BrowserContext, har_name: str) -> RoutingStats:
+        """Register routes on a fresh context and return its live stats."""
+        stats = RoutingStats()
+        if not self.enabled:
+            return stats
+
+        # Blocked requests never get a response, so their size can only come
+        # from a HAR of the test, recorded earlier or being replayed.
+        har_index: Dict[str, int] = {}
+        har_path = self.har_path(har_name)
+        if self._har_mode == "off":
+            if self._patterns and har_path.exists():
+                har_index = _har_index(har_path)
+        else:
+            if self._har_mode == "record":
+                har_path.parent.mkdir(parents=True, exist_ok=True)
+            elif not har_path.exists():
+                raise FileNotFoundError(
+                    f"No recorded HAR for replay: {har_path}. "
+                    "Run once with APP_HAR_MODE=record."
+                )
+            else:
+                har_index = _har_index(har_path)
+            context.route_from_har(
+                str(har_path),
+                update=self._har_mode == "record",
+                update_content="embed",
+                update_mode="minimal",
+                not_found=self._har_not_found,
+            )
+
+        if self._har_mode == "replay" and har_index:
+
+            def on_request_finished(request: Request) -> None:
+                size = har_index.get(request.url)
+                if size is not None:
+                    stats.replayed_requests += 1
+                    stats.replayed_bytes += size
+
+            context.on("requestfinished", on_request_finished)
+
+        for pattern, resource_type in self._patterns:
+            context.route(pattern, self._blocker(stats, resource_type, har_index))
+        return stats
+
+    def _blocker(
+        self,
+        stats: RoutingStats,
+        resource_type: Optional[str],
+        har_index: Dict[str, int],
+    ) -> Any:
+        def handle(route: Route) -> None:
+            url = route.request.url
+            stats.blocked_requests += 1
+            size = har_index.get(url)
+            if size is None:
+                stats.blocked_unknown_size += 1
+            else:
+                stats.blocked_bytes += size
+            if self._block_action == "stub":
+                content_type = STUB_CONTENT_TYPES.get(
+                    resource_type or route.request.resource_type,
+                    "text/plain",
+                )
+                route.fulfill(status=200, body=b"", content_type=content_type)
+            else:
+                route.abort("blockedbyclient")
+
+        return handle
+
+
+def format_summary(totals: Dict[str, int]) -> str:
+    """Render aggregated routing stats for the terminal summary.
+
+    Blocked bytes are shown only for requests a HAR knows the size of.
+    """
+    blocked = totals.get("blocked_requests", 0)
+    unknown = totals.get("blocked_unknown_size", 0)
+    replayed_kb = totals.get("replayed_bytes", 0) / 1024
+    summary = f"blocked {blocked} requests"
+    if blocked > unknown:
+        blocked_kb = totals.get("blocked_bytes", 0) / 1024
+        summary += (
+            f" ({blocked_kb:.1f} KiB avoided for {blocked - unknown} sized by HAR)"
+        )
+    return (
+        f"{summary}; replayed {totals.get('replayed_requests', 0)} requests "
+        f"from HAR ({replayed_kb:.1f} KiB)"
+    )
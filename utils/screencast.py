@@ -0,0 +1,237 @@
+from __future__ import annotations
+
+import base64
+import math
+import struct
+import threading
+from collections import deque
+from pathlib import Path
+from typing import Any, Deque, Dict, List, Tuple
+
+from playwright.sync_api import Page
+
+Frame = Tuple[float, bytes]
+
+DEFAULT_FPS = 10
+
+
+class WorkerFrameBudget:
+    """Byte budget shared by every ring buffer in one worker process."""
+
+    def __init__(self, max_bytes: int) -> None:
+        self.max_bytes = max_bytes
+        self.used = 0
+        self._lock = threading.Lock()
+
+    def reserve(self, size: int) -> bool:
+        with self._lock:
+            if self.used + size > self.max_bytes:
+                return False
+            self.used += size
+            return True
+
+    def release(self, size: int) -> None:
+        with self._lock:
+            self.used -= size
+
+
+class FrameRingBuffer:
+    """Keeps only the most recent frames, bounded by age and the worker budget."""
+
+    def __init__(self, max_seconds: float, budget: WorkerFrameBudget) -> None:
+        self._max_seconds = max_seconds
+        self._budget = budget
+        self._frames: Deque[Frame] = deque()
+        self._bytes = 0
+
+    def _evict_oldest(self) -> bool:
+        if not self._frames:
+            return False
+        _, data = self._frames.popleft()
+        self._bytes -= len(data)
+        self._budget.release(len(data))
+        return True
+
+    def add(self, timestamp: float, data: bytes) -> None:
+        while self._frames and timestamp - self._frames[0][0] > self._max_seconds:
+            self._evict_oldest()
+        while not self._budget.reserve(len(data)):
+            if not self._evict_oldest():
+                return
+        self._frames.append((timestamp, data))
+        self._bytes += len(data)
+
+    def frames(self) -> List[Frame]:
+        return list(self._frames)
+
+    def clear(self) -> None:
+        while self._evict_oldest():
+            pass
+
+
+class ScreencastRecorder:
+    """Streams JPEG frames from a Chromium page into a ring buffer over CDP."""
+
+    def __init__(
+        self,
+        page: Page,
+        buffer: FrameRingBuffer,
+        quality: int = 60,
+    ) -> None:
+        self._buffer = buffer
+        self._session = page.context.new_cdp_session(page)
+        self._session.on("Page.screencastFrame", self._on_frame)
+        viewport = page.viewport_size or {"width": 1280, "height": 720}
+        self._session.send(
+            "Page.startScreencast",
+            {
+                "format": "jpeg",
+                "quality": quality,
+                "maxWidth": viewport["width"],
+                "maxHeight": viewport["height"],
+            },
+        )
+
+    def _on_frame(self, params: Dict[str, Any]) -> None:
+        self._buffer.add(
+            params["metadata"]["timestamp"], base64.b64decode(params["data"])
+        )
+        try:
+            self._session.send(
+                "Page.screencastFrameAck", {"sessionId": params["sessionId"]}
+            )
+        except Exception:
+            pass
+
+    def stop(self) -> List[Frame]:
+        """Stop streaming and return the buffered frames, oldest first."""
+        try:
+            self._session.send("Page.stopScreencast")
+            self._session.detach()
+        except Exception:
+            pass
+        frames = self._buffer.frames()
+        self._buffer.clear()
+        return frames
+
+
+def jpeg_size(data: bytes) -> Tuple[int, int]:
+    """Return (width, height) from a JPEG's start-of-frame marker."""
+    index = 2
+    while index + 9 < len(data):
+        if data[index] != 0xFF:
+            index += 1
+            continue
+        marker = data[index + 1]
+        if 0xC0 <= marker <= 0xCF and marker not in (0xC4, 0xC8, 0xCC):
+            height, width = struct.unpack(">HH", data[index + 5 : index + 9])
+            return width, height
+        length = struct.unpack(">H", data[index + 2 : index + 4])[0]
+        index += 2 + length
+    raise ValueError("No JPEG start-of-frame marker found.")
+
+
+def _resample(frames: List[Frame], fps: int) -> List[bytes]:
+    start, end = frames[0][0], frames[-1][0]
+    count = math.ceil((end - start) * fps) + 1
+    output: List[bytes] = []
+    cursor = 0
+    for tick in range(count):
+        moment = start + tick / fps
+        while cursor + 1 < len(frames) and frames[cursor + 1][0] <= moment:
+            cursor += 1
+        output.append(frames[cursor][1])
+    return output
+
+
+def _chunk(fourcc: bytes, payload: bytes) -> bytes:
+    pad = b"\0" if len(payload) % 2 else b""
+    return fourcc + struct.pack("<I", len(payload)) + payload + pad
+
+
+def _list(kind: bytes, payload: bytes) -> bytes:
+    return b"LIST" + struct.pack("<I", len(payload) + 4) + kind + payload
+
+
+def write_mjpeg_avi(frames: List[Frame], path: Path, fps: int = DEFAULT_FPS) -> Path:
+    """Encode timestamped JPEG frames as a constant-rate Motion-JPEG AVI.
+
+    Frames are already JPEG, so encoding is only container muxing; no codec
+    or external tool is needed.
+    """
+    if not frames:
+        raise ValueError("No frames to encode.")
+    images = _resample(frames, fps)
+    width, height = jpeg_size(images[-1])
+    largest = max(len(image) for image in images)
+
+    avih = struct.pack(
+        "<14I",
+        1_000_000 // fps,
+        largest * fps,
+        0,
+        0x10,
+        len(images),
+        0,
+        1,
+        largest,
+        width,
+        height,
+        0,
+        0,
+        0,
+        0,
+    )
+    strh = b"vidsMJPG" + struct.pack(
+        "<IHHIIIIIIIIhhhh",
+        0,
+        0,
+        0,
+        0,
+        1,
+        fps,
+        0,
+        len(images),
+        largest,
+        0xFFFFFFFF,
+        0,
+        0,
+        0,
+        width,
+        height,
+    )
+    strf = struct.pack(
+        "<IiiHH4sIiiII",
+        40,
+        width,
+        height,
+        1,
+        24,
+        b"MJPG",
+        width * height * 3,
+        0,
+        0,
+        0,
+        0,
+    )
+    hdrl = _list(
+        b"hdrl",
+        _chunk(b"avih", avih)
+        + _list(b"strl", _chunk(b"strh", strh) + _chunk(b"strf", strf)),
+    )
+
+    movi_chunks: List[bytes] = []
+    index_entries: List[bytes] = []
+    offset = 4
+    for image in images:
+        chunk = _chunk(b"00dc", image)
+        index_entries.append(b"00dc" + struct.pack("<III", 0x10, offset, len(image)))
+        movi_chunks.append(chunk)
+        offset += len(chunk)
+    movi = _list(b"movi", b"".join(movi_chunks))
+    idx1 = _chunk(b"idx1", b"".join(index_entries))
+
+    body = b"AVI " + hdrl + movi + idx1
+    path.parent.mkdir(parents=True, exist_ok=True)
+    path.write_bytes(b"RIFF" + struct.pack("<I", len(body)) + body)
+    return path
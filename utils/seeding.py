@@ -0,0 +1,93 @@
+from __future__ import annotations
+
+import json
+import time
+from typing import Dict, List, Optional, Union
+from urllib.parse import urlsplit
+
+from playwright.sync_api import StorageState
+from playwright.sync_api import StorageStateCookie
+
+from utils.standin.catalog import CART_STORAGE_KEY
+from utils.standin.catalog import PRODUCTS
+from utils.standin.catalog import SESSION_COOKIE
+from utils.standin.catalog import SESSION_MAX_AGE_S
+
+CHECKOUT_STEP_ONE_PATH = "checkout-step-one.html"
+
+PRODUCT_IDS: Dict[str, int] = {product.name: product.id for product in PRODUCTS}
+
+
+def product_id(product: Union[str, int]) -> int:
+    """Return the app's product id for a product name (ids pass through)."""
+    if isinstance(product, int):
+        return product
+    try:
+        return PRODUCT_IDS[product]
+    except KeyError as exc:
+        raise KeyError(f"Unknown product '{product}'.") from exc
+
+
+class StateBuilder:
+    """Builds a Playwright storage_state with the app's session and cart.
+
+    SauceDemo keeps the session in the session-username cookie and the cart
+    as a JSON list of product ids in localStorage, so seeding both lets a test
+    start on any page without going through the login form or cart UI.
+    """
+
+    def __init__(self, base_url: str) -> None:
+        parts = urlsplit(base_url)
+        self._origin = f"{parts.scheme}://{parts.netloc}"
+        self._domain = parts.hostname or ""
+        self._username: Optional[str] = None
+        self._cart: List[int] = []
+        self._local_storage: Dict[str, str] = {}
+
+    def session(self, username: str) -> StateBuilder:
+        self._username = username
+        return self
+
+    def cart(self, *products: Union[str, int]) -> StateBuilder:
+        for product in products:
+            item = product_id(product)
+            if item not in self._cart:
+                self._cart.append(item)
+        return self
+
+    def local_storage(self, name: str, value: str) -> StateBuilder:
+        self._local_storage[name] = value
+        return self
+
+    def build(self) -> StorageState:
+        cookies: List[StorageStateCookie] = []
+        if self._username is not None:
+            cookies.append(
+                {
+                    "name": SESSION_COOKIE,
+                    "value": self._username,
+                    "domain": self._domain,
+                    "path": "/",
+                    "expires": time.time() + SESSION_MAX_AGE_S,
+                    "httpOnly": False,
+                    "secure": False,
+                    "sameSite": "Lax",
+                }
+            )
+        storage = dict(self._local_storage)
+        if self._cart:
+            storage[CART_STORAGE_KEY] = json.dumps(
+                self._cart, separators=(",", ":")
+            )
+        state: StorageState = {"cookies": cookies, "origins": []}
+        if storage:
+            state["origins"].append(
+                {
+                    "origin": self._origin,
+                    "localStorage": [
+                        {"name": name, "value": value}
+                        for name, value in storage.items()
+                    ],
+                }
+            )
+        return state
@@ -0,0 +1,54 @@
+from __future__ import annotations
+
+import re
+from dataclasses import dataclass
+from typing import Dict, FrozenSet, Tuple
+
+PASSWORD = "secret_sauce"
+STANDARD_USER = "standard_user"
+LOCKED_OUT_USER = "locked_out_user"
+USERS: FrozenSet[str] = frozenset(
+    {
+        STANDARD_USER,
+        LOCKED_OUT_USER,
+        "problem_user",
+        "performance_glitch_user",
+        "error_user",
+        "visual_user",
+    }
+)
+
+SESSION_COOKIE = "session-username"
+SESSION_MAX_AGE_S = 600
+CART_STORAGE_KEY = "cart-contents"
+
+
+@dataclass(frozen=True)
+class Product:
+    """One SauceDemo catalog entry, keyed by the id the real app uses."""
+
+    id: int
+    name: str
+    description: str
+    price: float
+
+    @property
+    def slug(self) -> str:
+        return slugify(self.name)
+
+
+PRODUCTS: Tuple[Product, ...] = (
+    Product(4, "Sauce Labs Backpack", "Sleek, streamlined backpack.", 29.99),
+    Product(0, "Sauce Labs Bike Light", "A red light for night rides.", 9.99),
+    Product(1, "Sauce Labs Bolt T-Shirt", "Bolt T-shirt in soft cotton.", 15.99),
+    Product(5, "Sauce Labs Fleece Jacket", "Midweight quarter-zip jacket.", 49.99),
+    Product(2, "Sauce Labs Onesie", "Rib snap infant onesie.", 7.99),
+    Product(3, "Test.allTheThings() T-Shirt (Red)", "Classic red T-shirt.", 15.99),
+)
+
+PRODUCTS_BY_ID: Dict[int, Product] = {product.id: product for product in PRODUCTS}
+
+
+def slugify(name: str) -> str:
+    """Return the suffix SauceDemo uses in add-to-cart/remove data-test ids."""
+    return re.sub(r"\s+", "-", name.strip().lower())
@@ -0,0 +1,297 @@
+from __future__ import annotations
+
+import html
+import json
+
+from utils.standin.catalog import CART_STORAGE_KEY
+from utils.standin.catalog import LOCKED_OUT_USER
+from utils.standin.catalog import PASSWORD
+from utils.standin.catalog import PRODUCTS
+from utils.standin.catalog import SESSION_COOKIE
+from utils.standin.catalog import SESSION_MAX_AGE_S
+from utils.standin.catalog import USERS
+
+TAX_RATE = 0.08
+
+# Shared client-side helpers: the cart lives in localStorage exactly like the
+# real app, so storage_state seeding works against both targets.
+_COMMON_SCRIPT = """
+const CART_KEY = %(cart_key)s;
+const PRODUCTS = %(products)s;
+function readCart() {
+  try { return JSON.parse(localStorage.getItem(CART_KEY) || "[]"); }
+  catch (e) { return []; }
+}
+function writeCart(ids) {
+  if (ids.length) { localStorage.setItem(CART_KEY, JSON.stringify(ids)); }
+  else { localStorage.removeItem(CART_KEY); }
+  renderBadge();
+}
+function renderBadge() {
+  const link = document.querySelector("[data-test='shopping-cart-link']");
+  if (!link) { return; }
+  const count = readCart().length;
+  let badge = link.querySelector("[data-test='shopping-cart-badge']");
+  if (!count) { if (badge) { badge.remove(); } return; }
+  if (!badge) {
+    badge = document.createElement("span");
+    badge.className = "shopping_cart_badge";
+    badge.setAttribute("data-test", "shopping-cart-badge");
+    link.appendChild(badge);
+  }
+  badge.textContent = String(count);
+}
+function cartProducts() {
+  return readCart().map((id) => PRODUCTS[id]).filter(Boolean);
+}
+function itemRow(product) {
+  const row = document.createElement("div");
+  row.className = "cart_item";
+  row.setAttribute("data-test", "inventory-item");
+  row.innerHTML =
+    '<div class="cart_quantity" data-test="item-quantity">1</div>' +
+    '<div class="inventory_item_name" data-test="inventory-item-name"></div>' +
+    '<div class="inventory_item_price" data-test="inventory-item-price"></div>';
+  row.querySelector(".inventory_item_name").textContent = product.name;
+  row.querySelector(".inventory_item_price").textContent = "$" + product.price;
+  return row;
+}
+document.addEventListener("DOMContentLoaded", renderBadge);
+""" % {
+    "cart_key": json.dumps(CART_STORAGE_KEY),
+    "products": json.dumps(
+        {
+            product.id: {"name": product.name, "price": product.price}
+            for product in PRODUCTS
+        }
+    ),
+}
+
+_LOGIN_SCRIPT = """
+const USERS = %(users)s;
+const LOCKED_OUT = %(locked_out)s;
+const PASSWORD = %(password)s;
+document.getElementById("login-form").addEventListener("submit", (event) => {
+  event.preventDefault();
+  const username = document.getElementById("user-name").value;
+  const password = document.getElementById("password").value;
+  let error = "";
+  if (!username) { error = "Epic sadface: Username is required"; }
+  else if (!password) { error = "Epic sadface: Password is required"; }
+  else if (!USERS.includes(username) || password !== PASSWORD) {
+    error = "Epic sadface: Username and password do not match any user in this service";
+  } else if (username === LOCKED_OUT) {
+    error = "Epic sadface: Sorry, this user has been locked out.";
+  }
+  const container = document.querySelector(".error-message-container");
+  if (error) {
+    container.innerHTML = '<h3 data-test="error"></h3>';
+    container.firstChild.textContent = error;
+    return;
+  }
+  document.cookie = %(cookie)s + "=" + username + "; path=/; max-age=%(max_age)d";
+  window.location.href = "inventory.html";
+});
+""" % {
+    "users": json.dumps(sorted(USERS)),
+    "locked_out": json.dumps(LOCKED_OUT_USER),
+    "password": json.dumps(PASSWORD),
+    "cookie": json.dumps(SESSION_COOKIE),
+    "max_age": SESSION_MAX_AGE_S,
+}
+
+_INVENTORY_SCRIPT = """
+function syncButtons() {
+  const cart = readCart();
+  document.querySelectorAll("[data-test='inventory-item']").forEach((item) => {
+    const id = Number(item.dataset.productId);
+    const button = item.querySelector("button");
+    const inCart = cart.includes(id);
+    const prefix = inCart ? "remove-" : "add-to-cart-";
+    button.setAttribute("data-test", prefix + item.dataset.slug);
+    button.id = button.getAttribute("data-test");
+    button.textContent = inCart ? "Remove" : "Add to cart";
+  });
+}
+const inventoryList = document.querySelector("[data-test='inventory-list']");
+inventoryList.addEventListener("click", (event) => {
+  const button = event.target.closest("button");
+  if (!button) { return; }
+  const id = Number(button.closest("[data-test='inventory-item']").dataset.productId);
+  const cart = readCart();
+  writeCart(cart.includes(id) ? cart.filter((x) => x !== id) : cart.concat([id]));
+  syncButtons();
+});
+syncButtons();
+"""
+
+_CART_SCRIPT = """
+const list = document.querySelector("[data-test='cart-list']");
+cartProducts().forEach((product) => list.appendChild(itemRow(product)));
+document.querySelector("[data-test='checkout']").addEventListener("click", () => {
+  window.location.href = "checkout-step-one.html";
+});
+"""
+
+_STEP_ONE_SCRIPT = """
+document.getElementById("checkout-form").addEventListener("submit", (event) => {
+  event.preventDefault();
+  const fields = [["firstName", "First Name"], ["lastName", "Last Name"],
+                  ["postalCode", "Postal Code"]];
+  for (const [id, label] of fields) {
+    if (!document.getElementById(id).value) {
+      const container = document.querySelector(".error-message-container");
+      container.innerHTML = '<h3 data-test="error"></h3>';
+      container.firstChild.textContent = "Error: " + label + " is required";
+      return;
+    }
+  }
+  window.location.href = "checkout-step-two.html";
+});
+"""
+
+_STEP_TWO_SCRIPT = """
+const list = document.querySelector("[data-test='cart-list']");
+const products = cartProducts();
+products.forEach((product) => list.appendChild(itemRow(product)));
+const subtotal = products.reduce((sum, product) => sum + product.price, 0);
+const tax = Math.round(subtotal * %(tax_rate)s * 100) / 100;
+document.querySelector("[data-test='subtotal-label']").textContent =
+  "Item total: $" + subtotal.toFixed(2);
+document.querySelector("[data-test='tax-label']").textContent =
+  "Tax: $" + tax.toFixed(2);
+document.querySelector("[data-test='total-label']").textContent =
+  "Total: $" + (subtotal + tax).toFixed(2);
+document.querySelector("[data-test='finish']").addEventListener("click", () => {
+  localStorage.removeItem(CART_KEY);
+  window.location.href = "checkout-complete.html";
+});
+""" % {
+    "tax_rate": TAX_RATE
+}
+
+
+def _document(title: str, body: str, script: str = "", common: bool = True) -> str:
+    scripts = (_COMMON_SCRIPT if common else "") + script
+    return (
+        "<!DOCTYPE html>\n"
+        '<html lang="en"><head><meta charset="utf-8">'
+        "<title>Swag Labs</title></head>\n"
+        f'<body><div id="root" data-page="{html.escape(title)}">{body}</div>'
+        f"<script>{scripts}</script></body></html>\n"
+    )
+
+
+def _header(title: str) -> str:
+    return (
+        '<div class="primary_header" data-test="primary-header">'
+        '<div class="app_logo">Swag Labs</div>'
+        '<a class="shopping_cart_link" data-test="shopping-cart-link" '
+        'href="cart.html"></a>'
+        "</div>"
+        '<div class="header_secondary_container" data-test="secondary-header">'
+        f'<span class="title" data-test="title">{html.escape(title)}</span></div>'
+    )
+
+
+def login_page() -> str:
+    body = (
+        '<div class="login_logo">Swag Labs</div>'
+        '<form id="login-form">'
+        '<input id="user-name" name="user-name" data-test="username" '
+        'placeholder="Username" autocomplete="off">'
+        '<input id="password" name="password" type="password" data-test="password" '
+        'placeholder="Password" autocomplete="off">'
+        '<div class="error-message-container"></div>'
+        '<input type="submit" id="login-button" name="login-button" '
+        'data-test="login-button" value="Login">'
+        "</form>"
+    )
+    return _document("login", body, _LOGIN_SCRIPT, common=False)
+
+
+def inventory_page() -> str:
+    items = []
+    for product in PRODUCTS:
+        items.append(
+            f'<div class="inventory_item" data-test="inventory-item" '
+            f'data-product-id="{product.id}" data-slug="{html.escape(product.slug)}">'
+            f'<img class="inventory_item_img" alt="{html.escape(product.name)}" '
+            f'src="static/media/{product.id}.svg">'
+            f'<div class="inventory_item_name" data-test="inventory-item-name">'
+            f"{html.escape(product.name)}</div>"
+            f'<div class="inventory_item_desc" data-test="inventory-item-desc">'
+            f"{html.escape(product.description)}</div>"
+            f'<div class="inventory_item_price" data-test="inventory-item-price">'
+            f"${product.price}</div>"
+            f'<button class="btn_inventory" data-test="add-to-cart-'
+            f'{html.escape(product.slug)}">Add to cart</button>'
+            "</div>"
+        )
+    body = (
+        _header("Products")
+        + '<div class="inventory_list" data-test="inventory-list">'
+        + "".join(items)
+        + "</div>"
+    )
+    return _document("inventory", body, _INVENTORY_SCRIPT)
+
+
+def cart_page() -> str:
+    body = (
+        _header("Your Cart")
+        + '<div class="cart_list" data-test="cart-list"></div>'
+        + '<a href="inventory.html" data-test="continue-shopping">Continue Shopping</a>'
+        + '<button id="checkout" data-test="checkout">Checkout</button>'
+    )
+    return _document("cart", body, _CART_SCRIPT)
+
+
+def checkout_step_one_page() -> str:
+    body = (
+        _header("Checkout: Your Information")
+        + '<form id="checkout-form">'
+        + '<input id="firstName" data-test="firstName" placeholder="First Name">'
+        + '<input id="lastName" data-test="lastName" placeholder="Last Name">'
+        + '<input id="postalCode" data-test="postalCode" placeholder="Zip/Postal Code">'
+        + '<div class="error-message-container"></div>'
+        + '<a href="cart.html" data-test="cancel">Cancel</a>'
+        + '<input type="submit" id="continue" data-test="continue" value="Continue">'
+        + "</form>"
+    )
+    return _document("checkout-step-one", body, _STEP_ONE_SCRIPT)
+
+
+def checkout_step_two_page() -> str:
+    body = (
+        _header("Checkout: Overview")
+        + '<div class="cart_list" data-test="cart-list"></div>'
+        + '<div class="summary_subtotal_label" data-test="subtotal-label"></div>'
+        + '<div class="summary_tax_label" data-test="tax-label"></div>'
+        + '<div class="summary_total_label" data-test="total-label"></div>'
+        + '<a href="inventory.html" data-test="cancel">Cancel</a>'
+        + '<button id="finish" data-test="finish">Finish</button>'
+    )
+    return _document("checkout-step-two", body, _STEP_TWO_SCRIPT)
+
+
+def checkout_complete_page() -> str:
+    body = (
+        _header("Checkout: Complete!")
+        + '<h2 class="complete-header" data-test="complete-header">'
+        + "Thank you for your order!</h2>"
+        + '<a href="inventory.html" data-test="back-to-products">Back Home</a>'
+    )
+    return _document("checkout-complete", body)
+
+
+def error_page(status: int) -> str:
+    return _document("error", f"<h1>{status}</h1><p>Injected stand-in fault.</p>")
+
+
+def product_image(product_id: int) -> str:
+    hue = (product_id * 57) % 360
+    return (
+        '<svg xmlns="http://www.w3.org/2000/svg" width="64" height="64">'
+        f'<rect width="64" height="64" fill="hsl({hue},60%,55%)"/></svg>'
+    )
@@ -0,0 +1,259 @@
+from __future__ import annotations
+
+import argparse
+import random
+import threading
+import time
+from dataclasses import dataclass
+from http.cookies import CookieError
+from http.cookies import SimpleCookie
+from http.server import BaseHTTPRequestHandler
+from http.server import ThreadingHTTPServer
+from typing import Any, Callable, Dict, List, Mapping, Optional, Tuple
+from urllib.parse import urlsplit
+
+from config.settings import Settings
+from utils.standin import pages
+from utils.standin.catalog import PRODUCTS_BY_ID
+from utils.standin.catalog import SESSION_COOKIE
+
+_PUBLIC_ROUTES: Dict[str, Callable[[], str]] = {
+    "/": pages.login_page,
+    "/index.html": pages.login_page,
+}
+_SESSION_ROUTES: Dict[str, Callable[[], str]] = {
+    "/inventory.html": pages.inventory_page,
+    "/cart.html": pages.cart_page,
+    "/checkout-step-one.html": pages.checkout_step_one_page,
+    "/checkout-step-two.html": pages.checkout_step_two_page,
+    "/checkout-complete.html": pages.checkout_complete_page,
+}
+_IMAGE_PREFIX = "/static/media/"
+
+
+@dataclass(frozen=True)
+class RouteFaults:
+    """Latency, jitter and error injection applied to one route."""
+
+    latency_ms: int = 0
+    jitter_ms: int = 0
+    error_rate: float = 0.0
+    error_status: int = 500
+
+    @classmethod
+    def from_mapping(cls, values: Mapping[str, Any], base: RouteFaults) -> RouteFaults:
+        return cls(
+            latency_ms=int(values.get("latency_ms", base.latency_ms)),
+            jitter_ms=int(values.get("jitter_ms", base.jitter_ms)),
+            error_rate=float(values.get("error_rate", base.error_rate)),
+            error_status=int(values.get("error_status", base.error_status)),
+        )
+
+
+class FaultInjector:
+    """Decides per request how long to stall and whether to fail.
+
+    A single seeded generator behind a lock keeps a run reproducible for a
+    given request order.
+    """
+
+    def __init__(
+        self,
+        default: RouteFaults,
+        routes: Optional[Dict[str, RouteFaults]] = None,
+        seed: int = 0,
+    ) -> None:
+        self.default = default
+        self.routes = dict(routes or {})
+        self._random = random.Random(seed)
+        self._lock = threading.Lock()
+
+    def faults_for(self, path: str) -> RouteFaults:
+        if path in self.routes:
+            return self.routes[path]
+        if path.startswith(_IMAGE_PREFIX) and _IMAGE_PREFIX in self.routes:
+            return self.routes[_IMAGE_PREFIX]
+        return self.default
+
+    def decide(self, path: str) -> Tuple[float, Optional[int]]:
+        """Return (delay seconds, injected status or None) for one request."""
+        faults = self.faults_for(path)
+        with self._lock:
+            jitter = self._random.uniform(-1.0, 1.0) * faults.jitter_ms
+            failed = faults.error_rate > 0 and self._random.random() < faults.error_rate
+        delay_s = max(faults.latency_ms + jitter, 0.0) / 1000
+        return delay_s, faults.error_status if failed else None
+
+
+def faults_from_settings(settings: Settings) -> FaultInjector:
+    default = RouteFaults(
+        latency_ms=settings.standin_latency_ms,
+        jitter_ms=settings.standin_jitter_ms,
+        error_rate=settings.standin_error_rate,
+    )
+    routes = {
+        path: RouteFaults.from_mapping(values, default)
+        for path, values in settings.standin_routes.items()
+    }
+    return FaultInjector(default, routes, seed=settings.standin_seed)
+
+
+class StandinStats:
+    """Request counters shared by the handler threads."""
+
+    def __init__(self) -> None:
+        self.requests = 0
+        self.injected_errors = 0
+        self.delay_s = 0.0
+        self._lock = threading.Lock()
+
+    def record(self, delay_s: float, failed: bool) -> None:
+        with self._lock:
+            self.requests += 1
+            self.delay_s += delay_s
+            if failed:
+                self.injected_errors += 1
+
+
+class _Handler(BaseHTTPRequestHandler):
+    server: "_StandinHTTPServer"
+    protocol_version = "HTTP/1.1"
+
+    def do_GET(self) -> None:
+        path = urlsplit(self.path).path
+        delay_s, status = self.server.faults.decide(path)
+        self.server.stats.record(delay_s, status is not None)
+        if delay_s:
+            time.sleep(delay_s)
+        if status is not None:
+            self._send(status, pages.error_page(status))
+            return
+
+        if path in _PUBLIC_ROUTES:
+            self._send(200, _PUBLIC_ROUTES[path]())
+        elif path in _SESSION_ROUTES:
+            if self._has_session():
+                self._send(200, _SESSION_ROUTES[path]())
+            else:
+                self._redirect("/")
+        elif path.startswith(_IMAGE_PREFIX):
+            self._send_image(path[len(_IMAGE_PREFIX) :])
+        else:
+            self._send(404, pages.error_page(404))
+
+    def _has_session(self) -> bool:
+        try:
+            cookie = SimpleCookie(self.headers.get("Cookie", ""))
+        except CookieError:
+            return False
+        return bool(cookie.get(SESSION_COOKIE) and cookie[SESSION_COOKIE].value)
+
+    def _send_image(self, file_name: str) -> None:
+        stem, _, extension = file_name.partition(".")
+        if extension != "svg" or not stem.isdigit() or int(stem) not in PRODUCTS_BY_ID:
+            self._send(404, pages.error_page(404))
+            return
+        self._send(200, pages.product_image(int(stem)), "image/svg+xml")
+
+    def _send(self, status: int, body: str, content_type: str = "text/html") -> None:
+        payload = body.encode("utf-8")
+        self.send_response(status)
+        self.send_header("Content-Type", f"{content_type}; charset=utf-8")
+        self.send_header("Content-Length", str(len(payload)))
+        self.send_header("Cache-Control", "no-store")
+        self.end_headers()
+        self.wfile.write(payload)
+
+    def _redirect(self, location: str) -> None:
+        self.send_response(302)
+        self.send_header("Location", location)
+        self.send_header("Content-Length", "0")
+        self.end_headers()
+
+    def log_message(self, format: str, *args: Any) -> None:
+        return
+
+
+class _StandinHTTPServer(ThreadingHTTPServer):
+    daemon_threads = True
+
+    def __init__(
+        self,
+        address: Tuple[str, int],
+        faults: FaultInjector,
+        stats: StandinStats,
+    ) -> None:
+        super().__init__(address, _Handler)
+        self.faults = faults
+        self.stats = stats
+
+
+class StandinServer:
+    """Local SauceDemo stand-in served from a background thread."""
+
+    def __init__(
+        self,
+        faults: Optional[FaultInjector] = None,
+        host: str = "127.0.0.1",
+        port: int = 0,
+    ) -> None:
+        self.stats = StandinStats()
+        self._httpd = _StandinHTTPServer(
+            (host, port), faults or FaultInjector(RouteFaults()), self.stats
+        )
+        self._thread: Optional[threading.Thread] = None
+
+    @property
+    def base_url(self) -> str:
+        host, port = self._httpd.server_address[:2]
+        if isinstance(host, bytes):
+            host = host.decode()
+        return f"http://{host}:{port}/"
+
+    def start(self) -> StandinServer:
+        self._thread = threading.Thread(
+            target=self._httpd.serve_forever, name="standin-server", daemon=True
+        )
+        self._thread.start()
+        return self
+
+    def stop(self) -> None:
+        if self._thread is not None:
+            self._httpd.shutdown()
+            self._thread.join()
+            self._thread = None
+        self._httpd.server_close()
+
+    def __enter__(self) -> StandinServer:
+        return self.start()
+
+    def __exit__(self, *exc_info: Any) -> None:
+        self.stop()
+
+
+def main(argv: Optional[List[str]] = None) -> None:
+    """Serve the SauceDemo stand-in until interrupted."""
+    parser = argparse.ArgumentParser(description=main.__doc__)
+    parser.add_argument("--host", default="127.0.0.1")
+    parser.add_argument("--port", type=int, default=8000)
+    parser.add_argument("--latency-ms", type=int, default=0)
+    parser.add_argument("--jitter-ms", type=int, default=0)
+    parser.add_argument("--error-rate", type=float, default=0.0)
+    parser.add_argument("--seed", type=int, default=0)
+    args = parser.parse_args(argv)
+
+    faults = FaultInjector(
+        RouteFaults(args.latency_ms, args.jitter_ms, args.error_rate), seed=args.seed
+    )
+    server = StandinServer(faults, args.host, args.port)
+    print(f"Serving SauceDemo stand-in at {server.base_url}")
+    try:
+        server._httpd.serve_forever()
+    except KeyboardInterrupt:
+        pass
+    finally:
+        server.stop()
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,192 @@
+from __future__ import annotations
+
+import argparse
+import json
+import time
+from contextlib import contextmanager
+from contextvars import ContextVar
+from contextvars import Token
+from pathlib import Path
+from typing import Any, Dict, Iterable, Iterator, List, NamedTuple, Optional, Tuple
+
+
+class Span(NamedTuple):
+    """One timed BasePage operation phase."""
+
+    page: str
+    name: Optional[str]
+    selector: Optional[str]
+    phase: str
+    start_ns: int
+    duration_ns: int
+
+
+SpanKey = Tuple[str, Optional[str], Optional[str], str]
+
+
+class TimingRecorder:
+    """Collects spans for a single test.
+
+    Spans are appended to a plain list owned by the test, so recording needs
+    no locks; xdist workers are separate processes with their own recorders.
+    """
+
+    def __init__(self, test_id: str) -> None:
+        self.test_id = test_id
+        self.spans: List[Span] = []
+        self._started_ns = time.perf_counter_ns()
+
+    def record(
+        self,
+        page: str,
+        name: Optional[str],
+        selector: Optional[str],
+        phase: str,
+        start_ns: int,
+        duration_ns: int,
+    ) -> None:
+        self.spans.append(Span(page, name, selector, phase, start_ns, duration_ns))
+
+    def breakdown(self) -> List[Dict[str, Any]]:
+        """Aggregate spans by page, map name, selector and phase."""
+        return aggregate(
+            (
+                {
+                    "page": span.page,
+                    "name": span.name,
+                    "selector": span.selector,
+                    "phase": span.phase,
+                    "count": 1,
+                    "total_ms": span.duration_ns / 1e6,
+                    "max_ms": span.duration_ns / 1e6,
+                }
+                for span in self.spans
+            )
+        )
+
+    def to_dict(self) -> Dict[str, Any]:
+        elapsed_ms = (time.perf_counter_ns() - self._started_ns) / 1e6
+        breakdown = self.breakdown()
+        return {
+            "test": self.test_id,
+            "elapsed_ms": round(elapsed_ms, 3),
+            "instrumented_ms": round(sum(row["total_ms"] for row in breakdown), 3),
+            "breakdown": breakdown,
+        }
+
+
+_current: ContextVar[Optional[TimingRecorder]] = ContextVar(
+    "timing_recorder", default=None
+)
+
+
+def activate(recorder: TimingRecorder) -> Token[Optional[TimingRecorder]]:
+    """Make a recorder current for the running test."""
+    return _current.set(recorder)
+
+
+def deactivate(token: Token[Optional[TimingRecorder]]) -> None:
+    """Restore the recorder that was current before activate()."""
+    _current.reset(token)
+
+
+def current_recorder() -> Optional[TimingRecorder]:
+    """Return the recorder of the running test, if timing is enabled."""
+    return _current.get()
+
+
+@contextmanager
+def span(
+    page: str,
+    name: Optional[str],
+    selector: Optional[str],
+    phase: str,
+) -> Iterator[None]:
+    """Time the wrapped block and record it on the current recorder."""
+    recorder = _current.get()
+    if recorder is None:
+        yield
+        return
+    start_ns = time.perf_counter_ns()
+    try:
+        yield
+    finally:
+        recorder.record(
+            page, name, selector, phase, start_ns, time.perf_counter_ns() - start_ns
+        )
+
+
+def aggregate(rows: Iterable[Dict[str, Any]]) -> List[Dict[str, Any]]:
+    """Merge breakdown rows with the same key, slowest total first."""
+    merged: Dict[SpanKey, Dict[str, Any]] = {}
+    for row in rows:
+        key = (row["page"], row["name"], row["selector"], row["phase"])
+        entry = merged.get(key)
+        if entry is None:
+            merged[key] = dict(row)
+            continue
+        entry["count"] += row["count"]
+        entry["total_ms"] += row["total_ms"]
+        entry["max_ms"] = max(entry["max_ms"], row["max_ms"])
+    result = sorted(merged.values(), key=lambda row: row["total_ms"], reverse=True)
+    for row in result:
+        row["total_ms"] = round(row["total_ms"], 3)
+        row["max_ms"] = round(row["max_ms"], 3)
+    return result
+
+
+def append_jsonl(path: Path, record: Dict[str, Any]) -> None:
+    """Append one record to a per-worker JSONL file."""
+    path.parent.mkdir(parents=True, exist_ok=True)
+    with path.open("a", encoding="utf-8") as handle:
+        handle.write(json.dumps(record) + "\n")
+
+
+def prune_runs(directory: Path, keep: int) -> int:
+    """Delete timing files of all but the newest keep runs; return the count.
+
+    Files are named timings-<run>-<worker>.jsonl, so a run spans one file
+    per xdist worker and all of them go together.
+    """
+    runs: Dict[str, List[Path]] = {}
+    for path in directory.glob("timings-*-*.jsonl"):
+        runs.setdefault(path.stem.split("-")[1], []).append(path)
+    ordered = sorted(
+        runs.values(),
+        key=lambda paths: max(path.stat().st_mtime for path in paths),
+        reverse=True,
+    )
+    removed = 0
+    for paths in ordered[max(keep, 0) :]:
+        for path in paths:
+            path.unlink(missing_ok=True)
+            removed += 1
+    return removed
+
+
+def _read_breakdowns(paths: Iterable[Path]) -> Iterator[Dict[str, Any]]:
+    for path in paths:
+        with path.open(encoding="utf-8") as handle:
+            for line in handle:
+                if line.strip():
+                    yield from json.loads(line)["breakdown"]
+
+
+def main(argv: Optional[List[str]] = None) -> None:
+    """Print the slowest page-object operations across timing files."""
+    parser = argparse.ArgumentParser(description=main.__doc__)
+    parser.add_argument("files", nargs="+", type=Path)
+    parser.add_argument("--top", type=int, default=20)
+    args = parser.parse_args(argv)
+
+    rows = aggregate(_read_breakdowns(args.files))
+    print(f"{'total_ms':>10} {'count':>6} {'max_ms':>9}  page.name [phase] selector")
+    for row in rows[: args.top]:
+        print(
+            f"{row['total_ms']:>10.1f} {row['count']:>6} {row['max_ms']:>9.1f}  "
+            f"{row['page']}.{row['name'] or '-'} [{row['phase']}] {row['selector']}"
+        )
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,171 @@
+from __future__ import annotations
+
+import time
+from pathlib import Path
+from typing import Any, Callable, Dict, Optional, TypedDict
+
+from playwright.sync_api import BrowserContext
+
+FULL = "full"
+LIGHT = "light"
+
+
+class TraceOptions(TypedDict):
+    screenshots: bool
+    snapshots: bool
+    sources: bool
+
+
+TRACE_OPTIONS: Dict[str, TraceOptions] = {
+    FULL: {"screenshots": True, "snapshots": True, "sources": True},
+    LIGHT: {"screenshots": True, "snapshots": False, "sources": False},
+}
+
+
+class TracingPolicy:
+    """Decides per test attempt whether and how to trace, and what to keep.
+
+    Modes:
+      off                no tracing
+      on                 full trace for every attempt, always kept
+      retain-on-failure  full trace for every attempt, kept when it fails
+      on-first-retry     full trace only on the first retry, always kept
+      light              trace without DOM snapshots or sources, kept on
+                         failure; retries are upgraded to full tracing
+
+    The attempt number follows the pytest-rerunfailures convention
+    (item.execution_count, 1 for the first run).
+    """
+
+    def __init__(self, mode: str) -> None:
+        self.mode = mode
+
+    def level(self, attempt: int) -> Optional[str]:
+        """Return the trace level for an attempt, or None to skip tracing."""
+        if self.mode == "off":
+            return None
+        if self.mode == "on-first-retry":
+            return FULL if attempt == 2 else None
+        if self.mode == "light":
+            return FULL if attempt > 1 else LIGHT
+        return FULL
+
+    def keep(self, attempt: int, failed: bool) -> bool:
+        """Return True when the trace of this attempt should be saved."""
+        if self.mode in ("on", "on-first-retry"):
+            return True
+        return failed
+
+    def start(self, context: BrowserContext, attempt: int) -> "TraceSession":
+        """Start tracing a test that owns its context."""
+        return TraceSession(self, context, attempt, chunked=False)
+
+    def start_group(self, context: BrowserContext) -> Optional[str]:
+        """Start one trace on a context shared by several tests."""
+        level = self.level(1)
+        if level is not None:
+            context.tracing.start(**TRACE_OPTIONS[level])
+        return level
+
+    def start_chunk(
+        self,
+        context: BrowserContext,
+        attempt: int,
+        group_level: Optional[str],
+    ) -> "TraceSession":
+        """Start a per-test chunk on a context already traced by start_group.
+
+        When the group is not traced (on-first-retry), an attempt the policy
+        traces gets its own trace on the shared context instead.
+        """
+        if group_level is None:
+            return TraceSession(self, context, attempt, chunked=False)
+        return TraceSession(self, context, attempt, chunked=True, level=group_level)
+
+
+class TraceSession:
+    """Tracing for a single test attempt.
+
+    start_stop_ms is the time spent in tracing.start/stop (or the chunk
+    calls), which includes writing the trace. The per-action snapshot cost
+    that light tracing avoids is spread over the test and not measured.
+    """
+
+    def __init__(
+        self,
+        policy: TracingPolicy,
+        context: BrowserContext,
+        attempt: int,
+        *,
+        chunked: bool,
+        level: Optional[str] = None,
+    ) -> None:
+        self._policy = policy
+        self._context = context
+        self._attempt = attempt
+        self._chunked = chunked
+        self.level = level if chunked else policy.level(attempt)
+        self.start_stop_ms = 0.0
+        if self.level is None:
+            return
+        start = time.perf_counter()
+        if chunked:
+            context.tracing.start_chunk()
+        else:
+            context.tracing.start(**TRACE_OPTIONS[self.level])
+        self.start_stop_ms += (time.perf_counter() - start) * 1000
+
+    def finish(
+        self,
+        failed: bool,
+        trace_path: Callable[[], Path],
+    ) -> Optional[Path]:
+        """Stop tracing; save and return the trace path when it is kept."""
+        if self.level is None:
+            return None
+        keep = self._policy.keep(self._attempt, failed)
+        path = trace_path() if keep else None
+        start = time.perf_counter()
+        try:
+            if self._chunked:
+                self._context.tracing.stop_chunk(path=str(path) if path else None)
+            else:
+                self._context.tracing.stop(path=str(path) if path else None)
+        finally:
+            self.start_stop_ms += (time.perf_counter() - start) * 1000
+        return path
+
+    def record(self) -> Dict[str, Any]:
+        """Return the per-test record aggregated into the run summary."""
+        kind = self.level or "none"
+        if self._chunked and self.level is not None:
+            kind = f"{self.level}-chunk"
+        return {"level": kind, "start_stop_ms": round(self.start_stop_ms, 3)}
+
+
+def summarize(records: Dict[str, Dict[str, float]]) -> str:
+    """Render tracing start/stop time per level and the saving vs. full traces.
+
+    `records` maps level -> {"count": n, "start_stop_ms": total}. The saving
+    assumes every non-full test would have cost the mean start/stop time of a
+    full per-test trace in this run. Snapshot cost during actions is not
+    included.
+    """
+    parts = [
+        f"{level}: {data['count']:.0f} tests, {data['start_stop_ms']:.0f} ms"
+        for level, data in sorted(records.items())
+    ]
+    full = records.get(FULL)
+    if not full or not full["count"]:
+        return "; ".join(parts) + " (no full traces measured, saving unknown)"
+    mean_full = full["start_stop_ms"] / full["count"]
+    saved = sum(
+        data["count"] * mean_full - data["start_stop_ms"]
+        for level, data in records.items()
+        if level != FULL
+    )
+    return "; ".join(parts) + (
+        f"; ~{max(saved, 0.0) / 1000:.1f}s of tracing start/stop time saved "
+        f"(full trace mean {mean_full:.0f} ms; per-action snapshot cost not "
+        "measured)"
+    )
@@ -0,0 +1,281 @@
+from __future__ import annotations
+
+import hashlib
+import io
+import threading
+from dataclasses import dataclass
+from functools import lru_cache
+from pathlib import Path
+from typing import TYPE_CHECKING, Dict, NamedTuple, Optional, Sequence, Tuple
+
+from config.settings import Settings
+
+# numpy and Pillow are imported where pixels are decoded, so page objects and
+# suites that never compare screenshots do not pay for loading them.
+if TYPE_CHECKING:
+    import numpy as np
+
+MATCH = "match"
+MISMATCH = "mismatch"
+MISSING = "missing"
+UPDATED = "updated"
+
+# Offsets checked around a differing pixel for anti-aliasing and 1px shifts.
+_NEIGHBOURS = tuple(
+    (dy, dx) for dy in (-1, 0, 1) for dx in (-1, 0, 1) if (dy, dx) != (0, 0)
+)
+
+
+class Box(NamedTuple):
+    """A region in screenshot pixels, ignored when comparing."""
+
+    x: int
+    y: int
+    width: int
+    height: int
+
+
+@dataclass(frozen=True)
+class Comparison:
+    """Outcome of comparing one screenshot with its baseline.
+
+    identical is set when the encoded images matched byte for byte and no
+    pixel was decoded.
+    """
+
+    name: str
+    status: str
+    diff_pixels: int = 0
+    total_pixels: int = 0
+    identical: bool = False
+    baseline: Optional[Path] = None
+    actual_png: Optional[bytes] = None
+    diff_png: Optional[bytes] = None
+
+    @property
+    def diff_ratio(self) -> float:
+        return self.diff_pixels / self.total_pixels if self.total_pixels else 0.0
+
+    def describe(self) -> str:
+        if self.status == MISSING:
+            return (
+                f"No visual baseline for '{self.name}'; wrote {self.baseline}. "
+                "Review it and re-run (APP_VISUAL_UPDATE=true accepts new baselines)."
+            )
+        if self.status == MISMATCH and not self.total_pixels:
+            return f"'{self.name}' differs in size from {self.baseline}."
+        return (
+            f"'{self.name}' differs from {self.baseline}: {self.diff_pixels} of "
+            f"{self.total_pixels} pixels ({self.diff_ratio:.3%})."
+        )
+
+
+class VisualMismatch(AssertionError):
+    """A screenshot did not match its baseline, or had none."""
+
+    def __init__(self, comparison: Comparison) -> None:
+        super().__init__(comparison.describe())
+        self.comparison = comparison
+
+
+def decode(png: bytes) -> np.ndarray:
+    """Decode an image into a contiguous (height, width, 4) uint8 array."""
+    import numpy as np
+    from PIL import Image
+
+    with Image.open(io.BytesIO(png)) as image:
+        return np.ascontiguousarray(np.asarray(image.convert("RGBA")))
+
+
+def encode(pixels: np.ndarray) -> bytes:
+    """Encode an RGBA array as PNG, favouring speed over size."""
+    from PIL import Image
+
+    buffer = io.BytesIO()
+    Image.fromarray(pixels, "RGBA").save(buffer, format="PNG", compress_level=1)
+    return buffer.getvalue()
+
+
+def _close_to_neighbour(
+    source: np.ndarray,
+    other: np.ndarray,
+    ys: np.ndarray,
+    xs: np.ndarray,
+    limit: int,
+) -> np.ndarray:
+    """Whether each source pixel matches one of the 8 pixels around it in other."""
+    import numpy as np
+
+    height, width = other.shape[:2]
+    pixels = source[ys, xs].astype(np.int16)
+    found = np.zeros(len(ys), dtype=bool)
+    for dy, dx in _NEIGHBOURS:
+        ny = np.clip(ys + dy, 0, height - 1)
+        nx = np.clip(xs + dx, 0, width - 1)
+        found |= np.abs(pixels - other[ny, nx]).max(axis=1) <= limit
+    return found
+
+
+def diff_pixels(
+    actual: np.ndarray,
+    expected: np.ndarray,
+    threshold: float = 0.1,
+    antialiasing: bool = True,
+    ignore: Sequence[Box] = (),
+) -> Tuple[np.ndarray, np.ndarray]:
+    """Return the (ys, xs) coordinates of pixels that differ.
+
+    A pixel differs when a channel moved by more than threshold (0-1). With
+    antialiasing, a pixel whose colour both images have within one pixel of
+    it (edge smoothing, subpixel shifts) does not count. Work beyond the
+    first exact comparison is proportional to the changed pixels.
+    """
+    import numpy as np
+
+    changed = actual.view(np.uint32)[..., 0] != expected.view(np.uint32)[..., 0]
+    ys, xs = np.nonzero(changed)
+    for box in ignore:
+        inside = (
+            (xs >= box.x)
+            & (xs < box.x + box.width)
+            & (ys >= box.y)
+            & (ys < box.y + box.height)
+        )
+        ys, xs = ys[~inside], xs[~inside]
+    if not len(ys):
+        return ys, xs
+    limit = int(threshold * 255)
+    delta = np.abs(actual[ys, xs].astype(np.int16) - expected[ys, xs]).max(axis=1)
+    keep = delta > limit
+    ys, xs = ys[keep], xs[keep]
+    if antialiasing and len(ys):
+        smoothed = _close_to_neighbour(
+            actual, expected, ys, xs, limit
+        ) & _close_to_neighbour(expected, actual, ys, xs, limit)
+        ys, xs = ys[~smoothed], xs[~smoothed]
+    return ys, xs
+
+
+def render_diff(expected: np.ndarray, ys: np.ndarray, xs: np.ndarray) -> bytes:
+    """Render the baseline faded to grey with differing pixels in red."""
+    import numpy as np
+
+    grey = expected[..., 1] // 4 + 191
+    image = np.empty_like(expected)
+    image[..., 0] = image[..., 1] = image[..., 2] = grey
+    image[..., 3] = 255
+    image[ys, xs] = (255, 0, 0, 255)
+    return encode(image)
+
+
+class BaselineStore:
+    """Baseline PNGs in one directory, read only when first compared.
+
+    Only each file's digest is kept, so a screenshot that encodes to the same
+    bytes as its baseline matches without decoding either image.
+    """
+
+    def __init__(self, root: Path) -> None:
+        self.root = root
+        self._digests: Dict[str, Optional[str]] = {}
+        self._lock = threading.Lock()
+
+    def path(self, name: str) -> Path:
+        return self.root / f"{name}.png"
+
+    def digest(self, name: str) -> Optional[str]:
+        with self._lock:
+            if name not in self._digests:
+                path = self.path(name)
+                self._digests[name] = (
+                    hashlib.sha256(path.read_bytes()).hexdigest()
+                    if path.exists()
+                    else None
+                )
+            return self._digests[name]
+
+    def load(self, name: str) -> np.ndarray:
+        return decode(self.path(name).read_bytes())
+
+    def save(self, name: str, png: bytes) -> None:
+        path = self.path(name)
+        path.parent.mkdir(parents=True, exist_ok=True)
+        path.write_bytes(png)
+        with self._lock:
+            self._digests[name] = hashlib.sha256(png).hexdigest()
+
+
+@lru_cache(maxsize=None)
+def baseline_store(root: str, browser: str, env_name: str) -> BaselineStore:
+    """Return the per-process store for one browser and environment."""
+    return BaselineStore(Path(root) / browser / env_name)
+
+
+def compare(
+    store: BaselineStore,
+    name: str,
+    png: bytes,
+    *,
+    threshold: float = 0.1,
+    max_diff_ratio: float = 0.0,
+    antialiasing: bool = True,
+    ignore: Sequence[Box] = (),
+    update: bool = False,
+) -> Comparison:
+    """Compare a screenshot with its baseline; update rewrites the baseline."""
+    expected_digest = store.digest(name)
+    path = store.path(name)
+    if expected_digest == hashlib.sha256(png).hexdigest():
+        return Comparison(name, MATCH, identical=True, baseline=path)
+    if expected_digest is None or update:
+        store.save(name, png)
+        return Comparison(name, UPDATED if update else MISSING, baseline=path)
+
+    actual, expected = decode(png), store.load(name)
+    if actual.shape != expected.shape:
+        return Comparison(name, MISMATCH, baseline=path, actual_png=png)
+    ys, xs = diff_pixels(actual, expected, threshold, antialiasing, ignore)
+    total = actual.shape[0] * actual.shape[1]
+    if len(ys) / total <= max_diff_ratio:
+        return Comparison(name, MATCH, len(ys), total, baseline=path)
+    return Comparison(
+        name,
+        MISMATCH,
+        len(ys),
+        total,
+        baseline=path,
+        actual_png=png,
+        diff_png=render_diff(expected, ys, xs),
+    )
+
+
+def check(
+    settings: Settings,
+    name: str,
+    png: bytes,
+    *,
+    ignore: Sequence[Box] = (),
+    max_diff_ratio: Optional[float] = None,
+) -> Comparison:
+    """Compare against the baseline for the configured browser and env.
+
+    Raises VisualMismatch on a difference or a missing baseline.
+    """
+    store = baseline_store(
+        settings.visual_baseline_dir, settings.browser, settings.env_name
+    )
+    comparison = compare(
+        store,
+        name,
+        png,
+        threshold=settings.visual_threshold,
+        max_diff_ratio=(
+            settings.visual_max_diff_ratio if max_diff_ratio is None else max_diff_ratio
+        ),
+        antialiasing=settings.visual_antialiasing,
+        ignore=ignore,
+        update=settings.visual_update,
+    )
+    if comparison.status in (MISMATCH, MISSING):
+        raise VisualMismatch(comparison)
+    return comparison
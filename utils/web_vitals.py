@@ -0,0 +1,280 @@
+from __future__ import annotations
+
+import math
+from dataclasses import asdict
+from dataclasses import dataclass
+from typing import Any, Dict, Iterable, List, Optional, Sequence, Tuple
+
+from playwright.sync_api import Error as PlaywrightError
+from playwright.sync_api import Page
+
+NAVIGATION = "navigation"
+TRANSITION = "transition"
+ANY_PAGE = "*"
+
+# Observes the current document and records every navigation and client-side
+# route change as a segment. Segments of earlier documents are kept in
+# sessionStorage on pagehide, so one read at the end of a test sees them all.
+INIT_SCRIPT = """
+(() => {
+  if (window.__webVitals || !location.protocol.startsWith('http')) return;
+  const KEY = '__webVitals';
+  const totals = { lcp: null, cls: 0, longTasks: 0, longTaskMs: 0 };
+  const observe = (type, onEntry) => {
+    try {
+      new PerformanceObserver((list) => list.getEntries().forEach(onEntry))
+        .observe({ type, buffered: true });
+    } catch (e) {}
+  };
+  observe('largest-contentful-paint', (e) => {
+    totals.lcp = e.renderTime || e.startTime;
+  });
+  observe('layout-shift', (e) => {
+    if (!e.hadRecentInput) totals.cls += e.value;
+  });
+  observe('longtask', (e) => {
+    totals.longTasks += 1;
+    totals.longTaskMs += e.duration;
+  });
+
+  let interaction = null;
+  for (const type of ['click', 'keydown', 'submit']) {
+    addEventListener(type, (e) => { interaction = e.timeStamp; }, true);
+  }
+
+  const counters = () => ({
+    cls: totals.cls, longTasks: totals.longTasks, longTaskMs: totals.longTaskMs,
+  });
+  const referrer = () => {
+    try { return new URL(document.referrer).pathname; } catch (e) { return null; }
+  };
+  const done = [];
+  let current = {
+    kind: 'navigation', path: location.pathname, from: referrer(),
+    base: counters(), transition: null,
+  };
+
+  const close = (segment) => {
+    const row = {
+      kind: segment.kind, path: segment.path, from: segment.from,
+      transition: segment.transition,
+      cls: totals.cls - segment.base.cls,
+      longTasks: totals.longTasks - segment.base.longTasks,
+      longTaskMs: totals.longTaskMs - segment.base.longTaskMs,
+    };
+    if (segment.kind === 'navigation') {
+      const nav = performance.getEntriesByType('navigation')[0];
+      const fcp = performance.getEntriesByName('first-contentful-paint')[0];
+      row.ttfb = nav ? nav.responseStart : null;
+      row.dcl = nav ? nav.domContentLoadedEventEnd || null : null;
+      row.load = nav ? nav.loadEventEnd || null : null;
+      row.fcp = fcp ? fcp.startTime : null;
+      row.lcp = totals.lcp;
+    }
+    return row;
+  };
+
+  const routeChanged = () => {
+    if (location.pathname === current.path) return;
+    done.push(close(current));
+    const start = interaction !== null ? interaction : performance.now();
+    const segment = {
+      kind: 'transition', path: location.pathname, from: current.path,
+      base: counters(), transition: null,
+    };
+    current = segment;
+    interaction = null;
+    // Two frames after the URL change the new route has been painted.
+    requestAnimationFrame(() => requestAnimationFrame(() => {
+      segment.transition = performance.now() - start;
+    }));
+  };
+  for (const name of ['pushState', 'replaceState']) {
+    const original = history[name];
+    history[name] = function (...args) {
+      const result = original.apply(this, args);
+      routeChanged();
+      return result;
+    };
+  }
+  addEventListener('popstate', routeChanged);
+
+  const snapshot = () => done.concat([close(current)]);
+  addEventListener('pagehide', () => {
+    try {
+      const stored = JSON.parse(sessionStorage.getItem(KEY) || '[]');
+      sessionStorage.setItem(KEY, JSON.stringify(stored.concat(snapshot())));
+    } catch (e) {}
+  });
+  window.__webVitals = { snapshot };
+})();
+"""
+
+COLLECT_SCRIPT = """
+() => {
+  let stored = [];
+  try {
+    stored = JSON.parse(sessionStorage.getItem('__webVitals') || '[]');
+  } catch (e) {}
+  return stored.concat(window.__webVitals ? window.__webVitals.snapshot() : []);
+}
+"""
+
+METRICS = (
+    "ttfb_ms",
+    "dcl_ms",
+    "load_ms",
+    "fcp_ms",
+    "lcp_ms",
+    "transition_ms",
+    "cls",
+    "long_tasks",
+    "long_task_ms",
+)
+# Shown in the terminal summary; the Allure attachment keeps every metric.
+SUMMARY_METRICS = ("ttfb_ms", "fcp_ms", "lcp_ms", "transition_ms", "cls")
+
+
+class PerfBudgetWarning(UserWarning):
+    """A page exceeded its performance budget in warn mode."""
+
+
+def page_name(path: str) -> str:
+    """Name a page by its route: "/inventory.html" -> "inventory", "/" -> "login"."""
+    name = path.strip("/").rsplit("/", 1)[-1]
+    if name.endswith(".html"):
+        name = name[: -len(".html")]
+    return name or "login"
+
+
+def _ms(value: Any) -> Optional[float]:
+    return None if value is None else round(float(value), 1)
+
+
+@dataclass(frozen=True)
+class PageMetrics:
+    """Client-side metrics for one navigation or client-side transition."""
+
+    page: str
+    kind: str
+    source: Optional[str]
+    ttfb_ms: Optional[float] = None
+    dcl_ms: Optional[float] = None
+    load_ms: Optional[float] = None
+    fcp_ms: Optional[float] = None
+    lcp_ms: Optional[float] = None
+    transition_ms: Optional[float] = None
+    cls: float = 0.0
+    long_tasks: int = 0
+    long_task_ms: float = 0.0
+
+    @classmethod
+    def from_script(cls, row: Dict[str, Any]) -> PageMetrics:
+        source = row.get("from")
+        return cls(
+            page=page_name(row["path"]),
+            kind=row["kind"],
+            source=page_name(source) if source else None,
+            ttfb_ms=_ms(row.get("ttfb")),
+            dcl_ms=_ms(row.get("dcl")),
+            load_ms=_ms(row.get("load")),
+            fcp_ms=_ms(row.get("fcp")),
+            lcp_ms=_ms(row.get("lcp")),
+            transition_ms=_ms(row.get("transition")),
+            cls=round(float(row.get("cls") or 0.0), 4),
+            long_tasks=int(row.get("longTasks") or 0),
+            long_task_ms=round(float(row.get("longTaskMs") or 0.0), 1),
+        )
+
+    @property
+    def label(self) -> str:
+        if self.kind == TRANSITION and self.source:
+            return f"{self.source} -> {self.page}"
+        return self.page
+
+    def to_dict(self) -> Dict[str, Any]:
+        return asdict(self)
+
+
+def collect(page: Page) -> List[PageMetrics]:
+    """Read every segment recorded on the page since its context was created."""
+    try:
+        rows = page.evaluate(COLLECT_SCRIPT)
+    except PlaywrightError:
+        return []
+    return [PageMetrics.from_script(row) for row in rows if row.get("path")]
+
+
+def validate_budgets(budgets: Dict[str, Dict[str, float]]) -> None:
+    for page, limits in budgets.items():
+        unknown = sorted(set(limits) - set(METRICS))
+        if unknown:
+            raise ValueError(
+                f"Unknown metric(s) in the '{page}' performance budget: "
+                f"{', '.join(unknown)} (known: {', '.join(METRICS)})"
+            )
+
+
+def check_budgets(
+    samples: Iterable[PageMetrics],
+    budgets: Dict[str, Dict[str, float]],
+) -> List[str]:
+    """Return one message per metric over budget.
+
+    Limits under "*" apply to every page; a page's own limits override them.
+    """
+    violations = []
+    for sample in samples:
+        limits = {**budgets.get(ANY_PAGE, {}), **budgets.get(sample.page, {})}
+        for metric, limit in limits.items():
+            value = getattr(sample, metric)
+            if value is not None and value > limit:
+                violations.append(
+                    f"{sample.label} ({sample.kind}): {metric} {value:g} > {limit:g}"
+                )
+    return violations
+
+
+def _percentile(values: Sequence[float], pct: float) -> float:
+    ordered = sorted(values)
+    rank = max(math.ceil(pct / 100 * len(ordered)) - 1, 0)
+    return ordered[rank]
+
+
+def summarize(
+    rows: Iterable[Dict[str, Any]],
+    metrics: Sequence[str] = METRICS,
+) -> List[Dict[str, Any]]:
+    """Aggregate sample dicts into per page/kind/metric percentiles."""
+    values: Dict[Tuple[str, str, str], List[float]] = {}
+    for row in rows:
+        for metric in metrics:
+            value = row.get(metric)
+            if value is not None:
+                key = (row["page"], row["kind"], metric)
+                values.setdefault(key, []).append(float(value))
+    return [
+        {
+            "page": page,
+            "kind": kind,
+            "metric": metric,
+            "count": len(samples),
+            "p50": _percentile(samples, 50),
+            "p95": _percentile(samples, 95),
+            "max": max(samples),
+        }
+        for (page, kind, metric), samples in sorted(values.items())
+    ]
+
+
+def format_summary(rows: Iterable[Dict[str, Any]]) -> List[str]:
+    """Render summarize() output as terminal lines."""
+    lines = [
+        f"{'page':<22} {'kind':<10} {'metric':<14} {'n':>4} {'p50':>9} {'p95':>9}"
+    ]
+    for row in summarize(rows, SUMMARY_METRICS):
+        lines.append(
+            f"{row['page']:<22} {row['kind']:<10} {row['metric']:<14} "
+            f"{row['count']:>4} {row['p50']:>9g} {row['p95']:>9g}"
+        )
+    return lines
@@ -0,0 +1,41 @@
+from __future__ import annotations
+
+from typing import List, Optional
+
+import pytest
+from xdist.remote import Producer
+from xdist.scheduler import LoadScheduling
+
+
+class LongestFirstScheduling(LoadScheduling):
+    """Load scheduling for a collection already sorted longest-first.
+
+    The initial tests are dealt round-robin, two per worker (the least a worker
+    needs to run), so the longest tests start on different workers; after that
+    each idle worker pulls the next longest test one at a time.
+    """
+
+    collection: Optional[List[str]]
+
+    def __init__(self, config: pytest.Config, log: Optional[Producer] = None) -> None:
+        super().__init__(config, log)
+        self.maxschedchunk = 1
+
+    def schedule(self) -> None:
+        if self.collection is not None:
+            super().schedule()
+            return
+        if not self._check_nodes_have_same_collection():
+            self.log("**Different tests collected, aborting run**")
+            return
+
+        self.collection = next(iter(self.node2collection.values()))
+        self.pending[:] = range(len(self.collection))
+        for _ in range(2):
+            for node in self.nodes:
+                if self.pending:
+                    self._send_tests(node, 1)
+
+        if not self.pending:
+            for node in self.nodes:
+                node.shutdown()